@@ -8,10 +8,14 @@ from .genres import router as genres_router
 from .novels import router as novels_router
 from .chapters import router as chapters_router
 from .scraping import router as scraping_router
+from .images import router as images_router
+from .admin import router as admin_router
 
 __all__ = [
     "genres_router",
     "novels_router",
     "chapters_router",
-    "scraping_router"
+    "scraping_router",
+    "images_router",
+    "admin_router"
 ]
@@ -0,0 +1,60 @@
+# api/admin.py
+
+# ═══════════════════════════════════════════════════════════════
+# IMPORTS
+# ═══════════════════════════════════════════════════════════════
+import os
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from api.deps import admin_dep
+from core import profiling
+
+
+# ═══════════════════════════════════════════════════════════════
+# ROUTER
+# ═══════════════════════════════════════════════════════════════
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[admin_dep])
+# Todas las rutas exigen la cabecera X-Admin-Token (api/deps.py)
+
+
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT: Perfil del proceso (flamegraph)
+# ═══════════════════════════════════════════════════════════════
+
+@router.get("/profile", response_class=PlainTextResponse)
+def profile_worker(
+    seconds: float = Query(10, gt=0, le=120, description="Duración del muestreo"),
+    interval_ms: float = Query(5, ge=1, le=100, description="Milisegundos entre muestras"),
+):
+    """
+    Muestrea el worker que atiende la petición durante `seconds` y
+    devuelve las pilas en formato "collapsed" (flamegraph.pl, speedscope).
+
+    Ejemplo:
+
+        curl -H "X-Admin-Token: $ADMIN_TOKEN" \\
+             "http://localhost:8000/api/v1/admin/profile?seconds=30" > worker.collapsed
+        flamegraph.pl worker.collapsed > worker.svg
+
+    Para una sola petición: añadir ?__profile=1 a cualquier ruta
+    (con la misma cabecera).
+
+    Es 'def': la espera ocupa un hilo del threadpool, no el event loop.
+    """
+    sampler = profiling.profile_process(seconds, interval_ms / 1000)
+    if sampler is None:
+        raise HTTPException(status_code=409, detail="Ya hay un perfil en curso en este worker")
+
+    filename = f"profile-{os.getpid()}-{datetime.now():%Y%m%d-%H%M%S}.collapsed"
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(sampler.samples),
+            "X-Profile-Pid": str(os.getpid()),
+        },
+    )
@@ -13,6 +13,9 @@ from typing import List
 from sqlmodel import select
 # select: Construir queries SQL
 
+from sqlalchemy.orm import joinedload
+# joinedload: Cargar el cuerpo del capítulo en la misma query
+
 from datetime import datetime
 # Para timestamps
 
@@ -21,13 +24,15 @@ from api.deps import session_dep
 
 from models.novel import Novel
 from models.chapter import Chapter
+from models.chapter_content import content_hash
 # Modelo de BD de capítulos
 # Para verificar que la novela existe
 
 from schemas import (
     ChapterCreate,
     ChapterSummary,
-    ChapterDetailResponse
+    ChapterDetailResponse,
+    ChapterHashesResponse
 )
 # Schemas de validación
 
@@ -44,6 +49,18 @@ router = APIRouter(tags=["chapters"])
 # - Es más flexible definir cada ruta completa
 
 
+# Columnas que necesita ChapterSummary
+# select(*SUMMARY_COLUMNS) nunca lee 'content' (TEXT de decenas de KB)
+# → un listado de 100 capítulos pesa KB en lugar de MB
+SUMMARY_COLUMNS = (
+    Chapter.id,
+    Chapter.novel_id,
+    Chapter.title,
+    Chapter.order_number,
+    Chapter.created_at,
+)
+
+
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINT 1: Listar capítulos de una novela (sin contenido)
 # ═══════════════════════════════════════════════════════════════
@@ -93,7 +110,7 @@ def list_novel_chapters(
     # PASO 2: Buscar capítulos ordenados por número
     # ───────────────────────────────────────────────────────────
     statement = (
-        select(Chapter)
+        select(*SUMMARY_COLUMNS)  # Proyección: sin 'content'
         .where(Chapter.novel_id == novel_id)
         .order_by(Chapter.order_number)  # Orden: 1, 2, 3... # pyright: ignore[reportArgumentType]
         .offset(skip)
@@ -113,6 +130,54 @@ def list_novel_chapters(
     # Útil para mostrar lista de 1000+ capítulos
 
 
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT 1b: Hashes del contenido de una novela
+# ═══════════════════════════════════════════════════════════════
+
+@router.get(
+    "/novels/{novel_id}/chapters/hashes",
+    response_model=ChapterHashesResponse,
+    summary="Hashes del contenido de los capítulos"
+)
+def get_novel_chapter_hashes(
+    session: session_dep,
+    novel_id: int = Path(..., description="ID de la novela", gt=0),
+):
+    """
+    Devuelve order_number → sha256 del texto de TODOS los capítulos.
+    
+    Un scraper que vuelve a descargar la novela compara con sus propios
+    hashes y envía a /admin/import-novel solo los capítulos que cambiaron
+    (los que no vienen en el JSON se conservan).
+    
+    Ejemplo: GET /novels/5/chapters/hashes
+    """
+    
+    # ───────────────────────────────────────────────────────────
+    # PASO 1: Verificar que la novela existe
+    # ───────────────────────────────────────────────────────────
+    if session.get(Novel, novel_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Novela con ID {novel_id} no encontrada"
+        )
+    
+    # ───────────────────────────────────────────────────────────
+    # PASO 2: Solo dos columnas de 'chapters' (sin paginar)
+    # ───────────────────────────────────────────────────────────
+    rows = session.exec(
+        select(Chapter.order_number, Chapter.content_hash)
+        .where(Chapter.novel_id == novel_id)
+        .where(Chapter.content_hash.is_not(None))  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue]
+        .order_by(Chapter.order_number)  # pyright: ignore[reportArgumentType]
+    ).all()
+    # ~80 bytes por capítulo: 2000 capítulos ≈ 160 KB, sin tocar
+    # 'chapter_contents'
+    
+    hashes = {order_number: digest for order_number, digest in rows}
+    return ChapterHashesResponse(novel_id=novel_id, count=len(hashes), hashes=hashes)
+
+
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINT 2: Leer UN capítulo completo (con contenido)
 # ═══════════════════════════════════════════════════════════════
@@ -137,9 +202,15 @@ def get_chapter(
     """
     
     # ───────────────────────────────────────────────────────────
-    # PASO 1: Buscar capítulo
+    # PASO 1: Buscar capítulo (metadatos + cuerpo en una sola query)
     # ───────────────────────────────────────────────────────────
-    chapter = session.get(Chapter, chapter_id)
+    chapter = session.get(
+        Chapter,
+        chapter_id,
+        options=[joinedload(Chapter.body)]  # pyright: ignore[reportArgumentType]
+    )
+    # joinedload: trae 'chapter_contents' con un JOIN en lugar de
+    # una segunda query al leer chapter.content
     
     if not chapter:
         raise HTTPException(
@@ -202,7 +273,7 @@ def create_chapter(
     # PASO 2: Verificar que no exista capítulo con ese número
     # ───────────────────────────────────────────────────────────
     existing = session.exec(
-        select(Chapter)
+        select(Chapter.id)
         .where(Chapter.novel_id == novel_id)
         .where(Chapter.order_number == chapter_data.order_number)
     ).first()
@@ -283,7 +354,7 @@ def update_chapter(
     # Si se cambia el order_number, verificar que no esté ocupado
     if chapter_data.order_number != chapter.order_number:
         existing = session.exec(
-            select(Chapter)
+            select(Chapter.id)
             .where(Chapter.novel_id == chapter.novel_id)
             .where(Chapter.order_number == chapter_data.order_number)
             .where(Chapter.id != chapter_id)  # Excluir el mismo capítulo
@@ -299,7 +370,9 @@ def update_chapter(
     # PASO 3: Actualizar campos
     # ───────────────────────────────────────────────────────────
     chapter.title = chapter_data.title
-    chapter.content = chapter_data.content
+    if chapter.content_hash != content_hash(chapter_data.content):
+        chapter.content = chapter_data.content
+    # Mismo hash → no se reescribe el texto (ni se marca el cuerpo como modificado)
     chapter.order_number = chapter_data.order_number
     
     if chapter_data.source_url:
@@ -380,15 +453,18 @@ def get_next_chapter(
     Retorna `null` si es el último capítulo.
     """
     
-    # Buscar capítulo actual
-    current = session.get(Chapter, chapter_id)
+    # Buscar capítulo actual (solo novela y número, sin 'content')
+    current = session.exec(
+        select(Chapter.novel_id, Chapter.order_number)
+        .where(Chapter.id == chapter_id)
+    ).first()
     
     if not current:
         raise HTTPException(status_code=404, detail="Capítulo no encontrado")
     
     # Buscar siguiente capítulo
     next_chapter = session.exec(
-        select(Chapter)
+        select(*SUMMARY_COLUMNS)
         .where(Chapter.novel_id == current.novel_id)
         .where(Chapter.order_number > current.order_number)
         .order_by(Chapter.order_number)                       # pyright: ignore[reportArgumentType] 
@@ -415,18 +491,21 @@ def get_previous_chapter(
     Retorna `null` si es el primer capítulo.
     """
     
-    # Buscar capítulo actual
-    current = session.get(Chapter, chapter_id)
+    # Buscar capítulo actual (solo novela y número, sin 'content')
+    current = session.exec(
+        select(Chapter.novel_id, Chapter.order_number)
+        .where(Chapter.id == chapter_id)
+    ).first()
     
     if not current:
         raise HTTPException(status_code=404, detail="Capítulo no encontrado")
     
     # Buscar capítulo anterior
     previous_chapter = session.exec(
-        select(Chapter)
+        select(*SUMMARY_COLUMNS)
         .where(Chapter.novel_id == current.novel_id)
         .where(Chapter.order_number < current.order_number)
-         .order_by(Chapter.order_number.desc())  # Descendente   #pyright: ignore[reportAttributeAccessIssue]
+        .order_by(Chapter.order_number.desc())  # Descendente   #pyright: ignore[reportAttributeAccessIssue]
         .limit(1)
     ).first()
     
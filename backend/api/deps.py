@@ -1,10 +1,23 @@
 from typing import Annotated,Generator
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException
 from sqlmodel import Session
+from core.config import settings
 from core.data_base import get_session
+from core.profiling import is_admin
 session_dep = Annotated[Session,Depends(get_session)]
 
 
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Rutas de diagnóstico: cabecera X-Admin-Token == ADMIN_TOKEN."""
+    if not settings.ADMIN_TOKEN:
+        # Sin token configurado las rutas no existen
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Token de administrador inválido")
+
+admin_dep = Depends(require_admin)
+
+
 
 
 
@@ -20,9 +20,13 @@ from api.deps import session_dep
 from models.genre import Genre
 # Gender: Modelo de la tabla (para queries)
 
-from schemas import GenreCreate, GenreResponse
+from schemas import GenreCreate, GenreResponse, GenreCountResponse
 # GenreCreate: Schema para validar datos al crear
 # GenreResponse: Schema para devolver datos al cliente
+# GenreCountResponse: GenreResponse + cantidad de novelas
+
+from services.novel_index import novel_index
+# Índice en memoria: conteo de novelas por género sin GROUP BY
 
 
 router = APIRouter(prefix="/genres", tags=["genres"])
@@ -34,21 +38,26 @@ router = APIRouter(prefix="/genres", tags=["genres"])
 # ═══════════════════════════════════════════════════════════════
 
 #este endpoint lista todos los generos disponibles
-@router.get("/", response_model=List[GenreResponse])
+@router.get("/", response_model=List[GenreCountResponse])
 def list_genres(
     session: session_dep,
     skip: int = 0,
     limit: int = 100
 ):
     """
-    Lista todos los géneros disponibles.
+    Lista todos los géneros disponibles con su cantidad de novelas.
     
     - **skip**: Número de géneros a saltar (paginación)
     - **limit**: Máximo número de géneros a devolver
     """
     statement =  select(Genre).offset(skip).limit(limit)
     genres = session.exec(statement).all()
-    return genres
+
+    counts = novel_index.snapshot().genre_counts()
+    return [
+        {"id": genre.id, "name": genre.name, "novels_count": counts.get(genre.id, 0)}  # pyright: ignore[reportArgumentType]
+        for genre in genres
+    ]
 
 
 
@@ -161,6 +170,7 @@ def delete_genre(
          raise HTTPException(status_code=404, detail="genero no encontrado")
     session.delete(genre)
     session.commit()
+    novel_index.remove_genre(genre_id)
     
     return {"OK": True, "message":"el Genero ha sido eliminado "}
 
@@ -0,0 +1,164 @@
+# api/images.py
+
+# ═══════════════════════════════════════════════════════════════
+# IMPORTS
+# ═══════════════════════════════════════════════════════════════
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from core.config import settings
+from services import covers, blob_store
+
+
+# ═══════════════════════════════════════════════════════════════
+# ROUTER
+# ═══════════════════════════════════════════════════════════════
+
+router = APIRouter(prefix="/images", tags=["images"])
+
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+# Blob (el nombre es el hash) o URL con ?v=<hash> correcto:
+# el contenido de esa URL nunca cambia
+
+CACHE_REVALIDATE = "public, no-cache"
+# URL sin versión: se puede guardar, pero se revalida con ETag (304)
+
+
+# ═══════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """
+    ¿El cliente ya tiene esta versión?
+
+    - If-None-Match tiene prioridad (RFC 9110)
+    - If-Modified-Since solo se mira si no hay If-None-Match
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def _send_file(request: Request, path: Path, media_type: str, headers: dict) -> Response:
+    """
+    Envía el archivo sin copiarlo por Python cuando hay nginx delante.
+
+    - Si nginx lo anuncia (X-Sendfile-Type: X-Accel-Redirect) y hay
+      ACCEL_REDIRECT_PREFIX: respuesta vacía con X-Accel-Redirect y
+      nginx lee el archivo con sendfile()
+    - Si no (ej: peticiones directas al puerto 8000): FileResponse
+    """
+    via_nginx = request.headers.get("x-sendfile-type") == "X-Accel-Redirect"
+
+    if settings.ACCEL_REDIRECT_PREFIX and via_nginx:
+        relative = path.relative_to(settings.UPLOAD_DIR).as_posix()
+        return Response(
+            media_type=media_type,
+            headers={**headers, "X-Accel-Redirect": f"{settings.ACCEL_REDIRECT_PREFIX}{relative}"},
+        )
+
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT: Servir portadas (originales y derivados)
+# ═══════════════════════════════════════════════════════════════
+
+@router.get("/{filename}")
+def get_image(
+    filename: str,
+    request: Request,
+    w: int | None = None,
+    variant: str | None = None,
+    format: str | None = None,
+    v: str | None = None,
+):
+    """
+    Sirve portadas, opcionalmente redimensionadas.
+
+    - /images/36289ec092a7890d.webp → blob (immutable, el nombre es el hash)
+    - /images/5.webp → portada antigua (fuera del almacén de blobs)
+    - /images/5?variant=thumb → 160px (también "card" y "full")
+    - /images/5?w=300 → ajustado a la variante más cercana (320px)
+    - ?format=avif|webp → fuerza el formato; si no, AVIF cuando
+      el navegador lo acepta (cabecera Accept)
+    - ?v=<hash> → versión del contenido (la pone build_cover_url);
+      si coincide, Cache-Control immutable por un año
+
+    Responde 304 a If-None-Match / If-Modified-Since sin tocar Pillow.
+
+    Es 'def' (no 'async def'): codificar una imagen bloquea,
+    así FastAPI lo ejecuta en el threadpool.
+    """
+    # "5" → "5.webp" (las portadas del importer siempre son WebP)
+    name = Path(filename).name
+    if not Path(name).suffix:
+        name = f"{name}.webp"
+
+    digest = blob_store.digest_from_name(name)
+    source = blob_store.blob_path(digest) if digest else settings.UPLOAD_DIR / name
+    version = covers.content_hash(source)  # Un solo stat si ya estaba calculado
+    if version is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    # ───────────────────────────────────────────────────────────
+    # PASO 1: Qué se va a servir (sin generar nada todavía)
+    # ───────────────────────────────────────────────────────────
+
+    derived = w is not None or variant is not None or format is not None
+
+    if derived:
+        try:
+            width = covers.resolve_width(w, variant)
+            fmt = covers.pick_format(format, request.headers.get("accept"))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        etag = f'"{version}-{width}.{fmt}"'
+        media_type = covers.media_type(fmt)
+    else:
+        etag = f'"{version}"'
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    # El derivado sale del original: su fecha es la del original
+    mtime = source.stat().st_mtime
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        "Cache-Control": CACHE_IMMUTABLE if digest or v == version else CACHE_REVALIDATE,
+    }
+    if derived and format is None:
+        headers["Vary"] = "Accept"  # El formato depende de Accept
+
+    # ───────────────────────────────────────────────────────────
+    # PASO 2: 304 si el cliente ya lo tiene
+    # ───────────────────────────────────────────────────────────
+
+    if _not_modified(request, etag, mtime):
+        return Response(status_code=304, headers=headers)
+
+    # ───────────────────────────────────────────────────────────
+    # PASO 3: Enviar (generando el derivado si hace falta)
+    # ───────────────────────────────────────────────────────────
+
+    path = covers.get_derivative(source, width, fmt) if derived else source  # pyright: ignore[reportPossiblyUnboundVariable]
+
+    return _send_file(request, path, media_type, headers)
@@ -3,10 +3,12 @@
 # IMPORTS
 # ═══════════════════════════════════════════════════════════════
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Query, UploadFile, File
 # APIRouter: Para agrupar endpoints relacionados
 # HTTPException: Para devolver errores HTTP (404, 400, etc.)
 # Request: Para obtener información de la petición
+# Query: Para parámetros repetidos (?genre_ids=1&genre_ids=4)
+# UploadFile, File: Para subir la portada (multipart/form-data)
 
 from pathlib import Path
 # Path: Para manipular rutas de archivos
@@ -14,9 +16,10 @@ from pathlib import Path
 from typing import List
 # List: Para tipar listas (List[GenreResponse])
 
-from sqlmodel import select
+from sqlmodel import select, delete
 # select: Para construir queries SQL
 # Ejemplo: select(Genre).where(Gender.id == 5)
+# delete: Para DELETE masivos (sin cargar filas en memoria)
 
 from api.deps import session_dep
 # session_dep: Dependencia que inyecta la sesión de BD
@@ -28,12 +31,24 @@ from schemas import (
     NovelDetailResponse,
     NovelGenresUpdate,
     GenreResponse,
-    NovelNameResponse
+    NovelNameResponse,
+    GenreFacet,
+    NovelFacetsResponse,
+    CoverUploadResponse
 )
 
 from models.novel import Novel, NovelStatus, NovelName  # ← De models.novel
 from models.genre import Genre, NovelGenre              # ← De models.genre (CORREGIR)
 from models.chapter import Chapter
+from models.chapter_content import ChapterContent
+
+from services.novel_index import novel_index, GenreMode, NovelIndexSnapshot
+# novel_index: bitmaps en memoria por género/estado (filtros y facetas)
+from services import image_worker, covers, blob_store
+# image_worker: codifica portadas en un pool de procesos
+# covers / blob_store: hash de contenido para las URLs de portada
+
+from core.config import settings
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -44,12 +59,17 @@ def build_cover_url(request: Request, cover_path: str | None) -> str | None:
     """
     Convierte una ruta relativa de portada en URL completa.
 
+    La URL lleva el hash del contenido: api/images.py la sirve con
+    Cache-Control immutable, y si la portada cambia cambia la URL.
+    - Blobs: el nombre ya es el hash ("36289ec092a7890d.webp")
+    - Portadas antiguas ({id}.webp): se añade ?v=<hash>
+
     Args:
         request: Objeto Request de FastAPI
-        cover_path: Ruta relativa como "/static/novels/5.webp"
+        cover_path: Ruta relativa como "/static/novels/blobs/36/36289ec092a7890d.webp"
 
     Returns:
-        URL completa como "http://localhost:8000/images/5.webp"
+        URL completa como "http://localhost:8000/api/v1/images/36289ec092a7890d.webp"
         None si cover_path es None
     """
     if not cover_path:
@@ -61,7 +81,60 @@ def build_cover_url(request: Request, cover_path: str | None) -> str | None:
 
     # Construir URL manualmente para evitar problemas con url_for
     base_url = str(request.base_url).rstrip('/')
-    return f"{base_url}/images/{filename}"  
+    if blob_store.digest_from_name(filename):
+        return f"{base_url}/images/{filename}"
+    
+    version = covers.content_hash(settings.UPLOAD_DIR / filename)
+    if version is None:
+        return f"{base_url}/images/{filename}"
+    return f"{base_url}/images/{filename}?v={version}"
+
+
+def _filter_bitmap(
+    session,
+    index: NovelIndexSnapshot,
+    q: str | None = None,
+    genre_ids: List[int] | None = None,
+    genre_mode: GenreMode = "and",
+    status: NovelStatus | None = None,
+    min_rating: float | None = None,
+) -> int:
+    """
+    Resuelve todos los filtros como un bitmap del snapshot 'index'.
+    
+    Estado, rating mínimo y géneros salen del índice en memoria;
+    solo la búsqueda por texto (q) necesita la BD, y lee únicamente IDs.
+    """
+    result = index.match(genre_ids or [], genre_mode, status, min_rating)
+    
+    if q:
+        matching = session.exec(
+            select(Novel.id).where(Novel.name.ilike(f"%{q}%"))  # pyright: ignore[reportAttributeAccessIssue]
+        )
+        result &= index.match_ids(matching)
+    
+    return result
+
+
+def _fetch_page(session, ids: List[int]) -> list[Novel]:
+    """
+    Trae las novelas de una página con un solo SELECT ... WHERE id IN (...)
+    y las devuelve en el mismo orden que 'ids'.
+    """
+    if not ids:
+        return []
+    
+    novels = session.exec(select(Novel).where(Novel.id.in_(ids))).all()  # pyright: ignore[reportAttributeAccessIssue]
+    by_id = {novel.id: novel for novel in novels}
+    return [by_id[novel_id] for novel_id in ids if novel_id in by_id]
+
+
+def _selected_genres(genre_id: int | None, genre_ids: List[int] | None) -> List[int]:
+    """Une ?genre_id= (antiguo) y ?genre_ids= (múltiple) sin repetidos."""
+    selected = list(genre_ids or [])
+    if genre_id and genre_id not in selected:
+        selected.append(genre_id)
+    return selected
 
 
 
@@ -77,20 +150,11 @@ def get_all_novels(
     status : NovelStatus | None = None,
     min_rate: float | None = None
   ):
-    statemen = select(Novel)
-
-    if status:
-          statemen = statemen.where(Novel.status == status)
-
-    if min_rate is not None:
-        statemen = statemen.where(Novel.rating >= min_rate) # pyright: ignore[reportOptionalOperand]
-
-    statemen = statemen.order_by(Novel.rating.desc())  # pyright: ignore[reportAttributeAccessIssue,reportOptionalMemberAccess]
-
-    #paginacion
-    statemen = statemen.offset(skip).limit(limit)
-
-    novels = session.exec(statemen).all()
+    # Filtros en memoria (bitmaps) → IDs de la página ya ordenados
+    # por (rating DESC, id DESC) → un solo SELECT ... WHERE id IN (...)
+    index = novel_index.snapshot()
+    bitmap = index.match(status=status, min_rating=min_rate)
+    novels = _fetch_page(session, index.page(bitmap, skip, limit))
 
     # Convertir a dict y agregar cover_url
     result = []
@@ -116,7 +180,11 @@ def get_all_novels(
 
 
 @router.get("/{novel_id}", response_model=NovelDetailResponse)
-def get_novel(novel_id: int, session: session_dep):
+def get_novel(
+    request: Request,  # Para generar URLs completas
+    novel_id: int,
+    session: session_dep
+):
     """Obtiene detalle completo de una novela."""
     
     # 1. Buscar novela
@@ -155,6 +223,7 @@ def get_novel(novel_id: int, session: session_dep):
         rating=novel.rating,
         status=novel.status,
         cover_path=novel.cover_path,
+        cover_url=build_cover_url(request, novel.cover_path),
         source_url=novel.source_url,
         created_at=novel.created_at,
         updated_at=novel.updated_at,
@@ -204,6 +273,7 @@ def create_novel(
     session.add(novel)
     session.commit()
     session.refresh(novel)
+    novel_index.upsert_novel(novel.id, novel.status, novel.rating)  # pyright: ignore[reportArgumentType]
 
     # Devolver con cover_url
     return {
@@ -260,6 +330,7 @@ def update_novel(
     session.add(novel)
     session.commit()
     session.refresh(novel)
+    novel_index.upsert_novel(novel_id, novel.status, novel.rating)
 
     # Devolver con cover_url
     return {
@@ -277,6 +348,60 @@ def update_novel(
     }
 
 
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT 4b: Subir portada
+# ═══════════════════════════════════════════════════════════════
+
+@router.post("/{novel_id}/cover", response_model=CoverUploadResponse, status_code=202)
+def upload_cover(
+    novel_id: int,
+    session: session_dep,
+    file: UploadFile = File(...),
+):
+    """
+    Sube la portada de una novela (jpg, jpeg, png o webp, máx. 5MB).
+    
+    Responde 202 en cuanto el archivo está guardado: la conversión a
+    WebP se hace en el pool de procesos y cover_path se actualiza al
+    terminar (services/image_worker.py).
+    
+    Ejemplo: curl -F "file=@portada.jpg" http://localhost:8000/novels/5/cover
+    """
+    
+    novel = session.get(Novel, novel_id)
+    if not novel:
+        raise HTTPException(status_code=404, detail="Novel not found")
+    
+    extension = Path(file.filename or "").suffix.lower().lstrip(".")
+    if extension not in settings.ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato no permitido. Usa: {', '.join(sorted(settings.ALLOWED_EXTENSIONS))}"
+        )
+    
+    # Guardar la subida en incoming/ (el worker la borra al terminar)
+    incoming_path = settings.INCOMING_DIR / f"{novel_id}_{datetime.now():%Y%m%d%H%M%S%f}.{extension}"
+    size = 0
+    with open(incoming_path, "wb") as buffer:
+        while chunk := file.file.read(1024 * 1024):
+            size += len(chunk)
+            if size > settings.MAX_FILE_SIZE:
+                buffer.close()
+                incoming_path.unlink(missing_ok=True)
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"La imagen supera {settings.MAX_FILE_SIZE // (1024 * 1024)}MB"
+                )
+            buffer.write(chunk)
+    
+    image_worker.submit_cover(novel_id, incoming_path, delete_source=True)
+    
+    return CoverUploadResponse(
+        novel_id=novel_id,
+        message="Portada recibida, se está procesando"
+    )
+
+
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINT 5: Eliminar novela
 # ═══════════════════════════════════════════════════════════════
@@ -296,26 +421,29 @@ def delete_novel(
     if not novel:
         raise HTTPException(status_code=404, detail="Novela no encontrada")
     
-    # Eliminar relaciones manualmente (si no tienes CASCADE en BD)
-    # Eliminar nombres alternativos
-    session.exec(select(NovelName).where(NovelName.novel_id == novel_id)).all()
-    for name in session.exec(select(NovelName).where(NovelName.novel_id == novel_id)):
-        session.delete(name)
-    
-    # Eliminar asociaciones de géneros
-    for assoc in session.exec(select(NovelGenre).where(NovelGenre.novel_id == novel_id)):
-        session.delete(assoc)
-    
-    # Eliminar capítulos
-    from models.chapter import Chapter
-    for chapter in session.exec(select(Chapter).where(Chapter.novel_id == novel_id)):
-        session.delete(chapter)
+    novel_name = novel.name
+    
+    # Eliminar relaciones con DELETE masivos (sin cargar filas en el ORM)
+    # Las FK tienen ON DELETE CASCADE, pero borrar explícitamente mantiene
+    # el comportamiento en BDs antiguas sin CASCADE.
+    # - Un DELETE por tabla, memoria constante sin importar cuántos capítulos
+    session.exec(delete(NovelName).where(NovelName.novel_id == novel_id))  # pyright: ignore[reportArgumentType]
+    session.exec(delete(NovelGenre).where(NovelGenre.novel_id == novel_id))  # pyright: ignore[reportArgumentType]
+    session.exec(  # pyright: ignore[reportArgumentType]
+        delete(ChapterContent).where(
+            ChapterContent.chapter_id.in_(  # pyright: ignore[reportAttributeAccessIssue]
+                select(Chapter.id).where(Chapter.novel_id == novel_id)
+            )
+        ).execution_options(synchronize_session=False)
+    )
+    session.exec(delete(Chapter).where(Chapter.novel_id == novel_id))  # pyright: ignore[reportArgumentType]
     
     # Eliminar la novela
-    session.delete(novel)
+    session.exec(delete(Novel).where(Novel.id == novel_id))  # pyright: ignore[reportArgumentType]
     session.commit()
+    novel_index.remove_novel(novel_id)
     
-    return {"ok": True, "message": f"Novela '{novel.name}' eliminada"}
+    return {"ok": True, "message": f"Novela '{novel_name}' eliminada"}
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -328,6 +456,8 @@ def search_novels(
     session: session_dep,
     q: str | None = None,  # Query de búsqueda
     genre_id: int | None = None,
+    genre_ids: List[int] | None = Query(default=None),
+    genre_mode: GenreMode = "and",
     status: NovelStatus | None = None,
     min_rating: float | None = None,
     skip: int = 0,
@@ -337,45 +467,30 @@ def search_novels(
     Busca novelas por nombre o filtros.
     
     - **q**: Buscar en el nombre (búsqueda parcial)
-    - **genre_id**: Filtrar por género
+    - **genre_id**: Filtrar por un género (compatibilidad)
+    - **genre_ids**: Filtrar por varios géneros (se repite el parámetro)
+    - **genre_mode**: "and" (todos los géneros) u "or" (al menos uno)
     - **status**: Filtrar por estado
     - **min_rating**: Rating mínimo
     
-    Ejemplo: GET /novels/search/?q=lord&genre_id=1&status=completed
+    Ejemplo: GET /novels/search/?q=lord&genre_ids=1&genre_ids=4&genre_mode=or
     """
     
-    statement = select(Novel)
-    
-    # Búsqueda por nombre (case-insensitive, parcial)
-    if q:
-        statement = statement.where(Novel.name.ilike(f"%{q}%")) # pyright: ignore[reportAttributeAccessIssue]
-        # ilike: case-insensitive LIKE
-        # %lord% busca "lord", "Lord of", "Overlord", etc.
-    
-    # Filtrar por género (requiere JOIN)
-    if genre_id:
-        statement = (
-            statement
-            .join(NovelGenre)
-            .where(NovelGenre.genre_id == genre_id)
-
-
-        )
-    
-    # Otros filtros
-    if status:
-        statement = statement.where(Novel.status == status)
-    
-    if min_rating is not None:
-        statement = statement.where(Novel.rating >= min_rating)  # pyright: ignore[reportOptionalOperand]  
-    
-    # Ordenar por relevancia (por ahora, por rating)
-    statement = statement.order_by(Novel.rating.desc())  # pyright: ignore[reportAttributeAccessIssue,reportOptionalMemberAccess]   
-    
-    # Paginación
-    statement = statement.offset(skip).limit(limit)
+    # Todos los filtros como bitmap (q lee solo IDs de la BD)
+    # ilike: case-insensitive LIKE → %lord% busca "lord", "Lord of", "Overlord"...
+    index = novel_index.snapshot()
+    bitmap = _filter_bitmap(
+        session,
+        index,
+        q=q,
+        genre_ids=_selected_genres(genre_id, genre_ids),
+        genre_mode=genre_mode,
+        status=status,
+        min_rating=min_rating,
+    )
     
-    novels = session.exec(statement).all()
+    # Página ordenada por (rating DESC, id DESC) + un solo SELECT ... IN (...)
+    novels = _fetch_page(session, index.page(bitmap, skip, limit))
 
     # Convertir a dict y agregar cover_url
     result = []
@@ -398,12 +513,74 @@ def search_novels(
     return result
 
 
+# ═══════════════════════════════════════════════════════════════
+# ENDPOINT 6b: Facetas (conteos por género y estado)
+# ═══════════════════════════════════════════════════════════════
+
+@router.get("/facets/", response_model=NovelFacetsResponse)
+def get_novel_facets(
+    session: session_dep,
+    q: str | None = None,
+    genre_id: int | None = None,
+    genre_ids: List[int] | None = Query(default=None),
+    genre_mode: GenreMode = "and",
+    status: NovelStatus | None = None,
+    min_rating: float | None = None,
+):
+    """
+    Conteos por género y estado para los mismos filtros que /search/.
+    
+    Permite al frontend mostrar "Fantasía (312)" junto a cada filtro.
+    Los conteos salen de intersecciones de bitmaps en memoria
+    (services/novel_index.py), no de un GROUP BY por petición.
+    
+    Ejemplo: GET /novels/facets/?genre_ids=1&genre_ids=4&genre_mode=and
+    """
+    
+    # Resultado actual como bitmap
+    index = novel_index.snapshot()
+    result = _filter_bitmap(
+        session,
+        index,
+        q=q,
+        genre_ids=_selected_genres(genre_id, genre_ids),
+        genre_mode=genre_mode,
+        status=status,
+        min_rating=min_rating,
+    )
+    
+    # Conteos por género (solo los que aparecen en el resultado)
+    genre_counts = {
+        genre_id: count
+        for genre_id, count in index.genre_counts(within=result).items()
+        if count > 0
+    }
+    genre_names = {}
+    if genre_counts:
+        genre_names = dict(session.exec(
+            select(Genre.id, Genre.name).where(Genre.id.in_(list(genre_counts)))  # pyright: ignore[reportAttributeAccessIssue,reportOptionalMemberAccess]
+        ).all())
+    
+    genres = [
+        GenreFacet(id=genre_id, name=genre_names[genre_id], count=count)
+        for genre_id, count in sorted(genre_counts.items(), key=lambda item: -item[1])
+        if genre_id in genre_names
+    ]
+    
+    return NovelFacetsResponse(
+        total=result.bit_count(),
+        genres=genres,
+        status={key: count for key, count in index.status_counts(within=result).items() if count > 0}
+    )
+
+
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINT 7: Asociar géneros a una novela
 # ═══════════════════════════════════════════════════════════════
 
 @router.post("/{novel_id}/genres", response_model=NovelDetailResponse)
 def add_genres_to_novel(
+    request: Request,  # Para generar URLs completas
     novel_id: int,
     genres_data: NovelGenresUpdate,
     session: session_dep
@@ -443,9 +620,10 @@ def add_genres_to_novel(
         session.add(association)
     
     session.commit()
+    novel_index.set_genres(novel_id, genres_data.genre_ids)
     
     # Devolver novela actualizada con géneros
-    return get_novel(novel_id, session)
+    return get_novel(request, novel_id, session)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -463,14 +641,9 @@ def get_best_novels(
     Útil para sección "Top Novels" en homepage.
     """
 
-    statement = (
-        select(Novel)
-        .where(Novel.rating.isnot(None))  # Solo novelas con rating  # pyright: ignore[reportAttributeAccessIssue, reportOptionalMemberAccess]
-        .order_by(Novel.rating.desc())                   # pyright: ignore[reportAttributeAccessIssue,reportOptionalMemberAccess]
-        .limit(limit)
-    )
-
-    novels = session.exec(statement).all()
+    # Novelas con rating, en el orden precalculado del índice
+    index = novel_index.snapshot()
+    novels = _fetch_page(session, index.page(index.match_rated(), 0, limit))
 
     # Convertir a dict y agregar cover_url
     result = []
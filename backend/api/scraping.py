@@ -3,10 +3,12 @@
 # ═══════════════════════════════════════════════════════════════
 # IMPORTS
 # ═══════════════════════════════════════════════════════════════
-from PIL import Image
-import io
-from fastapi import APIRouter, HTTPException
-from sqlmodel import select
+from typing import Annotated, NamedTuple
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, delete, select, update
 from datetime import datetime
 from pathlib import Path
 import shutil
@@ -17,6 +19,7 @@ from api.deps import session_dep
 from models.novel import Novel, NovelName
 from models.genre import Genre, NovelGenre
 from models.chapter import Chapter
+from models.chapter_content import ChapterContent, content_hash
 
 # Schemas
 from schemas.scraping import (
@@ -26,15 +29,19 @@ from schemas.scraping import (
 )
 
 from core.config import settings
+from core.request_body import DecompressingRoute
+from services.novel_index import novel_index
+from services import idempotency, image_worker
 
 
 # ═══════════════════════════════════════════════════════════════
 # ROUTER
 # ═══════════════════════════════════════════════════════════════
 
-router = APIRouter(prefix="/admin", tags=["admin", "scraping"])
+router = APIRouter(prefix="/admin", tags=["admin", "scraping"], route_class=DecompressingRoute)
 # prefix="/admin": Todas las rutas empiezan con /admin
 # tags: Agrupa en documentación de Swagger
+# route_class: acepta cuerpos con Content-Encoding: gzip (core/request_body.py)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -44,22 +51,35 @@ router = APIRouter(prefix="/admin", tags=["admin", "scraping"])
 @router.post("/import-novel", response_model=NovelImportResponse, status_code=201)
 def import_novel_from_scraper(
     data: NovelImportData,
-    session: session_dep
+    session: session_dep,
+    response: Response,
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key", max_length=200)] = None,
 ):
     """
     Importa una novela completa con todos sus datos desde un scraper.
     
-    **Este endpoint hace TODO en una sola operación:**
-    - Crea la novela en la BD
+    **Este endpoint hace TODO en una sola operación (una transacción):**
+    - Crea la novela en la BD, o la actualiza si ya existe otra con el
+      mismo `source_url` (201 si se creó, 200 si se actualizó)
     - Descarga y guarda la imagen de portada
-    - Crea nombres alternativos
-    - Asocia géneros (crea si no existen)
-    - Crea todos los capítulos
+    - Sincroniza nombres alternativos y géneros (crea los que no existan)
+    - Crea los capítulos nuevos y actualiza los que cambiaron (se comparan
+      por hash del texto: re-importar una novela casi igual no reescribe nada)
     
     **Uso típico:**
     Un script externo hace scraping de un sitio web, organiza los datos
     en formato JSON y los envía a este endpoint.
     
+    El cuerpo puede llegar comprimido (`Content-Encoding: gzip`), como lo
+    envían los scripts de scrapers/ (api_upload.py).
+    
+    **Reintentos:** con la cabecera `Idempotency-Key`, repetir la petición
+    no importa la novela dos veces (services/idempotency.py):
+    - Si la importación con esa clave ya terminó (últimas 24 h y la novela
+      sigue existiendo), se devuelve la misma respuesta (cabecera
+      `Idempotent-Replayed: true`)
+    - Si sigue en curso, 409 con `Retry-After`
+    
     **Body ejemplo:**
 ```json
     {
@@ -83,224 +103,319 @@ def import_novel_from_scraper(
     }
 ```
     """
+    if idempotency_key is None:
+        result, created = _import_novel(data, session)
+        response.status_code = 201 if created else 200
+        return result
+
+    try:
+        record = idempotency.claim(session, idempotency_key)
+    except idempotency.ImportInProgress:
+        raise HTTPException(
+            status_code=409,
+            detail="Ya hay una importación en curso con esta Idempotency-Key",
+            headers={"Retry-After": "5"},
+        )
+
+    if record is not None:
+        # Ya importada: misma respuesta, sin tocar nada
+        print(f"♻️ Idempotency-Key repetida, devolviendo la respuesta guardada (novela {record.novel_id})")
+        if data.image_path and Path(data.image_path).resolve().parent == settings.INCOMING_DIR.resolve():
+            Path(data.image_path).unlink(missing_ok=True)  # La copia del reintento no se va a procesar
+        return JSONResponse(
+            status_code=record.status_code or 201,
+            content=idempotency.stored_response(record),
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    try:
+        result, created = _import_novel(data, session)
+    except BaseException:
+        idempotency.release(session, idempotency_key)
+        raise
+
+    response.status_code = 201 if created else 200
+    idempotency.complete(session, idempotency_key, response.status_code, result.model_dump(mode="json"),
+                         novel_id=result.novel_id)
+    return result
+
+
+class _StoredChapter(NamedTuple):
+    id: int
+    title: str
+    source_url: str | None
+    content_hash: str | None   # None = sin cuerpo en chapter_contents (o anterior a la migración 0007)
+
+
+def _stored_chapters(session: Session, novel_id: int) -> dict[int, _StoredChapter]:
+    """
+    order_number → capítulo guardado, con el hash de su texto.
+
+    El hash es una columna de 'chapters' (se calcula al escribir): no se
+    lee ni una fila de 'chapter_contents'.
+    """
+    rows = session.exec(
+        select(Chapter.order_number, Chapter.id, Chapter.title, Chapter.source_url, Chapter.content_hash)
+        .where(Chapter.novel_id == novel_id)
+    ).all()
+    return {order: _StoredChapter(*rest) for order, *rest in rows}
+
+
+def _import_novel(data: NovelImportData, session: Session) -> tuple[NovelImportResponse, bool]:
+    """
+    La importación en sí (ver import_novel_from_scraper).
+
+    Todo va en UNA transacción (flush para obtener IDs, un solo commit al
+    final): si algo falla no queda una novela a medias. El índice en
+    memoria y la portada se tocan después del commit.
+
+    Returns:
+        (respuesta, True si la novela se creó / False si ya existía)
+    """
+    now = datetime.now()
     
     # ───────────────────────────────────────────────────────────
-    # PASO 1: Verificar que no exista una novela con ese nombre
+    # PASO 1: Buscar la novela por source_url (crear o actualizar)
     # ───────────────────────────────────────────────────────────
     
-    existing = session.exec(
-        select(Novel).where(Novel.name == data.name)
+    novel = session.exec(
+        select(Novel).where(Novel.source_url == data.source_url)
     ).first()
     
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Ya existe una novela con el nombre '{data.name}' (ID: {existing.id})"
-        )
-    # ¿Por qué verificar?
-    # - Evitar duplicados
-    # - Si el scraper se ejecuta dos veces, no crea la novela dos veces
+    if novel is None:
+        same_name = session.exec(
+            select(Novel).where(Novel.name == data.name)
+        ).first()
+        if same_name is not None and same_name.source_url:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Ya existe una novela con el nombre '{data.name}' de otra fuente "
+                       f"({same_name.source_url}, ID: {same_name.id})"
+            )
+        novel = same_name  # Importada antes de guardar source_url: se adopta
+    # ¿Por qué source_url y no el nombre?
+    # - Es lo que identifica la novela en el sitio de origen
+    # - Volver a ejecutar el scraper (más capítulos, correcciones) actualiza
+    #   la misma novela en vez de fallar o duplicarla
     
+    created = False
+    novel_changed = False
     
-    # ───────────────────────────────────────────────────────────
-    # PASO 2: Crear la novela (sin imagen todavía)
-    # ───────────────────────────────────────────────────────────
+    fields = {
+        "name": data.name,
+        "author": data.author,
+        "description": data.description,
+        "rating": data.rating,
+        "status": data.status,
+        "source_url": data.source_url,
+    }
     
-    novel = Novel(
-        name=data.name,
-        author=data.author,
-        description=data.description,
-        rating=data.rating,
-        status=data.status,
-        source_url=data.source_url,
-        cover_path=None,  # Se asigna después
-        created_at=datetime.now(),
-        updated_at=datetime.now()
-    )
+    if novel is None:
+        novel = Novel(**fields, cover_path=None, created_at=now, updated_at=now)
+        session.add(novel)
+        try:
+            session.flush()  # ← ID autogenerado, sin commit
+            created = True
+            print(f"✅ Novela creada con ID: {novel.id}")
+        except IntegrityError:
+            # Otra importación de la misma fuente (otro worker, x.json y
+            # x.json.gz a la vez...) la creó entre el SELECT y el INSERT:
+            # el índice único lo impide y se sigue como actualización.
+            # Hasta aquí solo hubo lecturas: se descarta la transacción y
+            # la nueva ya ve la fila (en MySQL, el SELECT de antes no)
+            session.rollback()
+            novel = session.exec(
+                select(Novel).where(Novel.source_url == data.source_url)
+            ).first()
+            if novel is None:
+                raise
     
-    session.add(novel)
-    session.commit()
-    session.refresh(novel)  # ← Obtener el ID autogenerado
-    # Ahora novel.id existe (ej: 5)
+    if not created:
+        for field, value in fields.items():
+            if getattr(novel, field) != value:
+                setattr(novel, field, value)
+                novel_changed = True
+        print(f"♻️ Novela existente (ID: {novel.id}), comparando...")
     
-    print(f"✅ Novela creada con ID: {novel.id}")
+    assert novel.id is not None, "DB did not return novel id"
+    novel_id = novel.id
     
     
     # ───────────────────────────────────────────────────────────
-    # PASO 3: Procesar imagen de portada
+    # PASO 2: Nombres alternativos (los del JSON, ni más ni menos)
     # ───────────────────────────────────────────────────────────
     
-    cover_uploaded = False
+    stored_names = {
+        row.name: row
+        for row in session.exec(select(NovelName).where(NovelName.novel_id == novel_id))
+    }
+    wanted_names = list(dict.fromkeys(data.alternative_names))  # Sin repetidos, en orden
     
-    if data.image_path:
-        # Convertir string a Path
-        source_path = Path(data.image_path)
-        
-        # Verificar que el archivo existe
-        if source_path.exists() and source_path.is_file():
-            try:
-                # Abrir imagen con Pillow
-                img = Image.open(source_path)
-            
-                # Convertir a RGB si es necesario (WebP no soporta RGBA bien)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Crear fondo blanco
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-            
-                # Nombre del archivo destino: {id}.webp
-                target_filename = f"{novel.id}.webp"
-                target_path = settings.UPLOAD_DIR / target_filename
-            
-                # Guardar como WebP con calidad optimizada
-                img.save(
-                    target_path,
-                    format='WEBP',
-                    quality=85,  # Buena calidad, buen tamaño
-                    method=6     # Mejor compresión (0-6, más lento pero mejor)
-                )
-            
-                # Actualizar BD con la ruta
-                novel.cover_path = f"/static/novels/{target_filename}"
-                session.add(novel)
-                session.commit()
-            
-                cover_uploaded = True
-            
-                # Mostrar estadísticas
-                original_size = source_path.stat().st_size
-                new_size = target_path.stat().st_size
-                reduction = ((original_size - new_size) / original_size) * 100
-            
-                print(f"✅ Portada convertida a WebP: {target_path}")
-                print(f"   📊 Tamaño original: {original_size / 1024:.1f} KB")
-                print(f"   📊 Tamaño WebP: {new_size / 1024:.1f} KB")
-                print(f"   📊 Reducción: {reduction:.1f}%")
-            
-            except Exception as e:
-                print(f"⚠️ Error al procesar imagen: {e}")
-                # No falla el import si la imagen falla
-        else:
-            print(f"⚠️ Archivo de imagen no encontrado: {source_path}")
+    alt_names_created = 0
+    for name in wanted_names:
+        if name not in stored_names:
+            session.add(NovelName(novel_id=novel_id, name=name))
+            alt_names_created += 1
+    
+    alt_names_removed = 0
+    for name, row in stored_names.items():
+        if name not in wanted_names:
+            session.delete(row)
+            alt_names_removed += 1
     
     
     # ───────────────────────────────────────────────────────────
-    # PASO 4: Crear nombres alternativos
+    # PASO 3: Géneros (crear los que falten, sincronizar asociaciones)
     # ───────────────────────────────────────────────────────────
     
-    alt_names_created = 0
-    assert novel.id is not None, "DB did not return novel id"
-
-    for name in data.alternative_names:
-        novel_name = NovelName(
-             novel_id=novel.id, 
-            name=name
+    # Normalizar: minúsculas, sin espacios extra
+    genre_names = list(dict.fromkeys(name.lower().strip() for name in data.genres))
+    
+    genres = {
+        genre.name: genre
+        for genre in session.exec(
+            select(Genre).where(Genre.name.in_(genre_names))  # pyright: ignore[reportAttributeAccessIssue]
         )
-        session.add(novel_name)
-        alt_names_created += 1
+    } if genre_names else {}
     
-    if alt_names_created > 0:
-        session.commit()
-        print(f"✅ {alt_names_created} nombres alternativos creados")
+    genres_created = 0
+    for name in genre_names:
+        if name not in genres:
+            genres[name] = Genre(name=name)
+            session.add(genres[name])
+            genres_created += 1
+            print(f"✅ Género creado: '{name}'")
+    if genres_created:
+        session.flush()  # IDs de los géneros nuevos
+    
+    genre_ids = [genres[name].id for name in genre_names]
+    stored_genre_ids = set(session.exec(
+        select(NovelGenre.genre_id).where(NovelGenre.novel_id == novel_id)
+    ))
+    
+    genres_associated = 0
+    for genre_id in genre_ids:
+        if genre_id not in stored_genre_ids:
+            session.add(NovelGenre(novel_id=novel_id, genre_id=genre_id))  # pyright: ignore[reportArgumentType]
+            genres_associated += 1
+    
+    removed_genre_ids = stored_genre_ids - set(genre_ids)
+    if removed_genre_ids:
+        session.exec(
+            delete(NovelGenre)
+            .where(NovelGenre.novel_id == novel_id)  # pyright: ignore[reportArgumentType]
+            .where(NovelGenre.genre_id.in_(removed_genre_ids))  # pyright: ignore[reportAttributeAccessIssue]
+        )
     
     
     # ───────────────────────────────────────────────────────────
-    # PASO 5: Asociar géneros (crear si no existen)
+    # PASO 4: Capítulos (diff por hash del contenido)
     # ───────────────────────────────────────────────────────────
+    # - Nuevo order_number → INSERT
+    # - Mismo hash → no se toca (re-importar sin cambios no escribe texto)
+    # - Hash distinto → UPDATE del cuerpo; solo título/URL → UPDATE de metadatos
+    # - Los capítulos guardados que no vienen en el JSON se conservan
+    #   (el scraper puede descargar solo un rango)
     
-    genres_created = 0
-    genres_associated = 0
+    stored = {} if created else _stored_chapters(session, novel_id)
+    incoming = {chapter.order_number: chapter for chapter in data.chapters}  # Repetidos: gana el último
     
-    for genre_name in data.genres:
-        # Normalizar: minúsculas, sin espacios extra
-        genre_name_clean = genre_name.lower().strip()
+    chapters_created = 0
+    chapters_updated = 0
+    chapters_unchanged = 0
+    
+    for order_number, chapter_data in incoming.items():
+        current = stored.get(order_number)
         
-        # Buscar género existente
-        genre = session.exec(
-            select(Genre).where(Genre.name == genre_name_clean)
-        ).first()
+        if current is None:
+            session.add(Chapter(
+                novel_id=novel_id,
+                title=chapter_data.title,
+                content=chapter_data.content,
+                order_number=order_number,
+                source_url=chapter_data.source_url,
+                created_at=now
+            ))
+            chapters_created += 1
+            continue
         
-        # Si no existe, crearlo
-        if not genre:
-            genre = Genre(name=genre_name_clean)
-            session.add(genre)
-            session.commit()
-            session.refresh(genre)
-            genres_created += 1
-            print(f"✅ Género creado: '{genre_name_clean}'")
+        new_hash = content_hash(chapter_data.content)
+        body_changed = current.content_hash != new_hash
+        meta_changed = (current.title, current.source_url) != (chapter_data.title, chapter_data.source_url)
         
-        # Asociar a la novela (tabla intermedia)
-        # Verificar que no exista ya la asociación
-        existing_assoc = session.exec(
-            select(NovelGenre)
-            .where(NovelGenre.novel_id == novel.id)
-            .where(NovelGenre.genre_id == genre.id)
-        ).first()
-        assert genre.id is not None, "DB did not return novel id"
-
-        if not existing_assoc:
-            association = NovelGenre(
-                novel_id=novel.id,
-                genre_id=genre.id
+        if not body_changed and not meta_changed:
+            chapters_unchanged += 1
+            continue
+        
+        values: dict = {}
+        if meta_changed:
+            values.update(title=chapter_data.title, source_url=chapter_data.source_url)
+        if body_changed:
+            # update() no pasa por Chapter.content: el hash se escribe aquí
+            values.update(content_hash=new_hash, content_bytes=len(chapter_data.content.encode("utf-8")))
+        session.exec(
+            update(Chapter)
+            .where(Chapter.id == current.id)  # pyright: ignore[reportArgumentType]
+            .values(**values)
+        )
+        if body_changed and current.content_hash is None:
+            # Sin hash: capítulo sin cuerpo (o sin rellenar por la migración 0007)
+            session.merge(ChapterContent(chapter_id=current.id, content=chapter_data.content))
+        elif body_changed:
+            session.exec(
+                update(ChapterContent)
+                .where(ChapterContent.chapter_id == current.id)  # pyright: ignore[reportArgumentType]
+                .values(content=chapter_data.content)
             )
-            session.add(association)
-            genres_associated += 1
+        chapters_updated += 1
     
-    if genres_associated > 0:
-        session.commit()
-        print(f"✅ {genres_associated} géneros asociados")
+    
+    # ───────────────────────────────────────────────────────────
+    # PASO 5: Commit (una sola vez)
+    # ───────────────────────────────────────────────────────────
+    
+    changed = created or novel_changed or any((
+        alt_names_created, alt_names_removed, genres_associated, removed_genre_ids,
+        chapters_created, chapters_updated,
+    ))
+    if changed:
+        novel.updated_at = now
+    
+    session.commit()
+    
+    print(f"✅ {chapters_created} capítulos creados, {chapters_updated} actualizados, "
+          f"{chapters_unchanged} sin cambios")
+    
+    # Parchear el índice en memoria (facetas / filtros), ya con los datos en la BD
+    novel_index.upsert_novel(novel_id, data.status, data.rating)
+    novel_index.set_genres(novel_id, genre_ids)  # pyright: ignore[reportArgumentType]
     
     
     # ───────────────────────────────────────────────────────────
-    # PASO 6: Crear capítulos (evitando duplicados)
+    # PASO 6: Portada (después del commit: el worker lee la novela)
     # ───────────────────────────────────────────────────────────
-
-    chapters_created = 0
-    chapters_skipped = 0
-
-    for chapter_data in data.chapters:
-        # Verificar si el capítulo ya existe
-        existing_chapter = session.exec(
-            select(Chapter)
-            .where(Chapter.novel_id == novel.id)
-            .where(Chapter.order_number == chapter_data.order_number)
-        ).first()
-
-        if existing_chapter:
-            # Actualizar capítulo existente
-            existing_chapter.title = chapter_data.title
-            existing_chapter.content = chapter_data.content
-            existing_chapter.source_url = chapter_data.source_url
-            chapters_skipped += 1
-            print(f"   ⏭️  Capítulo {chapter_data.order_number} ya existe, actualizado")
-        else:
-            # Crear nuevo capítulo
-            chapter = Chapter(
-                novel_id=novel.id,
-                title=chapter_data.title,
-                content=chapter_data.content,
-                order_number=chapter_data.order_number,
-                source_url=chapter_data.source_url,
-                created_at=datetime.now()
-            )
-            session.add(chapter)
-            chapters_created += 1
-
-        # Commit cada 50 operaciones (optimización)
-        total_processed = chapters_created + chapters_skipped
-        if total_processed % 50 == 0:
-            session.commit()
-            print(f"   💾 {total_processed} capítulos procesados...")
-
-    # Commit final de capítulos restantes
-    if chapters_created > 0 or chapters_skipped > 0:
-        session.commit()
-        print(f"✅ {chapters_created} capítulos creados, {chapters_skipped} actualizados")
+    
+    cover_uploaded = False
+    
+    if data.image_path:
+        # Convertir string a Path
+        source_path = Path(data.image_path)
+        # Las copias que dejan los scripts en incoming/ se borran al terminar
+        staged = source_path.resolve().parent == settings.INCOMING_DIR.resolve()
+        
+        if not (source_path.exists() and source_path.is_file()):
+            print(f"⚠️ Archivo de imagen no encontrado: {source_path}")
+        elif created or not novel.cover_path:
+            # Se codifica a WebP en el pool de procesos (services/image_worker.py);
+            # novel.cover_path se actualiza cuando el archivo ya está escrito.
+            # La respuesta no espera a Pillow.
+            image_worker.submit_cover(novel_id, source_path, delete_source=staged)
+            cover_uploaded = True  # Encolada (se procesa en segundo plano)
+            print(f"🖼️ Portada encolada para convertir a WebP: {source_path}")
+        elif staged:
+            # Ya tiene portada: re-importar no la vuelve a codificar
+            # (para cambiarla: POST /novels/{id}/cover)
+            source_path.unlink(missing_ok=True)
     
     
     # ───────────────────────────────────────────────────────────
@@ -308,23 +423,29 @@ def import_novel_from_scraper(
     # ───────────────────────────────────────────────────────────
     
     # Determinar el mensaje según lo que se hizo
-    if chapters_skipped > 0 and chapters_created == 0:
-        message = f"Novela '{novel.name}' ya existía, capítulos actualizados"
-    elif chapters_created > 0 and chapters_skipped > 0:
-        message = f"Novela '{novel.name}' actualizada parcialmente"
-    else:
+    if created:
         message = f"Novela '{novel.name}' importada exitosamente"
+    elif changed:
+        message = f"Novela '{novel.name}' ya existía, actualizada"
+    else:
+        message = f"Novela '{novel.name}' ya existía, sin cambios"
 
-    return NovelImportResponse(
+    response = NovelImportResponse(
         success=True,
-        novel_id=novel.id,
+        novel_id=novel_id,
         message=message,
         stats={
+            "novel_created": created,
+            "novel_updated": novel_changed,
             "alternative_names_created": alt_names_created,
+            "alternative_names_removed": alt_names_removed,
             "genres_created": genres_created,
             "genres_associated": genres_associated,
+            "genres_removed": len(removed_genre_ids),
             "chapters_created": chapters_created,
-            "chapters_updated": chapters_skipped,
+            "chapters_updated": chapters_updated,
+            "chapters_unchanged": chapters_unchanged,
             "cover_uploaded": cover_uploaded
         }
     )
+    return response, created
@@ -1,36 +1,79 @@
 from pathlib import Path
 import os
-from dotenv import load_dotenv         
 
 
 
-class Settings:
-    load_dotenv()
-    db_username = os.getenv('USER_DB')
-    
-    db_password = os.getenv('PASSWORD_DB')
+def _load_env_file() -> None:
+    """
+    Carga el .env más cercano (backend/.env, luego la raíz del repo),
+    igual que load_dotenv() pero sin recorrer la pila de llamadas.
     
-    db_host = os.getenv('HOST_DB')
-    
-    db_name = os.getenv('NAME_DB')
+    python-dotenv solo se importa si hay un .env: en Docker las variables
+    llegan por docker-compose y no hace falta.
+    """
+    for directory in Path(__file__).resolve().parents[1:3]:
+        env_file = directory / ".env"
+        if env_file.is_file():
+            from dotenv import load_dotenv
+            load_dotenv(env_file)
+            return
 
-    app_name: str = "Api de Novelas"
 
-    #Define the SQLMODEL and connection
-    url_conection = f'mysql+pymysql://{db_username}:{db_password}@{db_host}:3306/{db_name}'
+class Settings:
+    app_name: str = "Api de Novelas"
 
- 
   # File Upload
     UPLOAD_DIR: Path = Path("static/novels")
     ALLOWED_EXTENSIONS: set = {"jpg", "jpeg", "png", "webp"}
     MAX_FILE_SIZE: int = 5 * 1024 * 1024  # 5MB
+    INCOMING_DIR: Path = UPLOAD_DIR / "incoming"  # Subidas pendientes de codificar
     
     # API
     API_V1_PREFIX: str = "/api/v1"
     
     def __init__(self):
+        # Variables de entorno: se leen al crear la instancia,
+        # no en el cuerpo de la clase (que se ejecuta al importar)
+        _load_env_file()
+        
+        self.db_username = os.getenv('USER_DB')
+        self.db_password = os.getenv('PASSWORD_DB')
+        self.db_host = os.getenv('HOST_DB')
+        self.db_name = os.getenv('NAME_DB')
+        
+        #Define the SQLMODEL and connection
+        self.url_conection = f'mysql+pymysql://{self.db_username}:{self.db_password}@{self.db_host}:3306/{self.db_name}'
+        
+        # Prefijo interno de nginx para servir portadas con sendfile
+        # (X-Accel-Redirect). Vacío = la API envía el archivo ella misma
+        self.ACCEL_REDIRECT_PREFIX: str = os.getenv('ACCEL_REDIRECT_PREFIX', '')
+        
+        # Procesos que codifican portadas (services/image_worker.py)
+        self.IMAGE_WORKERS: int = int(os.getenv('IMAGE_WORKERS', '2'))
+        
+        # Registro de invalidación entre workers (services/cache_bus.py).
+        # Vacío = un solo worker, no hace falta
+        self.CACHE_BUS_PATH: str = os.getenv('CACHE_BUS_PATH', '')
+        
+        # Tiempos por petición (core/timing.py): por encima de estos
+        # umbrales se registra una línea en el log "timing"
+        self.SLOW_REQUEST_MS: float = float(os.getenv('SLOW_REQUEST_MS', '500'))
+        self.SLOW_QUERY_MS: float = float(os.getenv('SLOW_QUERY_MS', '100'))
+        
+        # Rutas de diagnóstico (/admin/profile, ?__profile=1): cabecera
+        # X-Admin-Token. Vacío = desactivadas
+        self.ADMIN_TOKEN: str = os.getenv('ADMIN_TOKEN', '')
+        
+        # Tamaño máximo del JSON de /admin/import-novel una vez
+        # descomprimido (core/request_body.py), en MB
+        self.MAX_IMPORT_BYTES: int = int(os.getenv('MAX_IMPORT_MB', '512')) * 1024 * 1024
+
+        # Imprimir cada sentencia SQL (solo para depurar: falsea los tiempos)
+        self.DB_ECHO: bool = os.getenv('DB_ECHO', 'false').lower() in ('1', 'true', 'yes')
+        
         # Crear directorio de subida si no existe
         self.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        self.INCOMING_DIR.mkdir(parents=True, exist_ok=True)
 
 
 settings = Settings()
@@ -4,7 +4,8 @@ from typing import Annotated,Generator
 
 
 
-engine = create_engine(settings.url_conection,echo=True)
+engine = create_engine(settings.url_conection,echo=settings.DB_ECHO)
+# echo: DB_ECHO=true para ver el SQL (imprimir cada sentencia cuesta más que muchas consultas)
 
 def create_db_and_tables():
     import importlib
@@ -12,7 +13,8 @@ def create_db_and_tables():
     importlib.import_module("models.genre")   # define NovelGenre
     importlib.import_module("models.novel")   # usa NovelGenre
     importlib.import_module("models.chapter") # independiente
-    """Crea las tablas en la base de datos  definida en los modelos SQLModel."""
+    """Crea las tablas en la base de datos  definida en los modelos SQLModel.
+    Solo para desarrollo/pruebas: en producción el esquema lo crea Alembic."""
     SQLModel.metadata.create_all(engine)
 
 
@@ -0,0 +1,210 @@
+# core/profiling.py
+
+"""
+Profiler por muestreo para workers en producción (sin dependencias).
+
+Un hilo aparte mira cada `interval` segundos la pila de todos los hilos
+del proceso (sys._current_frames()) y cuenta cuántas veces aparece cada
+pila. El resultado es el formato "collapsed stacks" que entienden
+flamegraph.pl, speedscope o inferno:
+
+    MainThread;uvicorn.server:serve;asyncio.base_events:_run_once 812
+    AnyIO worker thread;api.novels:search_novels;sqlalchemy.orm.session:execute 97
+
+- Coste: solo mientras se perfila, y proporcional al muestreo, no a
+  las llamadas (a diferencia de cProfile / sys.setprofile)
+- Dos modos:
+  · GET /admin/profile?seconds=N   todo el proceso durante N segundos
+  · ?__profile=1 en cualquier ruta  solo esa petición (ProfileMiddleware)
+- Ambos requieren la cabecera X-Admin-Token (settings.ADMIN_TOKEN)
+"""
+
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+from core.config import settings
+
+
+DEFAULT_INTERVAL = 0.005
+# 200 muestras/s: suficiente resolución sin cargar el proceso
+
+MAX_DEPTH = 128
+# Recursiones profundas se recortan (el flamegraph no gana nada)
+
+_busy = threading.Lock()
+# Un solo perfil a la vez por proceso
+
+
+def is_admin(token: str | None) -> bool:
+    """¿La cabecera X-Admin-Token coincide? (sin ADMIN_TOKEN, nadie es admin)."""
+    if not settings.ADMIN_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token, settings.ADMIN_TOKEN)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SAMPLER
+# ═══════════════════════════════════════════════════════════════
+
+def _frame_label(frame) -> str:
+    """"api.novels:search_novels" (módulo + función, sin número de línea)."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    name = getattr(code, "co_qualname", code.co_name)  # co_qualname: Python 3.11+
+    return f"{module}:{name}".replace(";", ",").replace(" ", "_")
+
+
+class Sampler:
+    """
+    Muestrea las pilas de los hilos del proceso.
+
+    Args:
+        interval: Segundos entre muestras
+        keep: Filtro opcional (thread_id, frames de raíz a hoja) → bool
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL,
+                 keep: Callable[[int, list], bool] | None = None):
+        self.interval = interval
+        self.keep = keep
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "Sampler":
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        next_sample = time.perf_counter()
+
+        while not self._stop.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                frames = []
+                while frame is not None and len(frames) < MAX_DEPTH:
+                    frames.append(frame)
+                    frame = frame.f_back
+                frames.reverse()
+
+                if self.keep is not None and not self.keep(thread_id, frames):
+                    continue
+
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                thread_name = names.get(thread_id, f"thread-{thread_id}").replace(" ", "_")
+
+                self.stacks[";".join([thread_name, *map(_frame_label, frames)])] += 1
+
+            self.samples += 1
+            next_sample += self.interval
+            self._stop.wait(max(next_sample - time.perf_counter(), 0))
+
+    def collapsed(self) -> str:
+        """Una línea por pila: "frame;frame;frame cuenta" (la más frecuente primero)."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_process(seconds: float, interval: float = DEFAULT_INTERVAL) -> Sampler | None:
+    """
+    Perfil de todo el proceso (bloquea `seconds`: llamar fuera del event loop).
+
+    Returns:
+        El sampler ya detenido, o None si ya hay otro perfil en curso.
+    """
+    if not _busy.acquire(blocking=False):
+        return None
+    try:
+        sampler = Sampler(interval).start()
+        time.sleep(seconds)
+        sampler.stop()
+        return sampler
+    finally:
+        _busy.release()
+
+
+# ═══════════════════════════════════════════════════════════════
+# PERFIL DE UNA PETICIÓN (?__profile=1)
+# ═══════════════════════════════════════════════════════════════
+
+class ProfileMiddleware:
+    """
+    Con ?__profile=1 y X-Admin-Token válido, la petición se ejecuta
+    normalmente pero se responde con su perfil en vez de con el resultado.
+
+    Solo se guardan las pilas del hilo del event loop (routing, async) y
+    las de los hilos que están ejecutando el endpoint de la ruta
+    (endpoints síncronos en el threadpool). Si llegan a la vez otras
+    peticiones a la misma ruta, también aparecen.
+    """
+
+    def __init__(self, app, interval: float = 0.001):
+        # 1 ms: una petición dura pocos ms, con 5 ms apenas habría muestras
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or b"__profile=1" not in scope.get("query_string", b""):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        token = headers.get(b"x-admin-token", b"").decode("latin-1")
+        if not is_admin(token) or not _busy.acquire(blocking=False):
+            await self.app(scope, receive, send)  # Sin permiso u ocupado: petición normal
+            return
+
+        loop_thread = threading.get_ident()
+
+        def keep(thread_id: int, frames: list) -> bool:
+            if thread_id == loop_thread:
+                return True
+            endpoint = scope.get("endpoint")  # Lo pone el router al resolver la ruta
+            code = getattr(endpoint, "__code__", None)
+            return code is not None and any(frame.f_code is code for frame in frames)
+
+        status = 500
+
+        async def discard(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sampler = Sampler(self.interval, keep).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+            _busy.release()
+
+        body = sampler.collapsed().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"content-disposition", b'attachment; filename="request.collapsed"'),
+                (b"x-profile-samples", str(sampler.samples).encode()),
+                (b"x-profile-status", str(status).encode()),
+                (b"x-profile-ms", f"{elapsed * 1000:.1f}".encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,87 @@
+# core/request_body.py
+
+"""
+Cuerpos de petición comprimidos (Content-Encoding: gzip).
+
+    cliente ──gzip, chunked──▶ DecompressingRoute ──▶ JSON ──▶ endpoint
+
+Los scripts de subida (scrapers/api_upload.py) envían la novela
+comprimida. FastAPI lee el cuerpo con request.body(); aquí se sustituye
+esa lectura por una que descomprime cada trozo según llega del socket:
+
+- Límite sobre el tamaño DESCOMPRIMIDO (MAX_IMPORT_BYTES): un gzip
+  pequeño no puede expandirse sin fin en memoria (zip bomb) → 413
+- gzip corrupto o cortado → 400; otra codificación → 415
+- Sin Content-Encoding el cuerpo se lee como siempre
+
+Uso (por router):
+
+    router = APIRouter(prefix="/admin", route_class=DecompressingRoute)
+"""
+
+import zlib
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from core.config import settings
+
+
+GZIP_ENCODINGS = ("gzip", "x-gzip")
+
+
+class DecompressedRequest(Request):
+    """Request cuyo body() devuelve el cuerpo ya descomprimido."""
+
+    async def body(self) -> bytes:
+        if hasattr(self, "_body"):
+            return self._body
+
+        encoding = self.headers.get("content-encoding", "identity").strip().lower()
+        if encoding in ("", "identity"):
+            return await super().body()
+        if encoding not in GZIP_ENCODINGS:
+            raise HTTPException(status_code=415, detail=f"Content-Encoding no soportado: {encoding}")
+
+        limit = settings.MAX_IMPORT_BYTES
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)  # 16+: formato gzip
+        chunks = []
+        size = 0
+
+        try:
+            async for chunk in self.stream():
+                data = decompressor.decompress(chunk, limit - size + 1)
+                while True:
+                    size += len(data)
+                    if size > limit:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"Cuerpo descomprimido mayor que {limit // (1024 * 1024)} MB",
+                        )
+                    chunks.append(data)
+                    # max_length deja el resto de la entrada en unconsumed_tail
+                    if not decompressor.unconsumed_tail:
+                        break
+                    data = decompressor.decompress(decompressor.unconsumed_tail, limit - size + 1)
+            chunks.append(decompressor.flush())
+        except zlib.error as e:
+            raise HTTPException(status_code=400, detail=f"Cuerpo gzip inválido: {e}")
+
+        if not decompressor.eof:
+            raise HTTPException(status_code=400, detail="Cuerpo gzip incompleto")
+
+        self._body = b"".join(chunks)
+        return self._body
+
+
+class DecompressingRoute(APIRoute):
+    """APIRoute que entrega a FastAPI un DecompressedRequest."""
+
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            return await original_handler(DecompressedRequest(request.scope, request.receive))
+
+        return handler
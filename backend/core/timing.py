@@ -0,0 +1,187 @@
+# core/timing.py
+
+"""
+Tiempos por petición: total, tiempo en la BD y número de consultas.
+
+    petición ──▶ TimingMiddleware ──▶ endpoint ──▶ SQLAlchemy
+                     │                                 │
+                     │   before/after_cursor_execute ◀─┘  (suma db_time, queries)
+                     ▼
+    Server-Timing: app;dur=41.2, db;dur=12.7;desc="5 queries"
+
+- Cada petición tiene su RequestTiming en un ContextVar. Los endpoints
+  síncronos corren en el threadpool con una copia del contexto: ven el
+  mismo objeto y las consultas se suman a la petición correcta
+- Peticiones y consultas lentas (umbrales en settings) se registran como
+  una línea JSON en el logger "timing"
+- Los totales van a core/metrics.py → GET /metrics
+"""
+
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core import metrics
+from core.config import settings
+
+
+logger = logging.getLogger("timing")
+
+
+# ═══════════════════════════════════════════════════════════════
+# MÉTRICAS
+# ═══════════════════════════════════════════════════════════════
+
+REQUESTS = metrics.Counter(
+    "http_requests_total", "Peticiones HTTP atendidas", ("method", "route", "status"),
+)
+REQUEST_SECONDS = metrics.Histogram(
+    "http_request_duration_seconds", "Duración total de la petición", ("method", "route"),
+)
+REQUEST_DB_SECONDS = metrics.Histogram(
+    "http_request_db_seconds", "Tiempo en la BD por petición", ("method", "route"),
+)
+REQUEST_QUERIES = metrics.Histogram(
+    "http_request_db_queries", "Consultas SQL por petición", ("method", "route"),
+    buckets=metrics.COUNT_BUCKETS,
+)
+SLOW_REQUESTS = metrics.Counter(
+    "http_slow_requests_total", "Peticiones por encima de SLOW_REQUEST_MS", ("method", "route"),
+)
+QUERY_SECONDS = metrics.Histogram(
+    "db_query_duration_seconds", "Duración de cada consulta SQL",
+)
+SLOW_QUERIES = metrics.Counter(
+    "db_slow_queries_total", "Consultas por encima de SLOW_QUERY_MS",
+)
+
+
+# ═══════════════════════════════════════════════════════════════
+# ESTADO POR PETICIÓN
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class RequestTiming:
+    method: str
+    path: str
+    db_seconds: float = 0.0
+    queries: int = 0
+
+
+_current: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+def current() -> RequestTiming | None:
+    """Tiempos de la petición en curso (None fuera de una petición)."""
+    return _current.get()
+
+
+# ═══════════════════════════════════════════════════════════════
+# CONSULTAS (eventos de SQLAlchemy)
+# ═══════════════════════════════════════════════════════════════
+
+def install_query_timing(engine: Engine) -> None:
+    """Registra los eventos en el engine (una vez, al arrancar)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Pila: una consulta puede lanzar otra en la misma conexión (ej: eventos)
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+
+    timing = _current.get()
+    if timing is not None:
+        timing.db_seconds += elapsed
+        timing.queries += 1
+
+    QUERY_SECONDS.observe(elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        SLOW_QUERIES.inc()
+        _log("slow_query", {
+            "ms": round(elapsed * 1000, 1),
+            "statement": " ".join(statement.split())[:500],  # Sin parámetros (pueden ser datos)
+            "executemany": executemany,
+            "route": timing.path if timing else None,
+        })
+
+
+def _log(kind: str, fields: dict) -> None:
+    logger.warning(json.dumps({"event": kind, **fields}, ensure_ascii=False))
+
+
+# ═══════════════════════════════════════════════════════════════
+# MIDDLEWARE
+# ═══════════════════════════════════════════════════════════════
+
+class TimingMiddleware:
+    """
+    Middleware ASGI puro (BaseHTTPMiddleware añade una tarea por petición
+    y no deja añadir cabeceras sin envolver la respuesta).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming(method=scope["method"], path=scope["path"])
+        token = _current.set(timing)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                app_ms = (time.perf_counter() - start) * 1000
+                header = (
+                    f'app;dur={app_ms:.1f}, '
+                    f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.queries} queries"'
+                )
+                message.setdefault("headers", []).append((b"server-timing", header.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._record(scope, timing, status, time.perf_counter() - start)
+
+    @staticmethod
+    def _record(scope, timing: RequestTiming, status: int, elapsed: float) -> None:
+        route = scope.get("route")
+        # Plantilla ("/novels/{novel_id}"), no la URL: cardinalidad acotada
+        label = getattr(route, "path", None) or ("<unmatched>" if status == 404 else "<mount>")
+
+        REQUESTS.inc(timing.method, label, str(status))
+        REQUEST_SECONDS.observe(elapsed, timing.method, label)
+        REQUEST_DB_SECONDS.observe(timing.db_seconds, timing.method, label)
+        REQUEST_QUERIES.observe(timing.queries, timing.method, label)
+
+        if elapsed * 1000 >= settings.SLOW_REQUEST_MS:
+            SLOW_REQUESTS.inc(timing.method, label)
+            _log("slow_request", {
+                "method": timing.method,
+                "route": label,
+                "path": timing.path,
+                "status": status,
+                "ms": round(elapsed * 1000, 1),
+                "db_ms": round(timing.db_seconds * 1000, 1),
+                "queries": timing.queries,
+            })
@@ -0,0 +1,63 @@
+# gunicorn.conf.py
+
+"""
+Configuración del modo multi-worker (python start.py --workers N).
+
+    maestro ── import main (preload) ── rebuild del índice ── gc.freeze()
+       │
+       ├── fork ──▶ worker 1 ┐  heredan el índice ya construido
+       ├── fork ──▶ worker 2 ├  (páginas compartidas copy-on-write)
+       └── fork ──▶ worker N ┘
+
+- El índice se construye UNA vez en el maestro: los workers no repiten
+  las consultas al arrancar y comparten su memoria mientras no cambie
+- gc.freeze() saca esos objetos del recolector: sin él, el GC de cada
+  worker tocaría sus cabeceras y copiaría las páginas igualmente
+- Las conexiones a la BD NO se heredan: se cierran antes del fork
+- Las escrituras se propagan con el bus de services/cache_bus.py
+"""
+
+import gc
+import os
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+preload_app = True
+# Importar la app en el maestro (necesario para calentar antes del fork)
+
+timeout = 120
+graceful_timeout = 30
+accesslog = "-"
+
+
+def when_ready(server):
+    """Maestro, app ya importada y antes de crear los workers."""
+    from sqlmodel import Session
+
+    from core.config import settings
+    from core.data_base import engine
+    from services.cache_bus import CacheBus
+    from services.novel_index import novel_index
+
+    if settings.CACHE_BUS_PATH:
+        bus = CacheBus(settings.CACHE_BUS_PATH)
+        bus.reset()  # Cambios de una ejecución anterior ya no aplican
+        novel_index.attach_bus(bus)
+
+    server.log.info("🧮 Construyendo índice de novelas (antes del fork)...")
+    with Session(engine) as session:
+        novel_index.rebuild(session)
+
+    engine.dispose()  # Sin sockets abiertos que compartir con los hijos
+    gc.freeze()
+    server.log.info("✅ Índice listo, %d objetos congelados", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    """Worker recién creado: nunca reutilizar conexiones del padre."""
+    from core.data_base import engine
+
+    engine.dispose(close=False)
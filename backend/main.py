@@ -5,20 +5,27 @@ Punto de entrada de la aplicación FastAPI.
 """
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-from pathlib import Path
 
 # ═══════════════════════════════════════════════════════════════
 # IMPORTS DESDE CORE
 # ═══════════════════════════════════════════════════════════════
 from core.config import settings
-from core.data_base import create_db_and_tables
+from core.data_base import engine
+from core import metrics
+from core.timing import TimingMiddleware, install_query_timing
+from core.profiling import ProfileMiddleware
+from sqlmodel import Session
+from services.novel_index import novel_index
+from services.cache_bus import CacheBus
+from services import image_worker
 # ═══════════════════════════════════════════════════════════════
 # IMPORTS DE ROUTERS
 # ═══════════════════════════════════════════════════════════════
 
-from api import genres_router, novels_router, chapters_router,scraping_router
+from api import genres_router, novels_router, chapters_router,scraping_router, images_router, admin_router
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -31,21 +38,33 @@ async def lifespan(app: FastAPI):
     Gestiona el ciclo de vida de la aplicación.
     
     Startup:
-    - Crea todas las tablas en la BD
+    - No ejecuta DDL: el esquema se gestiona con Alembic
+      (`alembic upgrade head` antes de arrancar, ver migrations/)
+    - Construye el índice en memoria de géneros/estados (facetas),
+      salvo que ya venga construido del maestro de gunicorn (preload)
+    - Con varios workers, conecta el índice al bus de invalidación
     
     Shutdown:
-    - Limpieza (por ahora vacío)
+    - Espera a las portadas en cola y cierra el pool de imágenes
     """
     # STARTUP
     print("🚀 Iniciando aplicación...")
-    print("📊 Creando tablas en base de datos...")
-    create_db_and_tables()
-    print("✅ Base de datos lista")
+    if settings.CACHE_BUS_PATH and novel_index.bus is None:
+        novel_index.attach_bus(CacheBus(settings.CACHE_BUS_PATH))
+    
+    if novel_index.warm:
+        print("✅ Índice heredado del proceso maestro")
+    else:
+        print("🧮 Construyendo índice de novelas en memoria...")
+        with Session(engine) as session:
+            novel_index.rebuild(session)
+        print("✅ Índice listo")
     
     yield  # Aquí la app corre
     
     # SHUTDOWN
     print("👋 Cerrando aplicación...")
+    image_worker.shutdown_pool()
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -61,6 +80,20 @@ app = FastAPI(
 )
 
 
+# ═══════════════════════════════════════════════════════════════
+# TIEMPOS POR PETICIÓN (core/timing.py)
+# ═══════════════════════════════════════════════════════════════
+
+install_query_timing(engine)
+# Tiempo en la BD y número de consultas de cada petición
+
+app.add_middleware(TimingMiddleware)
+# Cabecera Server-Timing, log de peticiones/consultas lentas y GET /metrics
+
+app.add_middleware(ProfileMiddleware)
+# ?__profile=1 + X-Admin-Token → perfil de la petición en vez del resultado
+
+
 # ═══════════════════════════════════════════════════════════════
 # INCLUIR ROUTERS
 # ═══════════════════════════════════════════════════════════════
@@ -85,6 +118,14 @@ app.include_router(chapters_router)
 
 app.include_router(scraping_router)
 
+app.include_router(images_router)
+# Portadas con ETag / caché immutable (api/images.py)
+# - GET /api/v1/images/{id}?variant=thumb&v=<hash>
+
+app.include_router(admin_router)
+# Diagnóstico, requiere X-Admin-Token (api/admin.py)
+# - GET /api/v1/admin/profile?seconds=30
+
 
 # ═══════════════════════════════════════════════════════════════
 # ENDPOINT RAÍZ (Health Check)
@@ -132,6 +173,21 @@ def api_info():
     }
 
 
+# ═══════════════════════════════════════════════════════════════
+# MÉTRICAS (Prometheus)
+# ═══════════════════════════════════════════════════════════════
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Contadores e histogramas por ruta en formato de Prometheus.
+    
+    Valores del proceso que atiende la petición (con varios workers,
+    cada uno tiene los suyos).
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # ═══════════════════════════════════════════════════════════════
 # MONTAR ARCHIVOS ESTÁTICOS
 # ═══════════════════════════════════════════════════════════════
@@ -141,23 +197,3 @@ app.mount(
     StaticFiles(directory="static"),
     name="static"
 )
-
-
-# ═══════════════════════════════════════════════════════════════
-# ENDPOINT MANUAL PARA IMÁGENES (fallback)
-# ═══════════════════════════════════════════════════════════════
-
-from fastapi.responses import FileResponse
-
-@app.get("/images/{filename}")
-async def get_image(filename: str):
-    """
-    Endpoint manual para servir imágenes.
-    Fallback si StaticFiles no funciona.
-    """
-    file_path = Path("static/novels") / filename
-    if file_path.exists() and file_path.is_file():
-        return FileResponse(file_path)
-    else:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="Image not found")
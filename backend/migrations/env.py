@@ -0,0 +1,47 @@
+# migrations/env.py
+
+"""
+Entorno de Alembic: conecta las migraciones con la BD de la aplicación.
+
+- La URL sale de core.config.settings (igual que la app)
+- SQLModel.metadata se usa para `alembic revision --autogenerate`
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlmodel import SQLModel
+
+from core.config import settings
+import models  # noqa: F401  # Registra todas las tablas en SQLModel.metadata
+
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+# Permite apuntar a otra BD sin tocar el .env:
+#   alembic -x db_url=sqlite:///dev.db upgrade head
+db_url = context.get_x_argument(as_dictionary=True).get("db_url", settings.url_conection)
+
+
+def run_migrations_online() -> None:
+    """Aplica las migraciones sobre una conexión real."""
+    connectable = create_engine(db_url, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+# Sin modo offline (--sql): las migraciones inspeccionan la BD real
+run_migrations_online()
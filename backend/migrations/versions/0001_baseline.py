@@ -0,0 +1,87 @@
+"""baseline: esquema inicial (equivalente a init.sql)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+
+Las BDs creadas con init.sql o con el antiguo create_all() ya tienen
+estas tablas: en ese caso la migración no hace nada y solo queda
+registrada en alembic_version.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "genres" not in existing:
+        op.create_table(
+            "genres",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(100), nullable=False, unique=True),
+        )
+
+    if "novels" not in existing:
+        op.create_table(
+            "novels",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("rating", sa.Float(), nullable=True),
+            sa.Column("description", sa.String(5000), nullable=False),
+            sa.Column("cover_path", sa.String(500), nullable=True),
+            sa.Column("source_url", sa.String(500), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum("ongoing", "completed", "hiatus", "dropped", name="novelstatus"),
+                nullable=False,
+            ),
+            sa.Column("author", sa.String(200), nullable=False),
+        )
+        op.create_index("ix_novels_name", "novels", ["name"])
+
+    if "novel_names" not in existing:
+        op.create_table(
+            "novel_names",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id"), nullable=False),
+            sa.Column("name", sa.String(200), nullable=False),
+        )
+
+    if "novel_genres" not in existing:
+        op.create_table(
+            "novel_genres",
+            sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id"), primary_key=True),
+            sa.Column("genre_id", sa.Integer(), sa.ForeignKey("genres.id"), primary_key=True),
+        )
+
+    if "chapters" not in existing:
+        op.create_table(
+            "chapters",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("novel_id", sa.Integer(), sa.ForeignKey("novels.id"), nullable=False),
+            sa.Column("title", sa.String(300), nullable=False),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("order_number", sa.Integer(), nullable=False),
+            sa.Column("source_url", sa.String(500), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.UniqueConstraint("novel_id", "order_number"),
+        )
+        op.create_index("ix_chapters_novel_id", "chapters", ["novel_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("chapters")
+    op.drop_table("novel_genres")
+    op.drop_table("novel_names")
+    op.drop_table("novels")
+    op.drop_table("genres")
@@ -0,0 +1,55 @@
+"""FKs hacia novels/genres con ON DELETE CASCADE
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+Las FKs se recrean usando el nombre real que tenga cada BD
+(chapters_ibfk_1, etc.), por eso se leen con el inspector.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# (tabla, columna, tabla referenciada)
+CASCADE_FKS = [
+    ("chapters", "novel_id", "novels"),
+    ("novel_names", "novel_id", "novels"),
+    ("novel_genres", "novel_id", "novels"),
+    ("novel_genres", "genre_id", "genres"),
+]
+
+
+def _recreate_foreign_keys(ondelete: str | None) -> None:
+    bind = op.get_bind()
+
+    # SQLite no permite ALTER de constraints; solo MySQL (la BD real)
+    if bind.dialect.name != "mysql":
+        return
+
+    inspector = sa.inspect(bind)
+
+    for table, column, referred in CASCADE_FKS:
+        for fk in inspector.get_foreign_keys(table):
+            if fk["constrained_columns"] != [column] or not fk["name"]:
+                continue
+
+            op.drop_constraint(fk["name"], table, type_="foreignkey")
+            op.create_foreign_key(
+                fk["name"], table, referred, [column], ["id"], ondelete=ondelete
+            )
+
+
+def upgrade() -> None:
+    _recreate_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    _recreate_foreign_keys(None)
@@ -0,0 +1,54 @@
+"""índices para las consultas más frecuentes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+- novels(status, rating, id): GET /novels/?status=... ordenado por rating
+- novels(rating, id): GET /novels/, /novels/best/, /novels/search/
+- novel_genres(genre_id, novel_id): filtro por género (la PK empieza por novel_id)
+- novel_names(novel_id) y novel_names(name): detalle y búsqueda por nombre alternativo
+
+Si la tabla ya tiene un índice que empieza por esas columnas no se crea
+otro: las BDs de init.sql ya traen KEY `novel_id` en novel_names.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_novels_status_rating_id", "novels", ["status", "rating", "id"]),
+    ("ix_novels_rating_id", "novels", ["rating", "id"]),
+    ("ix_novel_genres_genre_id_novel_id", "novel_genres", ["genre_id", "novel_id"]),
+    ("ix_novel_names_novel_id", "novel_names", ["novel_id"]),
+    ("ix_novel_names_name", "novel_names", ["name"]),
+]
+
+
+def _covered(inspector, table: str, columns: list) -> bool:
+    """True si algún índice de la tabla empieza por estas columnas."""
+    return any(
+        index["column_names"][: len(columns)] == columns
+        for index in inspector.get_indexes(table)
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if not _covered(inspector, table, columns):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _ in reversed(INDEXES):
+        if name in {index["name"] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,51 @@
+"""separar el texto de los capítulos en chapter_contents
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+
+Partición vertical: 'chapters' se queda con los metadatos y el texto
+pasa a 'chapter_contents' (1:1). Los datos se copian con un único
+INSERT ... SELECT antes de borrar la columna.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chapter_contents",
+        sa.Column(
+            "chapter_id",
+            sa.Integer(),
+            sa.ForeignKey("chapters.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("content", sa.Text(), nullable=True),
+    )
+
+    op.execute(
+        "INSERT INTO chapter_contents (chapter_id, content) "
+        "SELECT id, content FROM chapters WHERE content IS NOT NULL"
+    )
+
+    op.drop_column("chapters", "content")
+
+
+def downgrade() -> None:
+    op.add_column("chapters", sa.Column("content", sa.Text(), nullable=True))
+
+    op.execute(
+        "UPDATE chapters SET content = ("
+        "SELECT cc.content FROM chapter_contents cc WHERE cc.chapter_id = chapters.id"
+        ")"
+    )
+
+    op.drop_table("chapter_contents")
@@ -0,0 +1,39 @@
+"""claves de idempotencia de /admin/import-novel
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+Una fila por Idempotency-Key: los reintentos de una importación que ya
+terminó reciben la respuesta guardada en vez de importar otra vez.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_requests",
+        sa.Column("key", sa.String(length=200), primary_key=True),
+        sa.Column(
+            "novel_id",
+            sa.Integer(),
+            sa.ForeignKey("novels.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("import_requests")
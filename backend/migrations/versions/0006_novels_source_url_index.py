@@ -0,0 +1,25 @@
+"""índice en novels.source_url
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+/admin/import-novel identifica la novela por su URL de origen (upsert):
+cada importación empieza con un SELECT ... WHERE source_url = ?
+"""
+
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_novels_source_url", "novels", ["source_url"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_novels_source_url", table_name="novels")
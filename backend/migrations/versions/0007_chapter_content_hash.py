@@ -0,0 +1,66 @@
+"""hash y tamaño del texto en chapters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+
+chapters.content_hash (sha256 hex) y chapters.content_bytes permiten
+saber si un capítulo cambió sin leer 'chapter_contents'. Las filas
+existentes se rellenan: en MySQL con un único UPDATE ... JOIN (SHA2 en
+la BD), en otras BDs calculando el hash aquí por lotes.
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.add_column("chapters", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("chapters", sa.Column("content_bytes", sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    if bind.dialect.name == "mysql":
+        op.execute(
+            "UPDATE chapters c JOIN chapter_contents cc ON cc.chapter_id = c.id "
+            "SET c.content_hash = SHA2(cc.content, 256), "
+            "c.content_bytes = OCTET_LENGTH(cc.content) "
+            "WHERE cc.content IS NOT NULL"
+        )
+        return
+
+    # SQLite (desarrollo) no tiene SHA2
+    update = sa.text("UPDATE chapters SET content_hash = :hash, content_bytes = :bytes WHERE id = :id")
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT chapter_id, content FROM chapter_contents "
+                "WHERE chapter_id > :last AND content IS NOT NULL "
+                "ORDER BY chapter_id LIMIT :limit"
+            ),
+            {"last": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        params = []
+        for chapter_id, content in rows:
+            data = content.encode("utf-8")
+            params.append({"id": chapter_id, "hash": hashlib.sha256(data).hexdigest(), "bytes": len(data)})
+        bind.execute(update, params)
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column("chapters", "content_bytes")
+    op.drop_column("chapters", "content_hash")
@@ -0,0 +1,26 @@
+"""índice en import_requests.created_at
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+
+Las claves de idempotencia caducan a las 24 h: cada importación borra
+las viejas (DELETE ... WHERE created_at < ?). Con el índice el DELETE
+solo recorre (y bloquea) las filas caducadas, no la tabla entera.
+"""
+
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_import_requests_created_at", "import_requests", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_requests_created_at", table_name="import_requests")
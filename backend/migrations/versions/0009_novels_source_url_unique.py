@@ -0,0 +1,51 @@
+"""novels.source_url único
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+
+/admin/import-novel hace SELECT por source_url y, si no está, INSERT:
+con un índice normal dos importaciones a la vez de la misma fuente
+podían crear dos novelas. Con el índice único la segunda falla al
+insertar y sigue como actualización.
+
+Antes de crearlo se resuelven los duplicados que ya existan: la novela
+más antigua (menor id) conserva la source_url y las demás quedan con
+NULL (no se borra nada; se pueden revisar y eliminar a mano). NULL no
+cuenta para el índice único.
+"""
+
+from alembic import op
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "mysql":
+        # MySQL no deja leer en una subconsulta la tabla que se actualiza
+        op.execute(
+            "UPDATE novels n JOIN ("
+            "SELECT source_url, MIN(id) AS keep_id FROM novels "
+            "WHERE source_url IS NOT NULL GROUP BY source_url HAVING COUNT(*) > 1"
+            ") d ON n.source_url = d.source_url AND n.id <> d.keep_id "
+            "SET n.source_url = NULL"
+        )
+    else:
+        op.execute(
+            "UPDATE novels SET source_url = NULL "
+            "WHERE source_url IS NOT NULL AND id > ("
+            "SELECT MIN(n2.id) FROM novels n2 WHERE n2.source_url = novels.source_url"
+            ")"
+        )
+
+    op.drop_index("ix_novels_source_url", table_name="novels")
+    op.create_index("ix_novels_source_url", "novels", ["source_url"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_novels_source_url", table_name="novels")
+    op.create_index("ix_novels_source_url", "novels", ["source_url"])
@@ -16,13 +16,16 @@ entonces profeticé como me fue mandado; y hubo un ruido,
 y hubo un temblor, y los huesos se juntaron, cada hueso en su lugar.
 """
 
-# IMPORTANTE: Aplicar el parche ANTES de importar los modelos
-from . import _patch_sqlmodel  # noqa: F401
+# Las relaciones se anotan como "Model" / List["Model"] (sin
+# 'from __future__ import annotations' en esos archivos): SQLModel
+# las resuelve solo, sin parches en tiempo de importación.
 
 from .genre import Genre
 from .novel import Novel, NovelName, NovelStatus
 from .chapter import Chapter
+from .chapter_content import ChapterContent
 from .novel_genre import NovelGenre   # ← ahora viene de su archivo propio
+from .import_request import ImportRequest
 
 
 
@@ -33,4 +36,6 @@ __all__ = [
     "NovelName",
     "NovelStatus",
     "Chapter",
+    "ChapterContent",
+    "ImportRequest",
 ]
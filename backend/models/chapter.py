@@ -1,11 +1,11 @@
  # models/chapter.py
-from __future__ import annotations
 from sqlmodel import Field, SQLModel, Relationship
 from datetime import datetime
-from sqlalchemy import Column, Text
 """soporte para restricciones únicas,en este caso para evitar capítulos duplicados por novela y número de orden"""
 from sqlmodel import UniqueConstraint
 
+from .chapter_content import ChapterContent, content_hash
+
 
 """definición de la tabla de capítulos de novelas"""
 from typing import TYPE_CHECKING
@@ -14,20 +14,59 @@ if TYPE_CHECKING:
 
 
 class Chapter(SQLModel, table=True):
-    """Tabla de capítulos"""
+    """
+    Tabla de capítulos (solo metadatos).
+
+    El texto vive en 'chapter_contents' (ChapterContent), pero se sigue
+    usando como antes: Chapter(content=...), chapter.content = ...
+
+    content_hash / content_bytes se calculan al asignar 'content': saber si
+    un capítulo cambió no requiere leer su texto.
+    """
     __tablename__: str = "chapters"
     __table_args__ = (
         UniqueConstraint("novel_id", "order_number"),
     )
     
     id: int | None = Field(default=None, primary_key=True)
-    novel_id: int = Field(foreign_key="novels.id", index=True)
+    novel_id: int = Field(foreign_key="novels.id", index=True, ondelete="CASCADE")
     title: str = Field(max_length=300)
-    content: str = Field(sa_column=Column(Text))  # Texto completo del capítulo
     order_number: int  # Número de capítulo (1, 2, 3...)
     source_url: str | None = Field(default=None, max_length=500)
+    content_hash: str | None = Field(default=None, max_length=64)  # sha256 (hex) del texto
+    content_bytes: int | None = None  # Tamaño del texto en UTF-8
     created_at: datetime = Field(default_factory=datetime.now)
      
      # RELACIÓN inversa
     """definición de la relación muchos a uno con novela"""
     novel: "Novel" = Relationship(back_populates="chapters")
+
+    """definición de la relación uno a uno con el cuerpo del capítulo"""
+    body: "ChapterContent" = Relationship(
+        sa_relationship_kwargs={
+            "uselist": False,
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True  # La BD borra el cuerpo en cascada
+        }
+    )
+
+    def __init__(self, **data):
+        # 'content' ya no es columna de esta tabla: se guarda en 'body'
+        content = data.pop("content", None)
+        super().__init__(**data)
+        if content is not None:
+            self.content = content
+
+    @property
+    def content(self) -> str:
+        """Texto completo (carga 'chapter_contents' al primer acceso)."""
+        return self.body.content if self.body else ""
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.content_hash = content_hash(value)
+        self.content_bytes = len(value.encode("utf-8"))
+        if self.body is None:
+            self.body = ChapterContent(content=value)
+        else:
+            self.body.content = value
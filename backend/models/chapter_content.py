@@ -0,0 +1,27 @@
+# models/chapter_content.py
+from __future__ import annotations
+import hashlib
+
+from sqlmodel import Field, SQLModel
+from sqlalchemy import Column, Text
+
+"""definición de la tabla con el texto completo de cada capítulo"""
+
+
+class ChapterContent(SQLModel, table=True):
+    """
+    Tabla con el cuerpo de los capítulos (partición vertical).
+
+    'chapters' solo guarda metadatos pequeños: listados, conteos y
+    navegación recorren una tabla compacta que cabe en el buffer pool.
+    El texto solo se lee al abrir un capítulo.
+    """
+    __tablename__: str = "chapter_contents"
+
+    chapter_id: int = Field(foreign_key="chapters.id", primary_key=True, ondelete="CASCADE")
+    content: str = Field(sa_column=Column(Text))  # Texto completo del capítulo
+
+
+def content_hash(content: str) -> str:
+    """sha256 (hex) del texto en UTF-8: el mismo valor que SHA2(content, 256) en MySQL."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -1,7 +1,6 @@
 # pyright: reportAssignmentType=none
 # pyright: reportIncompatibleVariableOverride=none
 
-from __future__ import annotations
 from sqlmodel import SQLModel, Field, Relationship
 from typing import List
 
@@ -20,7 +19,7 @@ class Genre(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     name: str = Field(max_length=100, unique=True)
 
-    novels: "Novel" = Relationship(
+    novels: List["Novel"] = Relationship(
         back_populates="genres",
         link_model=NovelGenre
     )
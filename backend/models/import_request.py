@@ -0,0 +1,26 @@
+# models/import_request.py
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+from sqlalchemy import Column, Text
+
+"""definición de la tabla de claves de idempotencia de /admin/import-novel"""
+
+
+class ImportRequest(SQLModel, table=True):
+    """
+    Una fila por cabecera Idempotency-Key recibida en /admin/import-novel.
+
+    Mientras la importación está en curso status_code es NULL; al terminar
+    guarda el status y el JSON de la respuesta, que se devuelve tal cual a
+    los reintentos con la misma clave (ver services/idempotency.py).
+    Las filas se borran pasadas 24 h.
+    """
+    __tablename__: str = "import_requests"
+
+    key: str = Field(primary_key=True, max_length=200)
+    novel_id: int | None = Field(default=None, foreign_key="novels.id", ondelete="SET NULL")
+    status_code: int | None = None
+    response: str | None = Field(default=None, sa_column=Column(Text))
+    created_at: datetime = Field(default_factory=datetime.now, index=True)  # Caducidad (services/idempotency.RETENTION)
+    completed_at: datetime | None = None
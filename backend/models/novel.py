@@ -1,8 +1,8 @@
-from __future__ import annotations
 from sqlmodel import SQLModel, Field, Relationship
 from typing import List
 from datetime import datetime
 from enum import Enum
+from sqlalchemy import Index
 
 """definición de las tablas relacionadas con novelas, incluyendo nombres alternativos y géneros"""
 from typing import TYPE_CHECKING
@@ -20,8 +20,8 @@ class NovelName(SQLModel, table=True):
     __tablename__: str = "novel_names"
 
     id: int | None = Field(default=None, primary_key=True)
-    novel_id: int = Field(foreign_key="novels.id")
-    name: str = Field(max_length=200)
+    novel_id: int = Field(foreign_key="novels.id", index=True, ondelete="CASCADE")
+    name: str = Field(max_length=200, index=True)
     """definición de la relación muchos a uno con novela"""
     novel: "Novel" = Relationship(back_populates="names")
 
@@ -43,6 +43,14 @@ class Novel(SQLModel, table=True):
     Este modelo representa la estructura real de la tabla.
     """
     __tablename__: str = "novels"  # Nombre explícito de tabla
+    __table_args__ = (
+        # Índices de las consultas calientes (ver migrations/versions/0003)
+        Index("ix_novels_status_rating_id", "status", "rating", "id"),
+        Index("ix_novels_rating_id", "rating", "id"),
+        # /admin/import-novel busca la novela por su URL de origen (0006);
+        # único (0009): dos importaciones a la vez no pueden duplicarla
+        Index("ix_novels_source_url", "source_url", unique=True),
+    )
     
     id: int | None = Field(default=None, primary_key=True)
     name: str = Field(index=True, max_length=200)
@@ -62,16 +70,22 @@ class Novel(SQLModel, table=True):
 
      # Nombres alternativos (1:N)
     """definición de la relación uno a muchos con nombres alternativos"""
-    names: "NovelName" = Relationship(back_populates="novel")
+    names: List["NovelName"] = Relationship(
+        back_populates="novel",
+        sa_relationship_kwargs={"passive_deletes": True}  # La BD borra en cascada
+    )
 
     # Géneros (N:M)
     """definición de la relación muchos a muchos con géneros"""
-    genres: "Genre" = Relationship(
+    genres: List["Genre"] = Relationship(
         back_populates="novels",
         link_model=NovelGenre
     ) 
     """definición de la relación uno a muchos con capítulos"""
-    chapters: "Chapter" = Relationship(back_populates="novel")
+    chapters: List["Chapter"] = Relationship(
+        back_populates="novel",
+        sa_relationship_kwargs={"passive_deletes": True}  # No cargar capítulos al borrar
+    )
 
 
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 
 class NovelGenre(SQLModel, table=True):
     __tablename__ = "novel_genres"
+    __table_args__ = (
+        # La PK (novel_id, genre_id) no sirve para filtrar por género
+        Index("ix_novel_genres_genre_id_novel_id", "genre_id", "novel_id"),
+    )
 
-    novel_id: int = Field(foreign_key="novels.id", primary_key=True)
-    genre_id: int = Field(foreign_key="genres.id", primary_key=True)
+    novel_id: int = Field(foreign_key="novels.id", primary_key=True, ondelete="CASCADE")
+    genre_id: int = Field(foreign_key="genres.id", primary_key=True, ondelete="CASCADE")
 
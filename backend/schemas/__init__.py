@@ -5,7 +5,7 @@ Módulo schemas: Schemas de validación Pydantic.
 """
 
 # Genre schemas
-from .genre import GenreBase, GenreCreate, GenreResponse
+from .genre import GenreBase, GenreCreate, GenreResponse, GenreCountResponse
 
 # Novel Name schemas
 from .novel_name import NovelNameBase, NovelNameCreate, NovelNameResponse
@@ -18,7 +18,10 @@ from .novel import (
     NovelResponse,
     NovelDetailResponse,
     NovelGenresUpdate,
-    NovelCardResponse
+    NovelCardResponse,
+    GenreFacet,
+    NovelFacetsResponse,
+    CoverUploadResponse
 )
 
 # Chapter schemas
@@ -26,7 +29,8 @@ from .chapter import (
     ChapterBase,
     ChapterCreate,
     ChapterSummary,
-    ChapterDetailResponse
+    ChapterDetailResponse,
+    ChapterHashesResponse
 )
 
 __all__ = [
@@ -34,6 +38,7 @@ __all__ = [
     "GenreBase",
     "GenreCreate",
     "GenreResponse",
+    "GenreCountResponse",
     
     # Novel Names
     "NovelNameBase",
@@ -48,10 +53,14 @@ __all__ = [
     "NovelDetailResponse",
     "NovelGenresUpdate",
     "NovelCardResponse",
+    "GenreFacet",
+    "NovelFacetsResponse",
+    "CoverUploadResponse",
     
     # Chapters
     "ChapterBase",
     "ChapterCreate",
     "ChapterSummary",
     "ChapterDetailResponse",
+    "ChapterHashesResponse",
 ]
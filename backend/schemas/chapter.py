@@ -93,3 +93,25 @@ class ChapterDetailResponse(ChapterBase):
     
     class Config:
         from_attributes = True
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCHEMA PARA HASHES DEL CONTENIDO
+# ═══════════════════════════════════════════════════════════════
+
+class ChapterHashesResponse(BaseModel):
+    """
+    Hash del texto de cada capítulo de una novela.
+    
+    GET /novels/5/chapters/hashes → {"novel_id": 5, "count": 2,
+                                     "hashes": {"1": "9f86d0...", "2": "60303a..."}}
+    
+    Los scrapers comparan con sha256 del texto descargado y solo
+    envían los capítulos que cambiaron.
+    """
+    
+    novel_id: int
+    count: int
+    hashes: dict[int, str]
+    # order_number → sha256 (hex) del texto en UTF-8
+    # Los capítulos sin texto no aparecen
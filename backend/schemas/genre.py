@@ -86,3 +86,21 @@ class GenreResponse(GenreBase):
         # response = GenreResponse.from_orm(genre_db)  ← Convierte a schema
         #
         # FastAPI hace esto automáticamente cuando usas response_model
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCHEMA PARA LISTADO CON CONTEO
+# ═══════════════════════════════════════════════════════════════
+
+class GenreCountResponse(GenreResponse):
+    """
+    Género con cantidad de novelas.
+    
+    ¿Cuándo se usa?
+    - GET /genres/ → el frontend puede mostrar "Fantasía (312)"
+    
+    ¿De dónde sale el conteo?
+    - Del índice en memoria (services/novel_index.py), no de un GROUP BY
+    """
+    
+    novels_count: int = 0
@@ -266,3 +266,52 @@ class NovelCardResponse(BaseModel):
     # NO incluye: description completa (solo excerpt)
     # NO incluye: alternative_names
     # NO incluye: dates
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCHEMAS PARA FACETAS (navegación por géneros)
+# ═══════════════════════════════════════════════════════════════
+
+class GenreFacet(BaseModel):
+    """Un género con cuántas novelas del resultado actual lo tienen."""
+    id: int
+    name: str
+    count: int
+
+
+class NovelFacetsResponse(BaseModel):
+    """
+    Conteos por género y estado para el resultado de una búsqueda.
+    
+    GET /novels/facets/?genre_ids=1&genre_ids=4&genre_mode=and
+    
+    Ejemplo:
+    {
+      "total": 42,
+      "genres": [{"id": 4, "name": "fantasía", "count": 42}, ...],
+      "status": {"ongoing": 30, "completed": 12}
+    }
+    """
+    total: int
+    # Novelas en el resultado actual
+    
+    genres: List[GenreFacet] = []
+    # Ordenados de mayor a menor conteo (sin géneros en 0)
+    
+    status: dict[str, int] = {}
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCHEMA PARA SUBIDA DE PORTADA
+# ═══════════════════════════════════════════════════════════════
+
+class CoverUploadResponse(BaseModel):
+    """
+    Respuesta de POST /novels/{id}/cover.
+    
+    La portada se codifica en segundo plano: cover_path se actualiza
+    cuando termina (consultar GET /novels/{id} después).
+    """
+    novel_id: int
+    status: str = "processing"
+    message: str
@@ -177,19 +177,22 @@ class NovelImportResponse(BaseModel):
     # True si todo salió bien
     
     novel_id: int
-    # ID de la novela creada
+    # ID de la novela creada (o actualizada, si ya existía con ese source_url)
     
     message: str
     # Mensaje descriptivo
     # Ejemplo: "Novela 'Lord of Mysteries' importada exitosamente"
     
     stats: dict
-    # Estadísticas de lo que se creó
-    # Ejemplo:
+    # Estadísticas de lo que se creó / actualizó
+    # Ejemplo (re-importación con 3 capítulos nuevos):
     # {
-    #   "alternative_names_created": 3,
-    #   "genres_created": 2,
-    #   "genres_associated": 4,
-    #   "chapters_created": 150,
-    #   "cover_uploaded": True
+    #   "novel_created": False,
+    #   "alternative_names_created": 0,
+    #   "genres_created": 0,
+    #   "genres_associated": 0,
+    #   "chapters_created": 3,
+    #   "chapters_updated": 1,
+    #   "chapters_unchanged": 149,
+    #   "cover_uploaded": False
     # }
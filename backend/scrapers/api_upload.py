@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+api_upload.py
+Subida de una novela a POST /admin/import-novel sin cargarla en memoria
+
+    archivo ──▶ iter_novel ──▶ JSON ──▶ gzip ──▶ cuerpo chunked ──▶ API
+                (capítulo a capítulo)
+
+- El cuerpo es un generador: requests lo envía con Transfer-Encoding:
+  chunked según se produce, sin construirlo entero antes
+- Content-Encoding: gzip; la API lo descomprime al leer
+  (core/request_body.py). El texto de los capítulos comprime ~3x
+- En memoria: un capítulo y el buffer del compresor
+- Lee los mismos formatos que novel_io.py (.json, .ndjson, .gz, .zst)
+- Reintentos con Idempotency-Key: una clave nueva por subida, la misma en
+  todos sus reintentos; si un intento llegó a importar y se perdió la
+  respuesta, el siguiente recibe la guardada. Volver a lanzar el script
+  usa otra clave e importa de nuevo (el upsert por source_url no duplica)
+- upload_directory: todas las novelas de una carpeta, N a la vez sobre
+  un pool de conexiones, con un informe JSON al final
+- Solo capítulos cambiados: con los hashes que ya tiene la API
+  (GET /novels/{id}/chapters/hashes) no se envían los capítulos cuyo
+  texto es idéntico; la API conserva los que no vienen en el JSON
+
+Uso:
+    response, stats = upload_novel("mis_novelas/x.json", api_url,
+                                   overrides={"image_path": "/ruta/portada.jpg"})
+    stats.chapters, stats.json_bytes, stats.sent_bytes
+
+    summary = upload_directory(find_novels("mis_novelas"), api_url, parallel=4,
+                               report_path="mis_novelas/upload_report.json")
+
+    known = fetch_chapter_hashes(api_url, novel_id)
+    response, stats = upload_novel("mis_novelas/x.json", api_url, known_hashes=known)
+    stats.skipped  # capítulos no enviados (mismo texto que en la API)
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from http_client import BACKOFF, RETRIES, ScraperSession, write_atomic
+from novel_io import COMPRESSIONS, FORMATS, iter_novel, read_metadata
+
+
+CHUNK_SIZE = 64 * 1024
+# Bytes comprimidos por trozo del cuerpo chunked
+
+COMPRESS_LEVEL = 6
+
+TIMEOUT = (10, 300)
+# (conexión, respuesta): la API importa todo antes de contestar
+
+RETRY_STATUS = (409, 429, 500, 502, 503, 504)
+# 409: la misma Idempotency-Key sigue importándose (la API pide esperar)
+
+SKIPPED_FILES = ('batch_state.json', 'upload_report.json')
+# JSON de la carpeta que no son novelas (estado de downland_big.py, informes)
+
+
+@dataclass
+class UploadStats:
+    chapters: int = 0
+    json_bytes: int = 0   # JSON sin comprimir
+    sent_bytes: int = 0   # Cuerpo enviado (gzip)
+    skipped: int = 0      # Capítulos no enviados: la API ya tiene ese texto
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def chapter_hash(content: str) -> str:
+    """sha256 (hex) del texto en UTF-8: el mismo que guarda la API en chapters.content_hash."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def iter_json(
+    path: str,
+    overrides: Optional[Dict] = None,
+    stats: Optional[UploadStats] = None,
+    known_hashes: Optional[Dict[int, str]] = None,
+) -> Iterator[bytes]:
+    """
+    El JSON de la novela en trozos: metadatos, un capítulo por trozo y cierre.
+
+    overrides: Claves de los metadatos que se sustituyen al enviar (ej: image_path)
+    known_hashes: order_number → hash que ya tiene la API; los capítulos
+        con el mismo texto no se envían (un cambio solo de título tampoco)
+    """
+    stats = stats if stats is not None else UploadStats()
+    metadata, chapters = iter_novel(path)
+    metadata.update(overrides or {})
+    sent_keys = set(metadata)
+
+    with closing(chapters):  # Si el envío se corta a medias
+        header = _dumps({key: value for key, value in metadata.items() if key != 'chapters'})[1:-1]
+        yield b'{' + header + (b',' if header else b'') + b'"chapters":['
+
+        for chapter in chapters:
+            if known_hashes and known_hashes.get(chapter.get('order_number')) == chapter_hash(chapter.get('content', '')):
+                stats.skipped += 1
+                continue
+            yield (b',' if stats.chapters else b'') + _dumps(chapter)
+            stats.chapters += 1
+
+    # Claves que aparecieron después de "chapters" en el archivo (raro)
+    extra = {key: value for key, value in metadata.items() if key not in sent_keys}
+    yield b']' + (b',' + _dumps(extra)[1:-1] if extra else b'') + b'}'
+
+
+def gzip_chunks(pieces: Iterator[bytes], stats: UploadStats, level: int = COMPRESS_LEVEL) -> Iterator[bytes]:
+    """Comprime en gzip sobre la marcha, en trozos de ~CHUNK_SIZE."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # 16+: cabecera gzip
+    pending = []
+    pending_size = 0
+
+    for piece in pieces:
+        stats.json_bytes += len(piece)
+        data = compressor.compress(piece)
+        if not data:
+            continue
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= CHUNK_SIZE:
+            chunk = b''.join(pending)
+            stats.sent_bytes += len(chunk)
+            yield chunk
+            pending, pending_size = [], 0
+
+    chunk = b''.join(pending) + compressor.flush()
+    stats.sent_bytes += len(chunk)
+    yield chunk
+
+
+def upload_novel(
+    path: str,
+    api_url: str,
+    headers: Optional[Dict] = None,
+    overrides: Optional[Dict] = None,
+    timeout=TIMEOUT,
+    session: Optional[requests.Session] = None,
+    known_hashes: Optional[Dict[int, str]] = None,
+) -> Tuple[requests.Response, UploadStats]:
+    """
+    POST de la novela en streaming (gzip + chunked).
+
+    Devuelve la respuesta sin comprobar el status (raise_for_status decide)
+    y las estadísticas del envío. El cuerpo es un generador: no se
+    reintenta solo, hay que volver a llamar.
+    """
+    stats = UploadStats()
+    request_headers = {
+        'Content-Type': 'application/json',
+        'Content-Encoding': 'gzip',
+        **(headers or {}),
+    }
+    body = gzip_chunks(iter_json(path, overrides, stats, known_hashes), stats)
+    response = (session or requests).post(api_url, data=body, headers=request_headers, timeout=timeout)
+    return response, stats
+
+
+def hashes_url(api_url: str, novel_id: int) -> str:
+    """.../admin/import-novel → .../novels/{id}/chapters/hashes de la misma API."""
+    return f"{api_url.rsplit('/admin/', 1)[0]}/novels/{novel_id}/chapters/hashes"
+
+
+def fetch_chapter_hashes(
+    api_url: str,
+    novel_id: int,
+    session: Optional[requests.Session] = None,
+    headers: Optional[Dict] = None,
+    timeout=TIMEOUT,
+) -> Optional[Dict[int, str]]:
+    """
+    order_number → hash del texto de los capítulos que ya tiene la API.
+
+    None si la novela ya no existe (404): hay que enviarla entera.
+    """
+    response = (session or requests).get(hashes_url(api_url, novel_id), headers=headers, timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return {int(order): digest for order, digest in response.json()['hashes'].items()}
+
+
+# ═══════════════════════════════════════════════════════════════
+# REINTENTOS (Idempotency-Key)
+# ═══════════════════════════════════════════════════════════════
+
+def idempotency_key() -> str:
+    """
+    Clave para UNA subida: se genera al empezar y se repite solo en sus
+    reintentos. No sale del contenido del archivo: subir otra vez el
+    mismo archivo (tras borrar la novela o editarla en la API) tiene que
+    importarlo, no devolver la respuesta de la vez anterior.
+    """
+    return f"novel-{uuid.uuid4().hex}"
+
+
+@dataclass
+class UploadResult:
+    path: str
+    status: str = 'pending'       # ok | replayed | failed | skipped
+    http_status: Optional[int] = None
+    attempts: int = 0
+    seconds: float = 0.0
+    novel_id: Optional[int] = None
+    chapters: int = 0
+    skipped_chapters: int = 0     # Sin cambios respecto a la API: no enviados
+    json_bytes: int = 0
+    sent_bytes: int = 0
+    error: Optional[str] = None
+
+
+def _retry_delay(response: Optional[requests.Response], attempt: int, backoff: float) -> float:
+    """Retry-After si la API lo indica; si no, backoff exponencial."""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return backoff * 2 ** attempt
+
+
+def upload_with_retries(
+    path: str,
+    api_url: str,
+    session: Optional[requests.Session] = None,
+    headers: Optional[Dict] = None,
+    overrides: Optional[Dict] = None,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    timeout=TIMEOUT,
+    known_hashes: Optional[Dict[int, str]] = None,
+) -> UploadResult:
+    """
+    upload_novel con reintentos ante fallos de red, timeouts, 409, 429 y
+    5xx. Todos los intentos llevan la misma Idempotency-Key: si uno llegó
+    a importar y se perdió la respuesta, el siguiente recibe la guardada.
+    """
+    result = UploadResult(path=path)
+    request_headers = {'Idempotency-Key': idempotency_key(), **(headers or {})}
+    start = time.perf_counter()
+
+    for attempt in range(retries + 1):
+        result.attempts = attempt + 1
+        response = None
+        try:
+            response, stats = upload_novel(path, api_url, headers=request_headers, overrides=overrides,
+                                           timeout=timeout, session=session, known_hashes=known_hashes)
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            result.error = f"{type(e).__name__}: {e}"
+        else:
+            result.http_status = response.status_code
+            result.chapters, result.json_bytes, result.sent_bytes = stats.chapters, stats.json_bytes, stats.sent_bytes
+            result.skipped_chapters = stats.skipped
+            if response.ok:
+                result.status = 'replayed' if response.headers.get('Idempotent-Replayed') else 'ok'
+                result.novel_id = response.json().get('novel_id')
+                result.error = None
+                break
+            result.error = response.text[:300]
+            if response.status_code not in RETRY_STATUS:
+                break
+
+        if attempt < retries:
+            time.sleep(_retry_delay(response, attempt, backoff))
+
+    if result.status == 'pending':
+        result.status = 'failed'
+    result.seconds = round(time.perf_counter() - start, 2)
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════
+# CARPETA COMPLETA
+# ═══════════════════════════════════════════════════════════════
+
+def find_novels(directory: str) -> List[str]:
+    """Archivos de novela de la carpeta (.json/.ndjson, comprimidos o no; sin .part)."""
+    suffixes = tuple(f".{fmt}{compression}" for fmt in FORMATS
+                     for compression in ('', *COMPRESSIONS.values()))
+    return sorted(
+        str(path) for path in Path(directory).iterdir()
+        if path.is_file() and path.name.endswith(suffixes) and path.name not in SKIPPED_FILES
+    )
+
+
+def _previous_novel_ids(report_path: str) -> Dict[str, int]:
+    """ruta → novel_id de las subidas correctas de un informe anterior."""
+    try:
+        report = json.loads(Path(report_path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return {r['path']: r['novel_id'] for r in report.get('results', [])
+            if r.get('status') in ('ok', 'replayed') and r.get('novel_id')}
+
+
+def upload_directory(
+    paths: List[str],
+    api_url: str,
+    parallel: int = 4,
+    headers: Optional[Dict] = None,
+    prepare: Optional[Callable[[str, Dict], Dict]] = None,
+    report_path: Optional[str] = None,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    only_changed: bool = False,
+) -> Dict:
+    """
+    Sube `paths` de `parallel` en `parallel` (una sesión, un pool de
+    conexiones keep-alive para todos los hilos).
+
+    Args:
+        prepare: (ruta, metadatos) → overrides de esa novela (ej: copiar la portada)
+        report_path: Dónde escribir el informe JSON (resumen + un resultado por archivo)
+        only_changed: Solo enviar los capítulos cuyo texto cambió. El
+            novel_id de cada archivo sale del informe anterior (report_path);
+            los archivos que no estaban en él se envían enteros
+
+    Returns:
+        El resumen (el mismo que va al informe, sin los resultados)
+    """
+    session = ScraperSession(pool_size=parallel, retries=0)  # Los reintentos los hace upload_with_retries
+    novel_ids = _previous_novel_ids(report_path) if only_changed and report_path else {}
+
+    def upload(path: str) -> UploadResult:
+        try:
+            metadata = read_metadata(path)
+            if 'name' not in metadata:
+                return UploadResult(path=path, status='skipped', error="No es un JSON de novela")
+            overrides = prepare(path, metadata) if prepare else None
+            known_hashes = None
+            if path in novel_ids:
+                known_hashes = fetch_chapter_hashes(api_url, novel_ids[path], session=session, headers=headers)
+        except Exception as e:
+            return UploadResult(path=path, status='failed', error=f"{type(e).__name__}: {e}")
+        return upload_with_retries(path, api_url, session=session, headers=headers, overrides=overrides,
+                                   retries=retries, backoff=backoff, known_hashes=known_hashes)
+
+    results: List[UploadResult] = []
+    start = time.perf_counter()
+
+    with session, ThreadPoolExecutor(max_workers=parallel, thread_name_prefix='upload') as pool:
+        futures = [pool.submit(upload, path) for path in paths]
+        for finished, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            name = os.path.basename(result.path)
+            if result.status in ('ok', 'replayed'):
+                replayed = ', ya importada antes' if result.status == 'replayed' else ''
+                unchanged = f" (+{result.skipped_chapters} sin cambios)" if result.skipped_chapters else ''
+                print(f"✅ [{finished}/{len(paths)}] {name}: {result.chapters} caps{unchanged}, "
+                      f"{result.sent_bytes / 1024:.0f} KB, {result.seconds:.1f} s "
+                      f"({result.attempts} intento(s){replayed})")
+            elif result.status == 'skipped':
+                print(f"⏭️  [{finished}/{len(paths)}] {name}: {result.error}")
+            else:
+                print(f"❌ [{finished}/{len(paths)}] {name}: HTTP {result.http_status} "
+                      f"tras {result.attempts} intento(s) — {result.error}")
+
+    wall = time.perf_counter() - start
+    uploaded = [r for r in results if r.status in ('ok', 'replayed')]
+    chapters = sum(r.chapters for r in uploaded)
+    sent_mb = sum(r.sent_bytes for r in uploaded) / (1024 * 1024)
+
+    summary = {
+        'api_url': api_url,
+        'files': len(paths),
+        'ok': sum(r.status == 'ok' for r in results),
+        'replayed': sum(r.status == 'replayed' for r in results),
+        'failed': sum(r.status == 'failed' for r in results),
+        'skipped': sum(r.status == 'skipped' for r in results),
+        'retried': sum(r.attempts > 1 for r in results),
+        'chapters': chapters,
+        'chapters_skipped': sum(r.skipped_chapters for r in uploaded),
+        'json_mb': round(sum(r.json_bytes for r in uploaded) / (1024 * 1024), 2),
+        'sent_mb': round(sent_mb, 2),
+        'wall_s': round(wall, 2),
+        'novels_per_s': round(len(uploaded) / wall, 3) if wall else 0.0,
+        'chapters_per_s': round(chapters / wall, 1) if wall else 0.0,
+        'sent_mb_per_s': round(sent_mb / wall, 2) if wall else 0.0,
+        'parallel': parallel,
+        'failures': [{'path': r.path, 'http_status': r.http_status, 'attempts': r.attempts, 'error': r.error}
+                     for r in results if r.status == 'failed'],
+    }
+
+    if report_path:
+        report = {**summary, 'results': [asdict(r) for r in sorted(results, key=lambda r: r.path)]}
+        write_atomic(Path(report_path), json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    return summary
@@ -11,6 +11,8 @@ import argparse
 import re
 from typing import Optional
 
+from http_client import shared_session
+
 
 def find_novel_slug(query: str) -> Optional[str]:
     """
@@ -20,10 +22,7 @@ def find_novel_slug(query: str) -> Optional[str]:
     - Nombre: El Villano Que Quiere Vivir
     """
     base_url = "https://novelasligera.com"
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    session = shared_session()
     
     # Método 1: Si ya es una URL completa, extraer el slug
     if query.startswith('http'):
@@ -65,10 +64,7 @@ def search_novels_by_name(query: str, session: requests.Session = None) -> Optio
     """Busca novelas por nombre y devuelve el slug de la primera coincidencia"""
     
     if session is None:
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        session = shared_session()
     
     # URL de búsqueda
     search_url = f"https://novelasligera.com/?s={query.replace(' ', '+')}"
@@ -145,10 +141,7 @@ def search_novels(query: str):
     
     print(f"\n🔍 Buscando: '{query}'\n")
     
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    session = shared_session()
     
     # URL de búsqueda
     search_url = f"https://novelasligera.com/?s={query.replace(' ', '+')}"
@@ -243,7 +236,7 @@ def list_popular_novels():
     print("\n📊 Obteniendo novelas populares...\n")
     
     try:
-        response = requests.get("https://novelasligera.com", timeout=10)
+        response = shared_session().get("https://novelasligera.com", timeout=10)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -4,24 +4,32 @@ Scraper para NovelasLigera.com
 Descarga novelas ligeras y genera JSON compatible con tu API
 """
 
-import requests
 from bs4 import BeautifulSoup
-import json
 import re
 import time
 import os
-from typing import Dict, List, Optional
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
+from urllib.parse import urlparse
 import argparse
 
+from http_client import ScraperSession, write_atomic
+from novel_io import COMPRESSIONS, FORMATS, NovelWriter, output_path
+from pipeline import process_context, run_pipeline
+
 
 class NovelasLigeraScraper:
-    def __init__(self, base_url: str = "https://novelasligera.com"):
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+    def __init__(self, base_url: str = "https://novelasligera.com", request_delay: float = 1.0,
+                 cache_dir: Optional[str] = None, offline: bool = False,
+                 session: Optional[ScraperSession] = None):
+        self.base_url = base_url.rstrip('/')
+        self.request_delay = request_delay  # Pausa entre capítulos (cortesía con el sitio)
+        # Pool + reintentos con backoff; con cache_dir, las páginas sin cambios llegan como 304
+        # offline=True: todo sale de la caché, sin red
+        # session: una ya configurada (ej: con RateLimiter compartido); ignora cache_dir/offline
+        self.session = session or ScraperSession(cache_dir=cache_dir, offline=offline)
     
     def get_novel_info(self, novel_slug: str) -> Dict:
         """Obtiene información básica de la novela y lista de capítulos"""
@@ -373,20 +381,93 @@ class NovelasLigeraScraper:
             print(f"  📄 Descargando: {chapter_url}")
             response = self.session.get(chapter_url, timeout=30)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            content = self._extract_chapter_content(soup)
-            
-            if content:
-                content = self._clean_content(content)
-                return content
+            return self.parse_chapter(response.text)
             
+        except Exception as e:
+            print(f"  ❌ Error en capítulo: {e}")
             return None
-            
+    
+    def parse_chapter(self, html: str) -> Optional[str]:
+        """Contenido limpio de un capítulo a partir de su HTML (sin red)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        content = self._extract_chapter_content(soup)
+        
+        if content:
+            return self._clean_content(content)
+        
+        return None
+    
+    def _reparse_chapters(self, chapters: List[Dict], workers: Optional[int]) -> Iterator[Optional[str]]:
+        """
+        Contenido de cada capítulo desde la caché, en orden.
+        
+        El parseo (BeautifulSoup + regex) es CPU puro: se reparte entre
+        `workers` procesos, cada uno lee y descomprime sus páginas.
+        """
+        urls = [chapter['url'] for chapter in chapters]
+        workers = workers or os.cpu_count() or 1
+        
+        if workers == 1 or len(urls) < 2:
+            for url in urls:
+                yield self._parse_cached(url)
+            return
+        
+        cache_dir = str(self.session.cache.directory)  # pyright: ignore[reportAttributeAccessIssue]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                                 initargs=(self.base_url, cache_dir), mp_context=process_context()) as pool:
+            yield from pool.map(_parse_cached_chapter, urls, chunksize=8)
+    
+    def _pipeline_chapters(self, chapters: List[Dict], concurrency: int, workers: Optional[int],
+                           on_result=None) -> List[Optional[str]]:
+        """
+        Descarga y parseo a la vez (pipeline.py): `concurrency` peticiones
+        en vuelo y el parseo en `workers` procesos, con una cola acotada
+        entre medias. request_delay pasa a ser la separación mínima entre
+        el inicio de dos peticiones.
+        
+        on_result(índice, contenido) recibe cada capítulo en orden en
+        cuanto está (y entonces la lista devuelta va vacía).
+        """
+        contents, stats = asyncio.run(run_pipeline(
+            [chapter['url'] for chapter in chapters],
+            fetch=self._fetch_html,
+            parse=_parse_chapter_html,
+            concurrency=concurrency,
+            workers=workers,
+            delay=self.request_delay,
+            initializer=_init_parse_worker,
+            initargs=(self.base_url, None),
+            on_result=on_result,
+        ))
+        
+        print(f"\n⚡ Pipeline: {stats.fetched} páginas en {stats.wall_s:.1f} s "
+              f"({stats.fetched / stats.wall_s if stats.wall_s else 0:.1f} páginas/s), "
+              f"cola máx. {stats.max_queue}, espera por backpressure {stats.backpressure_s:.1f} s")
+        return contents
+    
+    def _fetch_html(self, url: str) -> Optional[str]:
+        """HTML de una página (None si falla tras los reintentos)"""
+        try:
+            print(f"  📄 Descargando: {url}")
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            return response.text
         except Exception as e:
             print(f"  ❌ Error en capítulo: {e}")
             return None
     
+    def _parse_cached(self, url: str) -> Optional[str]:
+        """Un capítulo desde la caché (sesión offline): None si no está o falla"""
+        try:
+            response = self.session.get(url, timeout=30)
+            if response.status_code != 200:
+                return None
+            return self.parse_chapter(response.text)
+        except Exception as e:
+            print(f"  ❌ Error en capítulo {url}: {e}")
+            return None
+    
     def _extract_chapter_content(self, soup: BeautifulSoup) -> Optional[str]:
         """Extrae el contenido del capítulo"""
         selectors = [
@@ -489,8 +570,13 @@ class NovelasLigeraScraper:
         
         return content.strip()
     
-    def download_image(self, image_url: str, output_dir: str) -> Optional[str]:
-        """Descarga la imagen de portada"""
+    def download_image(self, image_url: str, output_dir: str, novel_slug: str) -> Optional[str]:
+        """
+        Descarga la imagen de portada en output_dir/<slug>_cover.<ext>
+        
+        Un nombre por novela: el scheduler descarga varias a la vez en la
+        misma carpeta y con un 'cover.jpg' común se pisarían la portada.
+        """
         if not image_url:
             return None
         
@@ -499,12 +585,11 @@ class NovelasLigeraScraper:
             response = self.session.get(image_url, timeout=30)
             response.raise_for_status()
             
-            ext = os.path.splitext(image_url)[1] or '.jpg'
-            filename = f"cover{ext}"
+            ext = os.path.splitext(urlparse(image_url).path)[1] or '.jpg'  # Sin ?query
+            filename = f"{novel_slug}_cover{ext}"
             filepath = os.path.join(output_dir, filename)
             
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            write_atomic(Path(filepath), response.content)
             
             print(f"✅ Portada guardada: {filepath}")
             return filepath
@@ -518,9 +603,43 @@ class NovelasLigeraScraper:
         novel_slug: str, 
         start_chapter: int = 1, 
         end_chapter: Optional[int] = None,
-        output_dir: str = "output"
+        output_dir: str = "output",
+        reparse: bool = False,
+        workers: Optional[int] = None,
+        concurrency: int = 1,
+        output_format: str = "json",
+        compression: Optional[str] = None
     ) -> Dict:
-        """Scrape completo de la novela"""
+        """
+        Scrape completo de la novela.
+        
+        El JSON se escribe en streaming (novel_io.py): cada capítulo va a
+        disco al terminar. output_format: "json" o "ndjson" (un capítulo
+        por línea); compression: None, "gzip" o "zstd". Devuelve los
+        metadatos + chapters_saved y output_path (no los capítulos).
+        
+        Con reparse=True no se usa la red: el JSON se reconstruye desde la
+        caché HTTP (cache_dir), parseando los capítulos en `workers`
+        procesos (default: uno por CPU). Sirve para aplicar mejoras de
+        _extract_chapter_content o de los filtros de spam sin re-descargar.
+        
+        Con concurrency > 1 los capítulos se descargan de `concurrency` en
+        `concurrency` mientras otros procesos parsean los ya descargados.
+        """
+        
+        if reparse and not self.session.adapter.offline:  # pyright: ignore[reportAttributeAccessIssue]
+            cache = getattr(self.session, 'cache', None)
+            if cache is None:
+                raise ValueError("reparse necesita la caché HTTP (cache_dir)")
+            
+            online_session = self.session
+            self.session = ScraperSession(cache_dir=str(cache.directory), offline=True)
+            try:
+                return self.scrape_novel(novel_slug, start_chapter, end_chapter, output_dir,
+                                         reparse=True, workers=workers,
+                                         output_format=output_format, compression=compression)
+            finally:
+                self.session = online_session
         
         Path(output_dir).mkdir(exist_ok=True)
         
@@ -544,18 +663,32 @@ class NovelasLigeraScraper:
             if start_chapter <= ch['number'] <= end_chapter
         ]
         
-        print(f"📥 Descargando capítulos {start_chapter} al {end_chapter} ({len(filtered_chapters)} capítulos)")
+        image_path = None
+        if novel_info['image_url']:
+            image_path = self.download_image(novel_info['image_url'], output_dir, novel_slug)
         
-        chapters_data = []
+        output_data = {
+            "name": novel_info['name'],
+            "author": novel_info['author'],
+            "description": novel_info['description'],
+            "rating": novel_info['rating'],
+            "status": novel_info['status'],
+            "source_url": novel_info['source_url'],
+            "image_path": image_path,
+            "alternative_names": novel_info['alternative_names'],
+            "genres": novel_info['genres']
+        }
+        
+        # Cada capítulo se escribe al terminar: la memoria no crece con la novela
+        json_path = output_path(output_dir, novel_slug, output_format, compression)
         skipped_chapters = []
         
-        for i, chapter_info in enumerate(filtered_chapters, 1):
+        def announce(i: int, chapter_info: Dict) -> None:
             print(f"\n[{i}/{len(filtered_chapters)}] Capítulo {chapter_info['number']}: {chapter_info['title']}")
-            
-            content = self.scrape_chapter(chapter_info['url'])
-            
+        
+        def save(chapter_info: Dict, content: Optional[str]) -> None:
             if content and len(content) > 500:
-                chapters_data.append({
+                writer.add_chapter({
                     "title": chapter_info['title'],
                     "content": content,
                     "order_number": chapter_info['number'],
@@ -565,41 +698,73 @@ class NovelasLigeraScraper:
             else:
                 skipped_chapters.append(chapter_info['number'])
                 print(f"  ⚠️  Capítulo muy corto o sin contenido, OMITIDO")
-            
-            time.sleep(1)
         
-        image_path = None
-        if novel_info['image_url']:
-            image_path = self.download_image(novel_info['image_url'], output_dir)
+        def save_in_order(index: int, content: Optional[str]) -> None:
+            announce(index + 1, filtered_chapters[index])
+            save(filtered_chapters[index], content)
         
-        output_data = {
-            "name": novel_info['name'],
-            "author": novel_info['author'],
-            "description": novel_info['description'],
-            "rating": novel_info['rating'],
-            "status": novel_info['status'],
-            "source_url": novel_info['source_url'],
-            "image_path": image_path,
-            "alternative_names": novel_info['alternative_names'],
-            "genres": novel_info['genres'],
-            "chapters": chapters_data
-        }
-        
-        json_path = os.path.join(output_dir, f"{novel_slug}.json")
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        with NovelWriter(json_path) as writer:
+            writer.write_header(output_data)
+            
+            if reparse:
+                print(f"🔁 Reparseando capítulos {start_chapter} al {end_chapter} desde la caché ({len(filtered_chapters)} capítulos)")
+                for index, content in enumerate(self._reparse_chapters(filtered_chapters, workers)):
+                    save_in_order(index, content)
+            
+            elif concurrency > 1 and len(filtered_chapters) > 1:
+                print(f"📥 Descargando capítulos {start_chapter} al {end_chapter} ({len(filtered_chapters)} capítulos, "
+                      f"{concurrency} a la vez)")
+                self._pipeline_chapters(filtered_chapters, concurrency, workers, on_result=save_in_order)
+            
+            else:
+                print(f"📥 Descargando capítulos {start_chapter} al {end_chapter} ({len(filtered_chapters)} capítulos)")
+                for i, chapter_info in enumerate(filtered_chapters, 1):
+                    announce(i, chapter_info)
+                    save(chapter_info, self.scrape_chapter(chapter_info['url']))
+                    
+                    if self.request_delay:
+                        time.sleep(self.request_delay)
         
         print(f"\n{'='*60}")
         print(f"✅ COMPLETADO")
         print(f"📁 JSON guardado: {json_path}")
-        print(f"📊 Capítulos exitosos: {len(chapters_data)}/{len(filtered_chapters)}")
+        print(f"📊 Capítulos exitosos: {writer.chapters}/{len(filtered_chapters)}")
         if skipped_chapters:
             print(f"⚠️  Capítulos omitidos: {', '.join(map(str, skipped_chapters))}")
         if image_path:
             print(f"🖼️  Portada guardada")
+        cache_stats = getattr(self.session, 'cache_stats', None)
+        if cache_stats and cache_stats['revalidated']:
+            print(f"♻️  Páginas sin cambios (304, desde caché): {cache_stats['revalidated']}")
         print(f"{'='*60}\n")
         
-        return output_data
+        # Sin los capítulos (ya están en disco): cuántos y dónde
+        return {**output_data, "chapters_saved": writer.chapters, "output_path": json_path}
+
+
+# ═══════════════════════════════════════════════════════════════
+# PARSEO EN OTROS PROCESOS (reparse y pipeline)
+# ═══════════════════════════════════════════════════════════════
+
+_parse_worker: Optional[NovelasLigeraScraper] = None
+
+
+def _init_parse_worker(base_url: str, cache_dir: Optional[str]) -> None:
+    """Un scraper offline por proceso, creado una sola vez (sin red: solo parsea)"""
+    global _parse_worker
+    _parse_worker = NovelasLigeraScraper(base_url=base_url, request_delay=0, cache_dir=cache_dir, offline=True)
+
+
+def _parse_cached_chapter(url: str) -> Optional[str]:
+    return _parse_worker._parse_cached(url)  # pyright: ignore[reportOptionalMemberAccess]
+
+
+def _parse_chapter_html(html: str) -> Optional[str]:
+    try:
+        return _parse_worker.parse_chapter(html)  # pyright: ignore[reportOptionalMemberAccess]
+    except Exception as e:
+        print(f"  ❌ Error parseando capítulo: {e}")
+        return None
 
 
 def main():
@@ -617,6 +782,18 @@ Ejemplos de uso:
 
   # Especificar directorio de salida
   python scraper.py el-villano-que-quiere-vivir --output ./novelas/
+
+  # 4 descargas a la vez (mín. 0.25 s entre peticiones), parseo en todos los núcleos
+  python scraper.py el-villano-que-quiere-vivir --concurrency 4 --delay 0.25
+
+  # Un capítulo por línea, comprimido (se puede leer aunque la descarga se corte)
+  python scraper.py el-villano-que-quiere-vivir --format ndjson --compress gzip
+
+  # Reconstruir el JSON desde la caché (sin descargar), p.ej. tras cambiar los filtros
+  python scraper.py el-villano-que-quiere-vivir --reparse
+
+  # Contra el sitio local de pruebas (tools/fixture_site.py)
+  python scraper.py el-villano-que-quiere-vivir --base-url http://127.0.0.1:8090 --delay 0
         """
     )
     
@@ -645,20 +822,88 @@ Ejemplos de uso:
         help='Directorio de salida (default: ./output/)'
     )
     
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        default='json',
+        help='json (el de siempre) o ndjson (un capítulo por línea) (default: json)'
+    )
+    
+    parser.add_argument(
+        '--compress',
+        choices=list(COMPRESSIONS),
+        default=None,
+        help='Comprimir la salida: gzip (.gz) o zstd (.zst, requiere zstandard)'
+    )
+    
+    parser.add_argument(
+        '--base-url',
+        default='https://novelasligera.com',
+        help='Sitio a descargar (default: https://novelasligera.com)'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        default='.http_cache',
+        help='Caché HTTP en disco: las re-ejecuciones solo descargan lo que cambió (default: ./.http_cache/)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Descargar todo sin usar la caché HTTP'
+    )
+    
+    parser.add_argument(
+        '--reparse',
+        action='store_true',
+        help='Reconstruir el JSON solo desde la caché HTTP, sin red (tras mejorar el parseo o los filtros)'
+    )
+    
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Capítulos descargándose a la vez; con más de 1, el parseo va en paralelo en otros procesos (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Procesos de parseo con --reparse o --concurrency (default: uno por CPU)'
+    )
+    
+    parser.add_argument(
+        '--delay',
+        type=float,
+        default=1.0,
+        help='Segundos de pausa entre capítulos (default: 1)'
+    )
+    
     args = parser.parse_args()
     
-    scraper = NovelasLigeraScraper()
+    scraper = NovelasLigeraScraper(
+        base_url=args.base_url,
+        request_delay=args.delay,
+        cache_dir=None if args.no_cache else args.cache_dir
+    )
     
     try:
         result = scraper.scrape_novel(
             novel_slug=args.novel_slug,
             start_chapter=args.start,
             end_chapter=args.end,
-            output_dir=args.output
+            output_dir=args.output,
+            reparse=args.reparse,
+            workers=args.workers,
+            concurrency=args.concurrency,
+            output_format=args.format,
+            compression=args.compress
         )
         
         print("\n🎉 Listo para enviar a tu API!")
-        print(f"📤 Usa el archivo: {args.output}/{args.novel_slug}.json")
+        print(f"📤 Usa el archivo: {result['output_path']}")
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Scraping cancelado por el usuario")
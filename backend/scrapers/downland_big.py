@@ -2,12 +2,15 @@
 """
 batch_download.py
 Script para descargar múltiples novelas automáticamente
-Usa definitivo.py para el scraping
+Usa definitivo.py para el scraping y scheduler.py para repartir el trabajo:
+varias novelas a la vez, con un límite global de peticiones/s y estado
+en disco para reanudar si se corta
 """
 
-import sys
-import time
-from definitivo import NovelasLigeraScraper
+import argparse
+import os
+from novel_io import COMPRESSIONS, FORMATS
+from scheduler import BatchScheduler, Job, load_jobs
 
 
 # ============================================================
@@ -34,79 +37,98 @@ NOVELAS = [
 ]
 
 OUTPUT_DIR = './mis_novelas'
-PAUSE_BETWEEN_NOVELS = 5  # segundos
+
+PARALLEL_NOVELS = 3      # Novelas descargándose a la vez
+REQUESTS_PER_SECOND = 3  # Límite global (todas las novelas juntas)
+PER_NOVEL = 2            # Capítulos a la vez dentro de cada novela
 
 # ============================================================
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description='Descarga por lotes de NovelasLigera.com',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+
+  # Las novelas de la lista NOVELAS de este archivo
+  python downland_big.py
+
+  # Desde un archivo (JSON como NOVELAS, o "slug inicio fin" por línea)
+  python downland_big.py --jobs novelas.txt --parallel 4 --rate 5
+
+  # Si se corta, relanzar el mismo comando: lo terminado se salta
+        """
+    )
+    parser.add_argument('--jobs', help='Archivo de trabajos (default: lista NOVELAS)')
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f'Directorio de salida (default: {OUTPUT_DIR})')
+    parser.add_argument('--state', default=None,
+                        help='Estado para reanudar (default: <output>/batch_state.json)')
+    parser.add_argument('--parallel', type=int, default=PARALLEL_NOVELS, help='Novelas a la vez')
+    parser.add_argument('--rate', type=float, default=REQUESTS_PER_SECOND,
+                        help='Peticiones por segundo en total (0 = sin límite)')
+    parser.add_argument('--per-novel', type=int, default=PER_NOVEL, help='Capítulos a la vez por novela')
+    parser.add_argument('--base-url', default='https://novelasligera.com')
+    parser.add_argument('--no-cache', action='store_true', help='Sin caché HTTP')
+    parser.add_argument('--format', choices=FORMATS, default='json', help='json o ndjson')
+    parser.add_argument('--compress', choices=list(COMPRESSIONS), default=None, help='gzip o zstd')
+    args = parser.parse_args()
+    
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+    else:
+        jobs = [Job(n['slug'], n.get('start', 1), n.get('end')) for n in NOVELAS]
+    
+    state_path = args.state or os.path.join(args.output, 'batch_state.json')
+    
     print("=" * 60)
     print("📚 Descargador por Lotes - NovelasLigera.com")
     print("=" * 60)
-    print(f"\nTotal de novelas a descargar: {len(NOVELAS)}\n")
-    
-    scraper = NovelasLigeraScraper()
+    print(f"\nTotal de novelas a descargar: {len(jobs)}")
+    print(f"⚙️  {args.parallel} a la vez, {args.per_novel} capítulos a la vez por novela, "
+          f"máx. {args.rate or '∞'} peticiones/s")
+    print(f"💾 Estado: {state_path}\n")
     
-    success = 0
-    failed = 0
-    failed_novels = []
-    
-    for i, novel_config in enumerate(NOVELAS, 1):
-        slug = novel_config['slug']
-        start = novel_config.get('start', 1)
-        end = novel_config.get('end', None)
-        
-        print("\n" + "-" * 60)
-        print(f"📖 [{i}/{len(NOVELAS)}] Descargando: {slug}")
-        if end:
-            print(f"📥 Capítulos: {start} al {end}")
-        else:
-            print(f"📥 Capítulos: desde {start} hasta el final")
-        print("-" * 60)
-        
-        try:
-            result = scraper.scrape_novel(
-                novel_slug=slug,
-                start_chapter=start,
-                end_chapter=end,
-                output_dir=OUTPUT_DIR
-            )
-            
-            print(f"✅ {slug} descargada exitosamente")
-            success += 1
-            
-        except KeyboardInterrupt:
-            print("\n\n⚠️  Descarga cancelada por el usuario")
-            break
-            
-        except Exception as e:
-            print(f"❌ Error descargando {slug}: {e}")
-            failed += 1
-            failed_novels.append(slug)
-        
-        # Pausa entre novelas (excepto en la última)
-        if i < len(NOVELAS):
-            print(f"\n⏳ Esperando {PAUSE_BETWEEN_NOVELS} segundos antes de la siguiente...")
-            time.sleep(PAUSE_BETWEEN_NOVELS)
+    scheduler = BatchScheduler(
+        jobs,
+        output_dir=args.output,
+        state_path=state_path,
+        parallel=args.parallel,
+        rate=args.rate,
+        per_novel=args.per_novel,
+        base_url=args.base_url,
+        cache_dir=None if args.no_cache else '.http_cache',
+        output_format=args.format,
+        compression=args.compress,
+    )
+    summary = scheduler.run()
     
     # Resumen final
     print("\n" + "=" * 60)
     print("📊 RESUMEN FINAL")
     print("=" * 60)
-    print(f"✅ Exitosas: {success}/{len(NOVELAS)}")
-    print(f"❌ Fallidas: {failed}/{len(NOVELAS)}")
+    print(f"✅ Exitosas: {summary['done']}/{len(jobs)}" +
+          (f" (+{summary['skipped']} de antes)" if summary['skipped'] else ""))
+    print(f"❌ Fallidas: {summary['failed']}/{len(jobs)}")
+    print(f"⚡ {summary['chapters']} capítulos en {summary['wall_s']} s → "
+          f"{summary['chapters_per_s']} caps/s ({summary['requests_per_s']} peticiones/s)")
     
+    failed_novels = [job.slug for job in jobs if scheduler.state.status(job) == 'failed']
     if failed_novels:
-        print(f"\n⚠️  Novelas que fallaron:")
+        print(f"\n⚠️  Novelas que fallaron (relanza para reintentarlas; detalle en {scheduler.log_dir}/):")
         for novel in failed_novels:
             print(f"  • {novel}")
     
-    print(f"\n📁 Archivos guardados en: {OUTPUT_DIR}/")
+    if summary['interrupted']:
+        print("\n⏸️  Lote interrumpido: relanza el mismo comando para continuar")
+    
+    print(f"\n📁 Archivos guardados en: {args.output}/")
     print("=" * 60 + "\n")
     
     print("💡 Próximos pasos:")
-    print(f"  1. Verifica los JSON: python verify_json.py {OUTPUT_DIR}/*.json")
-    print(f"  2. Sube a tu API: python send_to_api.py {OUTPUT_DIR}/NOVELA.json --url TU_API")
+    print(f"  1. Verifica los JSON: python verify_json.py {args.output}/*.json")
+    print(f"  2. Sube a tu API: python send_to_api.py {args.output}/NOVELA.json --url TU_API")
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 """
 enviar-a-la-api.py
 Script para enviar el JSON generado por el scraper a tu API
-Copia las imágenes a static/novels/ y actualiza las rutas
+Copia las imágenes a static/novels/incoming/ y actualiza las rutas
 Endpoint: POST /admin/import-novel
 """
 
@@ -17,6 +17,9 @@ from pathlib import Path
 # Agregar el directorio raíz al path para imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from api_upload import fetch_chapter_hashes, find_novels, idempotency_key, upload_directory, upload_novel
+from novel_io import novel_slug as slug_from_path, read_metadata
+
 # IMPORTANTE: Importar configuración de tu proyecto
 try:
     from core.config import settings
@@ -26,48 +29,20 @@ except ImportError:
     API_BASE_URL = "http://localhost:8000"
     print("⚠️  No se pudo importar configuración, usando URL por defecto")
 
-# Directorio donde se guardan las imágenes en la API
-STATIC_NOVELS_DIR = Path(__file__).parent.parent / "static" / "novels"
+# Directorio donde la API recoge las imágenes a importar
+# (las convierte a WebP, las guarda por hash y borra la copia)
+STATIC_NOVELS_DIR = Path(__file__).parent.parent / "static" / "novels" / "incoming"
 
 
-def upload_novel_to_api(
-    json_path: str, 
-    api_url: str = None,
-    api_key: str = None
-):
+def stage_cover(json_path: Path, image_path) -> dict:
     """
-    Envía el JSON de la novela a tu API
+    Copia la portada a static/novels/incoming/ para que la API la lea.
     
-    Args:
-        json_path: Ruta al archivo JSON (relativa o absoluta)
-        api_url: URL del endpoint (default: tu servidor local)
-        api_key: API key si requiere autenticación
+    Returns:
+        Cambios a aplicar al JSON al enviarlo (image_path)
     """
+    overrides = {}  # Cambios respecto al archivo (se aplican al enviar)
     
-    print(f"\n{'='*60}")
-    print(f"📤 Enviando novela a API")
-    print(f"{'='*60}\n")
-    
-    # Convertir a Path absoluto
-    json_path = Path(json_path)
-    if not json_path.is_absolute():
-        json_path = Path(__file__).parent / json_path
-    
-    # Verificar que existe
-    if not json_path.exists():
-        print(f"❌ Error: No se encontró el archivo {json_path}")
-        return False
-    
-    # Leer el JSON
-    print(f"📖 Leyendo: {json_path}")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        novel_data = json.load(f)
-    
-    print(f"✓ Novela: {novel_data.get('name', 'Sin nombre')}")
-    print(f"✓ Capítulos: {len(novel_data.get('chapters', []))}")
-    
-    # Procesar ruta de imagen para compatibilidad con la API
-    image_path = novel_data.get('image_path')
     if image_path:
         # Convertir a ruta absoluta si es relativa
         img_path = Path(image_path)
@@ -79,19 +54,19 @@ def upload_novel_to_api(
             # Crear directorio si no existe
             STATIC_NOVELS_DIR.mkdir(parents=True, exist_ok=True)
 
-            # Copiar imagen a static/novels/ para que la API la pueda servir
-            novel_slug = json_path.stem  # nombre del archivo sin extensión
+            # Copiar imagen a static/novels/incoming/ para que la API la pueda leer
+            novel_slug = slug_from_path(json_path.name)  # nombre del archivo sin extensiones
             cover_filename = f"{novel_slug}_cover{img_path.suffix}"
             api_image_path = STATIC_NOVELS_DIR / cover_filename
 
             try:
                 # Copiar la imagen
                 shutil.copy2(img_path, api_image_path)
-                print(f"🖼️  Imagen copiada: {img_path.name} → static/novels/{cover_filename}")
+                print(f"🖼️  Imagen copiada: {img_path.name} → static/novels/incoming/{cover_filename}")
 
                 # Actualizar el JSON con la ruta absoluta que espera la API
                 # La API necesita la ruta absoluta del archivo copiado
-                novel_data['image_path'] = str(api_image_path)
+                overrides['image_path'] = str(api_image_path)
 
             except Exception as e:
                 print(f"⚠️  Error copiando imagen: {e}")
@@ -99,36 +74,96 @@ def upload_novel_to_api(
                 # Mantener la ruta original si no se puede copiar
         else:
             print(f"⚠️  Imagen no encontrada: {img_path}")
-            novel_data['image_path'] = None
+            overrides['image_path'] = None
+    
+    return overrides
+
+
+def upload_novel_to_api(
+    json_path: str, 
+    api_url: str = None,
+    api_key: str = None,
+    novel_id: int = None
+):
+    """
+    Envía el JSON de la novela a tu API
+    
+    Args:
+        json_path: Ruta al archivo JSON (relativa o absoluta)
+        api_url: URL del endpoint (default: tu servidor local)
+        api_key: API key si requiere autenticación
+        novel_id: ID de la novela en la API: solo se envían los capítulos
+            cuyo texto cambió (GET /novels/{id}/chapters/hashes)
+    """
+    
+    print(f"\n{'='*60}")
+    print(f"📤 Enviando novela a API")
+    print(f"{'='*60}\n")
+    
+    # Convertir a Path absoluto
+    json_path = Path(json_path)
+    if not json_path.is_absolute():
+        json_path = Path(__file__).parent / json_path
+    
+    # Verificar que existe
+    if not json_path.exists():
+        print(f"❌ Error: No se encontró el archivo {json_path}")
+        return False
+    
+    # Leer solo los metadatos: los capítulos se leen del disco al enviar
+    print(f"📖 Leyendo: {json_path}")
+    novel_data = read_metadata(str(json_path))  # .json, .ndjson, .gz, .zst
+    
+    print(f"✓ Novela: {novel_data.get('name', 'Sin nombre')}")
+    
+    overrides = stage_cover(json_path, novel_data.get('image_path'))
     
     # URL del endpoint
     if not api_url:
         api_url = f"{API_BASE_URL}/admin/import-novel"
     
-    # Headers
-    headers = {
-        'Content-Type': 'application/json'
-    }
+    # Headers (Content-Type y Content-Encoding los pone api_upload)
+    headers = {}
     
     if api_key:
         headers['Authorization'] = f'Bearer {api_key}'
     
-    # Enviar
-    print(f"\n📡 Enviando a: {api_url}")
-    print(f"📦 Tamaño del JSON: {len(json.dumps(novel_data)) / 1024:.1f} KB")
-    
     try:
-        response = requests.post(
+        # Hashes de lo que ya tiene la API: los capítulos iguales no se envían
+        known_hashes = None
+        if novel_id:
+            known_hashes = fetch_chapter_hashes(api_url, novel_id, headers=headers)
+            if known_hashes is None:
+                print(f"⚠️  La novela {novel_id} no existe en la API: se envía entera")
+            else:
+                print(f"🔎 La API tiene {len(known_hashes)} capítulos de la novela {novel_id}")
+        
+        # Clave de esta subida: si la API ya la importó y se perdió la
+        # respuesta, repetir la petición devuelve la guardada
+        headers['Idempotency-Key'] = idempotency_key()
+        
+        # Enviar: gzip + chunked, capítulo a capítulo desde el disco
+        print(f"\n📡 Enviando a: {api_url}")
+        
+        response, upload = upload_novel(
+            str(json_path),
             api_url,
-            json=novel_data,
             headers=headers,
-            timeout=300  # 5 minutos
+            overrides=overrides,
+            known_hashes=known_hashes,
         )
         
+        print(f"📦 Enviado: {upload.chapters} capítulos, "
+              f"{upload.json_bytes / 1024:.1f} KB de JSON → {upload.sent_bytes / 1024:.1f} KB con gzip")
+        if upload.skipped:
+            print(f"⏭️  {upload.skipped} capítulos sin cambios no se enviaron")
+        
         response.raise_for_status()
         
         print(f"\n✅ ¡Éxito!")
         print(f"Status: {response.status_code}")
+        if response.headers.get('Idempotent-Replayed'):
+            print(f"♻️  Ya se había importado: respuesta guardada de la primera vez")
         
         # Mostrar respuesta
         try:
@@ -144,6 +179,8 @@ def upload_novel_to_api(
                 print(f"   Géneros creados: {stats.get('genres_created', 0)}")
                 print(f"   Géneros asociados: {stats.get('genres_associated', 0)}")
                 print(f"   Capítulos creados: {stats.get('chapters_created', 0)}")
+                print(f"   Capítulos actualizados: {stats.get('chapters_updated', 0)}")
+                print(f"   Capítulos sin cambios: {stats.get('chapters_unchanged', 0)}")
                 print(f"   Portada subida: {'✅' if stats.get('cover_uploaded') else '❌'}")
         except:
             print(f"\nRespuesta: {response.text}")
@@ -181,6 +218,63 @@ def upload_novel_to_api(
         return False
 
 
+def upload_directory_to_api(
+    directory: str,
+    api_url: str = None,
+    api_key: str = None,
+    parallel: int = 4,
+    report_path: str = None,
+    only_changed: bool = False,
+):
+    """
+    Envía todas las novelas de una carpeta, `parallel` a la vez
+    
+    Reintenta los fallos transitorios con Idempotency-Key (un reintento
+    nunca importa dos veces) y escribe un informe JSON al terminar.
+    Con only_changed, las novelas del informe anterior solo envían los
+    capítulos cuyo texto cambió.
+    
+    Returns:
+        True si no falló ninguna
+    """
+    directory = Path(directory)
+    if not directory.is_absolute():
+        directory = Path(__file__).parent / directory
+    
+    api_url = api_url or f"{API_BASE_URL}/admin/import-novel"
+    headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
+    report_path = report_path or str(directory / "upload_report.json")
+    paths = find_novels(str(directory))
+    
+    print(f"\n{'='*60}")
+    print(f"📤 Enviando {len(paths)} novela(s) de {directory}")
+    print(f"📡 {api_url} — {parallel} a la vez")
+    print(f"{'='*60}\n")
+    
+    summary = upload_directory(
+        paths,
+        api_url,
+        parallel=parallel,
+        headers=headers,
+        prepare=lambda path, metadata: stage_cover(Path(path), metadata.get('image_path')),
+        report_path=report_path,
+        only_changed=only_changed,
+    )
+    
+    print(f"\n{'='*60}")
+    print(f"📊 {summary['ok']} importadas, {summary['replayed']} ya importadas antes, "
+          f"{summary['failed']} fallidas, {summary['skipped']} omitidas")
+    print(f"📈 {summary['chapters']} capítulos en {summary['wall_s']:.1f} s — "
+          f"{summary['novels_per_s']} novelas/s, {summary['chapters_per_s']} caps/s, "
+          f"{summary['sent_mb']} MB enviados ({summary['json_mb']} MB de JSON)")
+    if summary['chapters_skipped']:
+        print(f"⏭️  {summary['chapters_skipped']} capítulos sin cambios no se enviaron")
+    print(f"📝 Informe: {report_path}")
+    print(f"{'='*60}")
+    
+    return summary['failed'] == 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Envía novelas a tu API FastAPI',
@@ -198,19 +292,23 @@ Ejemplos de uso:
   # Con autenticación
   python enviar-a-la-api.py mis_novelas/mi-novela.json --key TOKEN
 
-  # Enviar todas las novelas de la carpeta
-  for file in mis_novelas/*.json; do
-    python enviar-a-la-api.py "$file"
-    sleep 2
-  done
+  # Enviar todas las novelas de la carpeta (4 a la vez, con reintentos)
+  python enviar-a-la-api.py mis_novelas/ --parallel 4
+  # → resumen y fallos en mis_novelas/upload_report.json
 
-NOTA: Las imágenes se copian automáticamente a static/novels/
+  # Volver a subir solo los capítulos que cambiaron
+  python enviar-a-la-api.py mis_novelas/mi-novela.json --novel-id 5
+  python enviar-a-la-api.py mis_novelas/ --only-changed
+  # (con una carpeta, los IDs salen del upload_report.json anterior)
+
+NOTA: Las imágenes se copian automáticamente a static/novels/incoming/
+      (la API las guarda por hash y borra la copia)
         """
     )
     
     parser.add_argument(
         'json_file',
-        help='Ruta al JSON (ej: mis_novelas/novela.json)'
+        help='Ruta al JSON (ej: mis_novelas/novela.json) o a una carpeta de novelas'
     )
     
     parser.add_argument(
@@ -225,12 +323,55 @@ NOTA: Las imágenes se copian automáticamente a static/novels/
         help='API key para autenticación'
     )
     
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=4,
+        help='Con una carpeta: novelas enviándose a la vez (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--report',
+        default=None,
+        help='Con una carpeta: ruta del informe JSON (default: <carpeta>/upload_report.json)'
+    )
+    
+    parser.add_argument(
+        '--novel-id',
+        type=int,
+        default=None,
+        help='Con un archivo: ID de la novela en la API; solo se envían los capítulos que cambiaron'
+    )
+    
+    parser.add_argument(
+        '--only-changed',
+        action='store_true',
+        help='Con una carpeta: solo enviar los capítulos que cambiaron (IDs del informe anterior)'
+    )
+    
     args = parser.parse_args()
     
+    target = Path(args.json_file)
+    if not target.is_absolute():
+        target = Path(__file__).parent / target
+    
+    if target.is_dir():
+        success = upload_directory_to_api(
+            directory=str(target),
+            api_url=args.url,
+            api_key=args.key,
+            parallel=args.parallel,
+            report_path=args.report,
+            only_changed=args.only_changed,
+        )
+        print(f"\n{'🎉 Todas las novelas importadas' if success else '⚠️  Hubo fallos (ver el informe)'}\n")
+        sys.exit(0 if success else 1)
+    
     success = upload_novel_to_api(
         json_path=args.json_file,
         api_url=args.url,
-        api_key=args.key
+        api_key=args.key,
+        novel_id=args.novel_id
     )
     
     if success:
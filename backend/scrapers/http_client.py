@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+http_client.py
+Cliente HTTP compartido por los scrapers (definitivo.py, buscarslug.py...)
+
+    ScraperSession ──▶ CachingAdapter ──▶ urllib3 (pool + reintentos)
+                            │
+                            └── HTTPCache (disco): HTML crudo + cabeceras
+
+- Pool de conexiones keep-alive: una conexión TCP/TLS por hilo y host,
+  reutilizada entre páginas
+- Reintentos con backoff exponencial (0.5 s, 1 s, 2 s, 4 s...) ante
+  errores de conexión, 429 y 5xx; respeta Retry-After
+- Caché en disco: cada página descargada (200) se guarda comprimida con
+  sus cabeceras y la hora de descarga. Si traía ETag o Last-Modified, la
+  siguiente vez se pide con If-None-Match / If-Modified-Since y un 304
+  se responde desde el disco (sin descargar el cuerpo)
+- Modo offline: todo sale de la caché y lo que no está responde 504,
+  sin tocar la red (definitivo.py --reparse)
+- RateLimiter: límite de peticiones/s compartido entre sesiones e hilos
+  (descargas por lotes, scheduler.py). Cuenta cada intento, también los
+  reintentos de urllib3
+
+Uso:
+    from http_client import ScraperSession
+
+    session = ScraperSession(cache_dir=".http_cache")
+    response = session.get(url, timeout=30)
+    response.headers.get("X-Cache")   # "revalidated" si vino de la caché
+    session.cache_stats               # {"revalidated": 12, "stored": 3, "hits": 0}
+
+    offline = ScraperSession(cache_dir=".http_cache", offline=True)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+POOL_SIZE = 10
+# Conexiones por host (más que hilos concurrentes no aporta nada)
+
+RETRIES = 4
+BACKOFF = 0.5
+# Espera antes del reintento n: BACKOFF * 2^(n-1) → 0.5, 1, 2, 4 s
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+SKIPPED_HEADERS = ('set-cookie',)
+# Cabeceras que no se guardan (el resto sí, tal cual llegaron)
+
+STALE_HEADERS = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding')
+# Describen el cuerpo en la red, no el guardado (ya descomprimido)
+
+
+# ═══════════════════════════════════════════════════════════════
+# CACHÉ EN DISCO
+# ═══════════════════════════════════════════════════════════════
+
+class HTTPCache:
+    """
+    Respuestas guardadas por URL:
+
+        .http_cache/
+        └── 3f/
+            ├── 3fa2...e1.json      metadatos (url, fetched_at, cabeceras)
+            └── 3fa2...e1.body.gz   cuerpo tal cual llegó, comprimido
+
+    Escrituras atómicas (archivo temporal + rename): un proceso
+    interrumpido no deja entradas a medias.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        folder = self.directory / key[:2]
+        return folder / f"{key}.json", folder / f"{key}.body.gz"
+
+    def load(self, url: str) -> Optional[Dict]:
+        """Metadatos de la URL, o None si no está (o la entrada está rota)."""
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('url') == url and body_path.exists() else None
+
+    def body(self, url: str) -> bytes:
+        _, body_path = self._paths(url)
+        return gzip.decompress(body_path.read_bytes())
+
+    def response(self, entry: Dict) -> requests.Response:
+        """La respuesta guardada (entrada de load()) como requests.Response."""
+        url = entry['url']
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        for name in STALE_HEADERS:
+            response.headers.pop(name, None)
+        response._content = self.body(url)
+        response.encoding = entry['encoding']
+        response.url = url
+        return response
+
+    def store(self, url: str, response: requests.Response) -> None:
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+
+        meta = {
+            'url': url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': {name: value for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS},
+            'fetched_at': time.time(),
+        }
+
+        # Primero el cuerpo: sin .json la entrada no existe para load()
+        write_atomic(body_path, gzip.compress(response.content, compresslevel=6))
+        write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# ═══════════════════════════════════════════════════════════════
+# LÍMITE DE PETICIONES
+# ═══════════════════════════════════════════════════════════════
+
+class RateLimiter:
+    """
+    Como mucho `rate` peticiones por segundo entre todos los hilos y
+    sesiones que lo compartan (separación fija, sin ráfagas).
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self.requests = 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            self.requests += 1
+            if not self.interval:
+                return
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class LimitedRetry(Retry):
+    """
+    Retry de urllib3 cuyos reintentos también pasan por el RateLimiter.
+
+    urllib3 reintenta dentro de HTTPAdapter.send(), después del wait() de
+    CachingAdapter: sin esto los reintentos de 429/5xx saldrían sin
+    límite justo cuando el sitio pide bajar el ritmo.
+    """
+
+    def __init__(self, *args, rate_limiter: Optional[RateLimiter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+
+    def new(self, **kwargs) -> 'LimitedRetry':
+        # urllib3 crea una instancia nueva por intento con los parámetros
+        # conocidos: hay que pasarle el limitador a mano
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)  # Backoff / Retry-After
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+
+
+# ═══════════════════════════════════════════════════════════════
+# ADAPTADOR (pool + reintentos + peticiones condicionales)
+# ═══════════════════════════════════════════════════════════════
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter que guarda los GET y los convierte en condicionales si hay caché."""
+
+    def __init__(self, cache: Optional[HTTPCache] = None, offline: bool = False,
+                 rate_limiter: Optional[RateLimiter] = None, **kwargs):
+        self.cache = cache
+        self.offline = offline
+        self.rate_limiter = rate_limiter
+        self.stats = {'revalidated': 0, 'stored': 0, 'hits': 0}
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, **kwargs):
+        if self.offline:
+            return self._offline(request)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()  # También las condicionales: llegan al servidor
+
+        if self.cache is None or request.method != 'GET' or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        url = request.url
+        entry = self.cache.load(url)
+        if entry is not None:
+            validators = CaseInsensitiveDict(entry['headers'])
+            if 'ETag' in validators:
+                request.headers.setdefault('If-None-Match', validators['ETag'])
+            if 'Last-Modified' in validators:
+                request.headers.setdefault('If-Modified-Since', validators['Last-Modified'])
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.stats['revalidated'] += 1
+            return self._from_cache(request, entry, 'revalidated')
+
+        if response.status_code == 200:
+            self.cache.store(url, response)
+            self.stats['stored'] += 1
+
+        return response
+
+    def _offline(self, request) -> requests.Response:
+        """Sin red: la copia guardada, o 504 si no hay (como Cache-Control: only-if-cached)."""
+        entry = self.cache.load(request.url) if self.cache is not None and request.method == 'GET' else None
+        if entry is not None:
+            self.stats['hits'] += 1
+            return self._from_cache(request, entry, 'hit')
+
+        response = requests.Response()
+        response.status_code = 504
+        response.reason = 'Not in cache (offline)'
+        response._content = b''
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def _from_cache(self, request, entry: Dict, status: str) -> requests.Response:
+        """Respuesta 200 equivalente a la guardada (para el scraper no hay diferencia)."""
+        response = self.cache.response(entry)  # pyright: ignore[reportOptionalMemberAccess]
+        response.headers['X-Cache'] = status
+        response.request = request
+        response.connection = self
+        return response
+
+
+# ═══════════════════════════════════════════════════════════════
+# SESIÓN
+# ═══════════════════════════════════════════════════════════════
+
+class ScraperSession(requests.Session):
+    """
+    requests.Session con pool, reintentos y (opcional) caché en disco.
+
+    Args:
+        cache_dir: Carpeta de la caché (None = sin caché)
+        pool_size: Conexiones keep-alive por host
+        retries: Reintentos por petición (0 = ninguno)
+        backoff: Factor del backoff exponencial, en segundos
+        offline: Solo caché, sin red (requiere cache_dir)
+        rate_limiter: Límite de peticiones/s compartido con otras sesiones
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, pool_size: int = POOL_SIZE,
+                 retries: int = RETRIES, backoff: float = BACKOFF, offline: bool = False,
+                 rate_limiter: Optional[RateLimiter] = None):
+        super().__init__()
+        self.headers.update(DEFAULT_HEADERS)
+
+        retry = LimitedRetry(
+            total=retries,
+            backoff_factor=backoff,
+            backoff_max=30,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False,  # Agotados los reintentos: la última respuesta (raise_for_status decide)
+            rate_limiter=rate_limiter,
+        )
+        self.adapter = CachingAdapter(
+            cache=HTTPCache(cache_dir) if cache_dir else None,
+            offline=offline,
+            rate_limiter=rate_limiter,
+            pool_connections=4,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.mount('https://', self.adapter)
+        self.mount('http://', self.adapter)
+
+    @property
+    def cache(self) -> Optional[HTTPCache]:
+        return self.adapter.cache
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        return dict(self.adapter.stats)
+
+
+_shared: Optional[ScraperSession] = None
+
+
+def shared_session() -> ScraperSession:
+    """Sesión única del proceso (sin caché) para búsquedas y consultas sueltas."""
+    global _shared
+    if _shared is None:
+        _shared = ScraperSession()
+    return _shared
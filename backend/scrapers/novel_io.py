@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+novel_io.py
+Lectura y escritura en streaming del JSON de una novela
+
+El scraper escribe cada capítulo en cuanto está listo, sin acumular la
+novela en memoria. Dos formatos:
+
+    json     {"name": ..., "author": ..., "chapters": [{...}, {...}]}
+             (el de siempre; compacto, sin indentar)
+    ndjson   línea 1: metadatos (sin "chapters")
+             línea 2..N: un capítulo por línea
+
+Compresión opcional: .gz (gzip, stdlib) o .zst (zstd, requiere el paquete
+`zstandard`).
+
+- Mientras se escribe, el archivo se llama <nombre>.part y se renombra al
+  terminar: nunca hay un <slug>.json a medias
+- Tras cada capítulo se vacía el buffer (también el del compresor). Si el
+  proceso muere, un .ndjson.part conserva todos los capítulos terminados y
+  read_novel() lo lee
+- La lectura detecta formato y compresión por la extensión y va capítulo
+  a capítulo en los dos formatos (el JSON se decodifica por trozos)
+
+Uso:
+    with NovelWriter("mis_novelas/x.ndjson.gz") as writer:
+        writer.write_header({"name": ..., "author": ...})
+        writer.add_chapter({"title": ..., "content": ...})
+
+    novel = read_novel("mis_novelas/x.ndjson.gz")        # dict completo
+    metadata = read_metadata("mis_novelas/x.ndjson.gz")  # sin los capítulos
+    metadata, chapters = iter_novel("mis_novelas/x.ndjson.gz")  # capítulo a capítulo
+    with closing(chapters):                               # cierra el archivo aunque no se recorra entero
+        ...
+"""
+
+import gzip
+import json
+import os
+from contextlib import closing
+from typing import Dict, Generator, Optional, TextIO, Tuple
+
+try:
+    import zstandard  # Opcional: solo para .zst
+except ImportError:
+    zstandard = None
+
+
+FORMATS = ('json', 'ndjson')
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def _dumps(value) -> str:
+    # Compacto: sin indentación ni espacios (los capítulos son casi todo texto)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def output_path(output_dir: str, slug: str, fmt: str = 'json', compression: Optional[str] = None) -> str:
+    """mis_novelas/<slug>.json, .ndjson, .json.gz, .ndjson.zst..."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt} (usa {', '.join(FORMATS)})")
+    suffix = COMPRESSIONS[compression] if compression else ''
+    return os.path.join(output_dir, f"{slug}.{fmt}{suffix}")
+
+
+def novel_slug(path: str) -> str:
+    """Slug a partir del nombre del archivo ("x.ndjson.gz" → "x")."""
+    name = os.path.basename(path)
+    for suffix in ('.part', *COMPRESSIONS.values()):
+        name = name.removesuffix(suffix)
+    for fmt in FORMATS:
+        name = name.removesuffix(f".{fmt}")
+    return name
+
+
+def _describe(path: str) -> Tuple[str, Optional[str]]:
+    """(formato, compresión) según la extensión."""
+    name = path.removesuffix('.part')
+    compression = next((kind for kind, suffix in COMPRESSIONS.items() if name.endswith(suffix)), None)
+    if compression:
+        name = name.removesuffix(COMPRESSIONS[compression])
+    return ('ndjson' if name.endswith('.ndjson') else 'json'), compression
+
+
+def open_text(path: str, mode: str = 'r'):
+    """Abre en modo texto UTF-8, comprimido o no según la extensión (mode: 'r' o 'w')."""
+    _, compression = _describe(path)
+
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Los archivos .zst necesitan el paquete zstandard (pip install zstandard)")
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+
+    return open(path, mode, encoding='utf-8')
+
+
+# ═══════════════════════════════════════════════════════════════
+# ESCRITURA
+# ═══════════════════════════════════════════════════════════════
+
+class NovelWriter:
+    """
+    Escribe la novela capítulo a capítulo (context manager).
+
+    Si el bloque termina con una excepción el archivo se queda como .part
+    (con lo escrito hasta entonces) y el definitivo no se toca.
+    """
+
+    _file: TextIO
+
+    def __init__(self, path: str):
+        self.path = path
+        self.part_path = path + '.part'
+        self.format, self.compression = _describe(path)
+        self.chapters = 0
+        self._header_written = False
+
+    def __enter__(self) -> "NovelWriter":
+        self._file = open_text(self.part_path, 'w')
+        return self
+
+    def write_header(self, metadata: Dict) -> None:
+        """Metadatos de la novela (todo menos los capítulos), antes del primer capítulo."""
+        metadata = {key: value for key, value in metadata.items() if key != 'chapters'}
+        if self.format == 'json':
+            body = _dumps(metadata)[1:-1]
+            self._file.write('{' + body + (',' if body else '') + '"chapters":[')
+        else:
+            self._file.write(_dumps(metadata) + '\n')
+        self._header_written = True
+
+    def add_chapter(self, chapter: Dict) -> None:
+        if self.format == 'json':
+            self._file.write((',' if self.chapters else '') + _dumps(chapter))
+        else:
+            self._file.write(_dumps(chapter) + '\n')
+        self.chapters += 1
+        self._file.flush()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None and not self._header_written:
+            self.write_header({})
+        if exc_type is None and self.format == 'json':
+            self._file.write(']}')
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.part_path, self.path)
+
+
+# ═══════════════════════════════════════════════════════════════
+# LECTURA
+# ═══════════════════════════════════════════════════════════════
+
+class _JSONStream:
+    """
+    Lector incremental de un JSON con la forma {..., "chapters": [...]}.
+
+    json.load necesita el documento entero; aquí se leen bloques del archivo
+    y se decodifica valor a valor con raw_decode, descartando lo ya leído.
+    En memoria: un bloque más el valor en curso (un capítulo).
+    """
+
+    CHUNK = 64 * 1024
+
+    def __init__(self, f: TextIO):
+        self.f = f
+        self.buffer = ''
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.CHUNK)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Siguiente carácter que no es espacio ('' al final del archivo)."""
+        self.buffer = self.buffer.lstrip()
+        while not self.buffer and self._fill():
+            self.buffer = self.buffer.lstrip()
+        return self.buffer[:1]
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON de novela mal formado: se esperaba {char!r} y hay {found!r}")
+        self.buffer = self.buffer[1:]
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            # Un número al final del bloque puede seguir en el siguiente
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.buffer = self.buffer[end:]
+            return value
+
+
+def _iter_json(f: TextIO, partial: bool) -> Tuple[Dict, Generator[Dict, None, None]]:
+    """Metadatos hasta "chapters" y un iterador que lee el array elemento a elemento."""
+    stream = _JSONStream(f)
+    metadata: Dict = {}
+
+    stream.expect('{')
+    found_chapters = False
+    while stream.peek() not in ('}', ''):
+        key = stream.value()
+        stream.expect(':')
+        if key == 'chapters':
+            found_chapters = True
+            break
+        metadata[key] = stream.value()
+        if stream.peek() == ',':
+            stream.expect(',')
+
+    def chapters() -> Generator[Dict, None, None]:
+        with f:
+            try:
+                if found_chapters:
+                    stream.expect('[')
+                    while stream.peek() != ']':
+                        yield stream.value()
+                        if stream.peek() == ',':
+                            stream.expect(',')
+                    stream.expect(']')
+                    # Claves después de "chapters" (el formato de NovelWriter no las tiene)
+                    while stream.peek() == ',':
+                        stream.expect(',')
+                        key = stream.value()
+                        stream.expect(':')
+                        metadata[key] = stream.value()
+                stream.expect('}')
+            except (ValueError, EOFError):
+                if not partial:
+                    raise
+                # .part: el último capítulo quedó cortado por el fallo, se ignora
+
+    return metadata, chapters()
+
+
+class Chapters:
+    """
+    Iterador de capítulos de iter_novel() con close().
+
+    El generador solo cierra el archivo si se llegó a empezar: close()
+    también lo cierra cuando no se leyó ningún capítulo.
+    """
+
+    def __init__(self, f: TextIO, chapters: Generator[Dict, None, None]):
+        self._f = f
+        self._chapters = chapters
+
+    def __iter__(self) -> 'Chapters':
+        return self
+
+    def __next__(self) -> Dict:
+        return next(self._chapters)
+
+    def close(self) -> None:
+        self._chapters.close()
+        self._f.close()
+
+
+def iter_novel(path: str) -> Tuple[Dict, Chapters]:
+    """
+    (metadatos, iterador de capítulos).
+
+    Solo hay un capítulo en memoria a la vez, en los dos formatos. Con un
+    .part se devuelven los capítulos completos y se ignora el final cortado.
+    El archivo se cierra al terminar de recorrer los capítulos o con
+    chapters.close() (contextlib.closing) si no se recorren enteros.
+    """
+    fmt, _ = _describe(path)
+    partial = path.endswith('.part')
+    f = open_text(path)
+
+    if fmt == 'json':
+        try:
+            metadata, chapters = _iter_json(f, partial)
+        except BaseException:
+            f.close()
+            raise
+        return metadata, Chapters(f, chapters)
+
+    first = f.readline()
+    metadata = json.loads(first) if first.strip() else {}
+
+    def chapters() -> Generator[Dict, None, None]:
+        with f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        if partial:
+                            return  # Última línea cortada por el fallo: se ignora
+                        raise
+            except EOFError:
+                if not partial:  # .gz/.zst de un .part: falta el final del stream
+                    raise
+
+    return metadata, Chapters(f, chapters())
+
+
+def read_novel(path: str) -> Dict:
+    """La novela completa como dict (el mismo que da json.load con el formato clásico)."""
+    metadata, chapters = iter_novel(path)
+    metadata['chapters'] = list(chapters)
+    return metadata
+
+
+def read_metadata(path: str) -> Dict:
+    """Los metadatos sin leer los capítulos; el archivo queda cerrado."""
+    metadata, chapters = iter_novel(path)
+    with closing(chapters):
+        return metadata
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+pipeline.py
+Descarga y parseo de capítulos en dos etapas que trabajan a la vez
+
+    URLs ──▶ fetch (asyncio, N en vuelo) ──▶ cola acotada ──▶ parse (procesos) ──▶ resultados
+                                                 │
+                          llena: los fetchers esperan (backpressure)
+
+- fetch: E/S de red. El event loop mantiene `concurrency` peticiones en
+  vuelo; cada una corre en un hilo con la sesión compartida (pool,
+  reintentos y caché de http_client.py)
+- parse: BeautifulSoup + regex es CPU puro y no suelta el GIL, así que
+  va a un ProcessPoolExecutor (un proceso por núcleo)
+- La cola entre etapas tiene tamaño fijo: si el parseo va más lento que
+  la red, la descarga se frena en vez de acumular HTML en memoria.
+  Como mucho hay concurrency + queue_size + workers páginas a la vez
+- Los resultados salen en el orden de las URLs: en una lista al final o,
+  con on_result, de uno en uno según van estando (para escribirlos sin
+  acumularlos)
+
+Uso:
+    contents, stats = asyncio.run(run_pipeline(urls, fetch, parse, concurrency=4))
+    _, stats = asyncio.run(run_pipeline(urls, fetch, parse, on_result=writer))
+"""
+
+import asyncio
+import contextvars
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class PipelineStats:
+    fetched: int = 0
+    fetch_failed: int = 0
+    parsed: int = 0
+    max_queue: int = 0            # Páginas esperando parseo (pico)
+    backpressure_s: float = 0.0   # Tiempo total de los fetchers esperando sitio en la cola
+    wall_s: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {key: round(value, 3) if isinstance(value, float) else value
+                for key, value in asdict(self).items()}
+
+
+def process_context() -> multiprocessing.context.BaseContext:
+    """
+    Contexto para los pools de parseo: 'forkserver' (o 'spawn' fuera de
+    Linux), como services/image_worker.py. El scheduler crea pools desde
+    varios hilos a la vez; hacer fork de un proceso con hilos puede dejar
+    en el hijo un lock tomado (el de stdout, el del log) y colgarlo.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class _Pacer:
+    """Separación mínima entre el inicio de dos peticiones (cortesía con el sitio)."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+
+async def run_pipeline(
+    urls: Sequence[str],
+    fetch: Callable[[str], Optional[str]],
+    parse: Callable[[str], Optional[str]],
+    concurrency: int = 4,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    delay: float = 0.0,
+    initializer: Optional[Callable] = None,
+    initargs: Tuple = (),
+    on_result: Optional[Callable[[int, Optional[str]], None]] = None,
+) -> Tuple[List[Optional[str]], PipelineStats]:
+    """
+    Descarga y parsea `urls`.
+
+    Args:
+        fetch: URL → HTML (o None si falla). Bloqueante; corre en un hilo
+        parse: HTML → resultado (o None). Corre en otro proceso: debe ser
+               una función de módulo (picklable)
+        concurrency: Peticiones en vuelo
+        workers: Procesos de parseo (default: uno por CPU)
+        queue_size: Páginas descargadas en espera (default: 2 × workers)
+        delay: Segundos mínimos entre el inicio de dos peticiones
+        initializer / initargs: Inicialización de cada proceso de parseo
+        on_result: (índice, resultado) en orden de URL, en cuanto está; si
+                   se indica, la lista devuelta va vacía
+
+    Returns:
+        (resultado por URL en el mismo orden, estadísticas)
+    """
+    workers = workers or os.cpu_count() or 1
+    queue_size = queue_size or 2 * workers
+
+    loop = asyncio.get_running_loop()
+    stats = PipelineStats()
+    results: List[Optional[str]] = [None] * len(urls) if on_result is None else []
+    ready: dict = {}      # Terminados que esperan a uno anterior (solo con on_result)
+    next_index = 0
+
+    def deliver(index: int, result: Optional[str]) -> None:
+        nonlocal next_index
+        if on_result is None:
+            results[index] = result
+            return
+        ready[index] = result
+        while next_index in ready:
+            on_result(next_index, ready.pop(next_index))
+            next_index += 1
+
+    pending: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(urls):
+        pending.put_nowait(item)
+    pages: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    pacer = _Pacer(delay)
+
+    # ─── Etapa 1: red ───
+    async def fetcher(threads: ThreadPoolExecutor) -> None:
+        while True:
+            try:
+                index, url = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            await pacer.wait()
+            # Con el contexto del llamante, como asyncio.to_thread (ContextVars: logs, tiempos...)
+            html = await loop.run_in_executor(threads, contextvars.copy_context().run, fetch, url)
+            if html is None:
+                stats.fetch_failed += 1
+                deliver(index, None)
+                continue
+            stats.fetched += 1
+
+            start = time.perf_counter()
+            await pages.put((index, html))  # Bloquea si la cola está llena
+            stats.backpressure_s += time.perf_counter() - start
+            stats.max_queue = max(stats.max_queue, pages.qsize())
+
+    # ─── Etapa 2: CPU ───
+    async def parser(processes: ProcessPoolExecutor) -> None:
+        while True:
+            item = await pages.get()
+            if item is None:
+                return
+            index, html = item
+            result = await loop.run_in_executor(processes, parse, html)
+            stats.parsed += 1
+            deliver(index, result)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch") as threads, \
+            ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs,
+                                mp_context=process_context()) as processes:
+        # TaskGroup: si una etapa falla (ej: BrokenProcessPool porque murió
+        # un proceso de parseo) se cancela la otra. Si no, los fetchers se
+        # quedarían esperando sitio en una cola que ya nadie vacía
+        try:
+            async with asyncio.TaskGroup() as group:
+                # Un parser por proceso: nunca hay más trabajos enviados que procesos
+                for _ in range(workers):
+                    group.create_task(parser(processes))
+                await asyncio.wait([group.create_task(fetcher(threads)) for _ in range(concurrency)])
+                for _ in range(workers):
+                    await pages.put(None)
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]  # El error original (ej: BrokenProcessPool), no el grupo
+    stats.wall_s = time.perf_counter() - start
+
+    return results, stats
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+scheduler.py
+Descarga de varias novelas a la vez (lo usa downland_big.py)
+
+    jobs.json ──▶ BatchScheduler ──▶ hasta `parallel` novelas a la vez
+                       │                 └── cada una: scrape_novel(concurrency=per_novel)
+                       │
+                       ├── RateLimiter global: `rate` peticiones/s entre TODAS
+                       └── estado en disco (batch_state.json) → reanudar
+
+- Archivo de trabajos: JSON (lista de {"slug", "start", "end"}, igual que
+  NOVELAS en downland_big.py) o texto, una novela por línea:
+      el-villano-que-quiere-vivir 1 100
+      las-heroinas-estan-intentando-matarme      # todos los capítulos
+- El estado se guarda tras cada cambio. Al relanzar, las novelas ya
+  terminadas se saltan; las fallidas o interrumpidas se repiten (con la
+  caché HTTP, lo ya descargado vuelve como 304)
+- La salida de cada novela va a logs/<slug>.log; por pantalla solo el
+  progreso del lote
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from definitivo import NovelasLigeraScraper
+from http_client import RateLimiter, ScraperSession, write_atomic
+
+
+# ═══════════════════════════════════════════════════════════════
+# TRABAJOS
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class Job:
+    slug: str
+    start: int = 1
+    end: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        """Identifica el trabajo en el estado (misma novela con otro rango = otro trabajo)."""
+        return f"{self.slug}:{self.start}-{self.end or ''}"
+
+
+def load_jobs(path: str) -> List[Job]:
+    """Lee el archivo de trabajos (.json o texto)."""
+    text = Path(path).read_text(encoding='utf-8')
+
+    if path.endswith('.json'):
+        return [Job(item['slug'], item.get('start', 1), item.get('end')) for item in json.loads(text)]
+
+    jobs = []
+    for line in text.splitlines():
+        fields = line.split('#', 1)[0].split()
+        if not fields:
+            continue
+        start = int(fields[1]) if len(fields) > 1 else 1
+        end = int(fields[2]) if len(fields) > 2 else None
+        jobs.append(Job(fields[0], start, end))
+    return jobs
+
+
+# ═══════════════════════════════════════════════════════════════
+# ESTADO (reanudar)
+# ═══════════════════════════════════════════════════════════════
+
+class BatchState:
+    """
+    Estado por trabajo en un JSON:
+
+        {"jobs": {"el-villano-que-quiere-vivir:1-100": {"status": "done", "chapters": 100, ...}},
+         "summary": {...}}
+
+    status: pending → running → done | failed
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self.data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault('jobs', {})
+
+    def status(self, job: Job) -> Optional[str]:
+        return self.data['jobs'].get(job.key, {}).get('status')
+
+    def update(self, job: Job, **fields) -> None:
+        with self._lock:
+            entry = self.data['jobs'].setdefault(job.key, {'slug': job.slug, 'attempts': 0})
+            entry.update(fields)
+            self._save()
+
+    def set_summary(self, summary: Dict) -> None:
+        with self._lock:
+            self.data['summary'] = summary
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(self.data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+# ═══════════════════════════════════════════════════════════════
+# SALIDA POR NOVELA
+# ═══════════════════════════════════════════════════════════════
+
+_log_file: ContextVar = ContextVar('novel_log', default=None)
+
+
+class _LogRouter:
+    """
+    sys.stdout que manda lo que escribe cada novela a su log.
+
+    redirect_stdout no sirve: cambia la salida de todo el proceso. El log
+    va en un ContextVar, así que también lo ven los hilos de descarga del
+    pipeline (pipeline.py les pasa el contexto).
+    """
+
+    def __init__(self, console):
+        self.console = console
+
+    def write(self, text: str) -> int:
+        return (_log_file.get() or self.console).write(text)
+
+    def flush(self) -> None:
+        self.console.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.console, name)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SCHEDULER
+# ═══════════════════════════════════════════════════════════════
+
+class BatchScheduler:
+    """
+    Args:
+        jobs: Novelas a descargar
+        output_dir: Carpeta de los JSON
+        state_path: Archivo de estado (para reanudar)
+        parallel: Novelas a la vez
+        rate: Peticiones por segundo en total (todas las novelas juntas)
+        per_novel: Capítulos descargándose a la vez dentro de una novela
+        cache_dir: Caché HTTP (None = sin caché)
+        log_dir: Un log por novela
+        output_format / compression: Formato de salida (ver novel_io.py)
+    """
+
+    def __init__(self, jobs: List[Job], output_dir: str, state_path: str,
+                 parallel: int = 3, rate: float = 3.0, per_novel: int = 2,
+                 base_url: str = "https://novelasligera.com",
+                 cache_dir: Optional[str] = '.http_cache', log_dir: Optional[str] = None,
+                 output_format: str = 'json', compression: Optional[str] = None):
+        self.jobs = jobs
+        self.output_dir = output_dir
+        self.state = BatchState(state_path)
+        self.parallel = parallel
+        self.per_novel = per_novel
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.output_format = output_format
+        self.compression = compression
+        self.log_dir = Path(log_dir or os.path.join(output_dir, 'logs'))
+        self.rate = rate
+        self.limiter = RateLimiter(rate)
+        # Procesos de parseo por novela: entre todas, uno por CPU
+        self.parse_workers = max(1, (os.cpu_count() or 1) // parallel)
+        self._totals = {'done': 0, 'failed': 0, 'chapters': 0}
+        self._totals_lock = threading.Lock()
+
+    def run(self) -> Dict:
+        """Ejecuta los trabajos pendientes y devuelve el resumen (también queda en el estado)."""
+        pending = [job for job in self.jobs if self.state.status(job) != 'done']
+        skipped = len(self.jobs) - len(pending)
+        if skipped:
+            print(f"⏭️  {skipped} novela(s) ya descargadas en una ejecución anterior")
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+
+        router = _LogRouter(sys.stdout)
+        sys.stdout = router
+        start = time.perf_counter()
+        interrupted = False
+
+        pool = ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix='novel')
+        try:
+            futures = {pool.submit(self._run_job, job): job for job in pending}
+            for finished, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                entry = self.state.data['jobs'][job.key]
+                elapsed = time.perf_counter() - start
+                with self._totals_lock:
+                    chapters = self._totals['chapters']
+                icon = '✅' if entry['status'] == 'done' else '❌'
+                detail = f"{entry.get('chapters', 0)} caps en {entry.get('seconds', 0):.0f} s" \
+                    if entry['status'] == 'done' else entry.get('error', '')
+                print(f"{icon} [{finished}/{len(pending)}] {job.slug}: {detail} "
+                      f"— lote: {chapters} caps, {chapters / elapsed:.2f} caps/s, "
+                      f"{self.limiter.requests / elapsed:.2f} peticiones/s")
+        except KeyboardInterrupt:
+            interrupted = True
+            print("\n⚠️  Cancelado: no se empiezan más novelas; esperando a las que están en curso...")
+            pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            pool.shutdown(wait=True)
+            sys.stdout = router.console
+
+        wall = time.perf_counter() - start
+        summary = {
+            'jobs': len(self.jobs),
+            'skipped': skipped,
+            'done': self._totals['done'],
+            'failed': self._totals['failed'],
+            'interrupted': interrupted,
+            'chapters': self._totals['chapters'],
+            'requests': self.limiter.requests,
+            'wall_s': round(wall, 1),
+            'chapters_per_s': round(self._totals['chapters'] / wall, 3) if wall else 0.0,
+            'requests_per_s': round(self.limiter.requests / wall, 3) if wall else 0.0,
+            'config': {'parallel': self.parallel, 'per_novel': self.per_novel,
+                       'rate': self.rate},
+        }
+        self.state.set_summary(summary)
+        return summary
+
+    def _run_job(self, job: Job) -> None:
+        attempts = self.state.data['jobs'].get(job.key, {}).get('attempts', 0) + 1
+        self.state.update(job, status='running', attempts=attempts, started_at=time.time(), error=None)
+
+        session = ScraperSession(cache_dir=self.cache_dir, rate_limiter=self.limiter,
+                                 pool_size=max(self.per_novel, 1))
+        scraper = NovelasLigeraScraper(base_url=self.base_url, request_delay=0, session=session)
+        start = time.perf_counter()
+
+        with open(self.log_dir / f"{job.slug}.log", 'a', encoding='utf-8') as log_file:
+            token = _log_file.set(log_file)
+            try:
+                result = scraper.scrape_novel(
+                    novel_slug=job.slug,
+                    start_chapter=job.start,
+                    end_chapter=job.end,
+                    output_dir=self.output_dir,
+                    workers=self.parse_workers,
+                    concurrency=self.per_novel,
+                    output_format=self.output_format,
+                    compression=self.compression,
+                )
+            except Exception as e:
+                print(f"❌ {e}")
+                self.state.update(job, status='failed', error=str(e)[:300],
+                                  seconds=round(time.perf_counter() - start, 1))
+                with self._totals_lock:
+                    self._totals['failed'] += 1
+                return
+            finally:
+                _log_file.reset(token)
+                session.close()
+
+        chapters = result['chapters_saved']
+        self.state.update(job, status='done', chapters=chapters, finished_at=time.time(),
+                          seconds=round(time.perf_counter() - start, 1),
+                          output=result['output_path'])
+        with self._totals_lock:
+            self._totals['done'] += 1
+            self._totals['chapters'] += chapters
@@ -15,6 +15,9 @@ from pathlib import Path
 # Agregar el directorio raíz al path para imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from api_upload import upload_novel
+from novel_io import read_metadata
+
 # IMPORTANTE: Importar configuración de tu proyecto
 try:
     from core.config import settings
@@ -53,13 +56,12 @@ def upload_novel_to_api(
         print(f"❌ Error: No se encontró el archivo {json_path}")
         return False
     
-    # Leer el JSON
+    # Leer solo los metadatos: los capítulos se leen del disco al enviar
     print(f"📖 Leyendo: {json_path}")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        novel_data = json.load(f)
+    novel_data = read_metadata(str(json_path))  # .json, .ndjson, .gz, .zst
+    overrides = {}  # Cambios respecto al archivo (se aplican al enviar)
     
     print(f"✓ Novela: {novel_data.get('name', 'Sin nombre')}")
-    print(f"✓ Capítulos: {len(novel_data.get('chapters', []))}")
     
     # Procesar ruta de imagen
     image_path = novel_data.get('image_path')
@@ -72,36 +74,36 @@ def upload_novel_to_api(
         
         if img_path.exists():
             # Actualizar con ruta absoluta
-            novel_data['image_path'] = str(img_path.absolute())
+            overrides['image_path'] = str(img_path.absolute())
             print(f"🖼️  Imagen: {img_path.name} ✅")
         else:
             print(f"⚠️  Imagen no encontrada: {img_path}")
-            novel_data['image_path'] = None
+            overrides['image_path'] = None
     
     # URL del endpoint
     if not api_url:
         api_url = f"{API_BASE_URL}/admin/import-novel"
     
-    # Headers
-    headers = {
-        'Content-Type': 'application/json'
-    }
+    # Headers (Content-Type y Content-Encoding los pone api_upload)
+    headers = {}
     
     if api_key:
         headers['Authorization'] = f'Bearer {api_key}'
     
-    # Enviar
+    # Enviar: gzip + chunked, capítulo a capítulo desde el disco
     print(f"\n📡 Enviando a: {api_url}")
-    print(f"📦 Tamaño del JSON: {len(json.dumps(novel_data)) / 1024:.1f} KB")
     
     try:
-        response = requests.post(
+        response, upload = upload_novel(
+            str(json_path),
             api_url,
-            json=novel_data,
             headers=headers,
-            timeout=300  # 5 minutos
+            overrides=overrides,
         )
         
+        print(f"📦 Enviado: {upload.chapters} capítulos, "
+              f"{upload.json_bytes / 1024:.1f} KB de JSON → {upload.sent_bytes / 1024:.1f} KB con gzip")
+        
         response.raise_for_status()
         
         print(f"\n✅ ¡Éxito!")
@@ -121,6 +123,8 @@ def upload_novel_to_api(
                 print(f"   Géneros creados: {stats.get('genres_created', 0)}")
                 print(f"   Géneros asociados: {stats.get('genres_associated', 0)}")
                 print(f"   Capítulos creados: {stats.get('chapters_created', 0)}")
+                print(f"   Capítulos actualizados: {stats.get('chapters_updated', 0)}")
+                print(f"   Capítulos sin cambios: {stats.get('chapters_unchanged', 0)}")
                 print(f"   Portada subida: {'✅' if stats.get('cover_uploaded') else '❌'}")
         except:
             print(f"\nRespuesta: {response.text}")
@@ -175,11 +179,8 @@ Ejemplos de uso:
   # Con autenticación
   python send_to_api.py mis_novelas/mi-novela.json --key TOKEN
 
-  # Enviar todas las novelas de la carpeta
-  for file in mis_novelas/*.json; do
-    python send_to_api.py "$file"
-    sleep 2
-  done
+  # Enviar todas las novelas de la carpeta (en paralelo, con reintentos)
+  python enviar-a-la-api.py mis_novelas/ --parallel 4
         """
     )
     
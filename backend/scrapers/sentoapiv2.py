@@ -11,6 +11,9 @@ import argparse
 import os
 from pathlib import Path
 
+from api_upload import upload_novel
+from novel_io import read_metadata
+
 
 def upload_novel_to_api(json_path: str, api_url: str, api_key: str = None):
     """
@@ -31,13 +34,11 @@ def upload_novel_to_api(json_path: str, api_url: str, api_key: str = None):
         print(f"❌ Error: No se encontró el archivo {json_path}")
         return False
     
-    # Leer el JSON
+    # Leer solo los metadatos: los capítulos se leen del disco al enviar
     print(f"📖 Leyendo: {json_path}")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        novel_data = json.load(f)
+    novel_data = read_metadata(json_path)  # .json, .ndjson, .gz, .zst
     
     print(f"✓ Novela: {novel_data.get('name', 'Sin nombre')}")
-    print(f"✓ Capítulos: {len(novel_data.get('chapters', []))}")
 
     # Mantener la imagen como está - no modificar
     image_path = novel_data.get('image_path')
@@ -48,24 +49,20 @@ def upload_novel_to_api(json_path: str, api_url: str, api_key: str = None):
         else:
             print("  ⚠️  Imagen local no encontrada, enviando ruta")
     
-    # Preparar headers
-    headers = {
-        'Content-Type': 'application/json'
-    }
+    # Preparar headers (Content-Type y Content-Encoding los pone api_upload)
+    headers = {}
     
     if api_key:
         headers['Authorization'] = f'Bearer {api_key}'
     
-    # Enviar a la API
+    # Enviar a la API: gzip + chunked, capítulo a capítulo desde el disco
     print(f"\n📡 Enviando a: {api_url}")
     
     try:
-        response = requests.post(
-            api_url,
-            json=novel_data,
-            headers=headers,
-            timeout=300  # 5 minutos timeout para novelas grandes
-        )
+        response, upload = upload_novel(json_path, api_url, headers=headers)
+        
+        print(f"📦 Enviado: {upload.chapters} capítulos, "
+              f"{upload.json_bytes / 1024:.1f} KB de JSON → {upload.sent_bytes / 1024:.1f} KB con gzip")
         
         response.raise_for_status()
         
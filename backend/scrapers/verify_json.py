@@ -8,12 +8,13 @@ import argparse
 import re
 from typing import Dict, List
 
+from novel_io import read_novel
+
 
 class NovelJSONVerifier:
     def __init__(self, json_path: str):
         self.json_path = json_path
-        with open(json_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        self.data = read_novel(json_path)  # .json, .ndjson, .gz, .zst
         
         self.errors = []
         self.warnings = []
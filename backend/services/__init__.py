@@ -0,0 +1,13 @@
+# services/__init__.py
+
+"""
+Módulo services: Lógica de negocio que no pertenece a un endpoint concreto.
+"""
+
+from .novel_index import novel_index, NovelIndex, NovelIndexSnapshot
+
+__all__ = [
+    "novel_index",
+    "NovelIndex",
+    "NovelIndexSnapshot",
+]
@@ -0,0 +1,254 @@
+# services/blob_store.py
+
+"""
+Almacén de portadas direccionado por contenido.
+
+    static/novels/blobs/36/36289ec092a7890d.webp     ← portada (WebP)
+    static/novels/derived/36289ec092a7890d_160.avif  ← derivados (services/covers.py)
+
+- El nombre del archivo ES el hash de su contenido: la misma imagen se
+  guarda una sola vez aunque la usen varias novelas
+- Novel.cover_path apunta al blob: "/static/novels/blobs/36/36289ec092a7890d.webp"
+- Referencias = novelas cuyo cover_path apunta al blob (la BD es la
+  fuente de verdad, no hay contador aparte que se pueda desincronizar)
+- Como el contenido de una URL nunca cambia, se sirve como immutable
+
+Comandos (desde backend/):
+
+    python -m services.blob_store migrate            # {id}.webp antiguos → blobs
+    python -m services.blob_store gc --dry-run       # qué se borraría
+    python -m services.blob_store gc                 # borrar huérfanos
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+from sqlmodel import Session, func, select
+
+from core.config import settings
+from models.novel import Novel
+
+
+# ═══════════════════════════════════════════════════════════════
+# CONFIGURACIÓN
+# ═══════════════════════════════════════════════════════════════
+
+BLOB_DIR = settings.UPLOAD_DIR / "blobs"
+DERIVED_DIR = settings.UPLOAD_DIR / "derived"
+
+HASH_BYTES = 8
+# blake2b de 64 bits → 16 caracteres hex (sobra para unas miles de portadas)
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{16}$")
+
+GC_GRACE_SECONDS = 3600
+# El GC no toca archivos más nuevos que esto: una portada recién
+# codificada existe en disco un instante antes de que su novela apunte a ella
+
+
+# ═══════════════════════════════════════════════════════════════
+# DIRECCIONES
+# ═══════════════════════════════════════════════════════════════
+
+def hash_file(path: Path) -> str:
+    """Hash del contenido ("36289ec092a7890d")."""
+    digest = hashlib.blake2b(digest_size=HASH_BYTES)
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def digest_from_name(filename: str) -> str | None:
+    """"36289ec092a7890d.webp" → "36289ec092a7890d"; None si no es un blob."""
+    stem = Path(filename).stem
+    return stem if _DIGEST_RE.match(stem) else None
+
+
+def blob_path(digest: str) -> Path:
+    """Ruta en disco (dos niveles para no tener miles de archivos por carpeta)."""
+    return BLOB_DIR / digest[:2] / f"{digest}.webp"
+
+
+def cover_path_for(digest: str) -> str:
+    """Valor de Novel.cover_path para un blob."""
+    return f"/static/novels/blobs/{digest[:2]}/{digest}.webp"
+
+
+# ═══════════════════════════════════════════════════════════════
+# ESCRITURA
+# ═══════════════════════════════════════════════════════════════
+
+def put(temp_path: Path) -> str:
+    """
+    Mueve un WebP ya codificado al almacén.
+
+    Si ya existe un blob con el mismo contenido, se descarta el temporal
+    (deduplicación). El rename es atómico: nunca hay blobs a medias.
+
+    Returns:
+        El hash (para cover_path_for())
+    """
+    digest = hash_file(temp_path)
+    target = blob_path(digest)
+
+    if target.exists():
+        temp_path.unlink(missing_ok=True)
+        os.utime(target)  # Recién "escrito": protegido del GC
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, target)
+
+    return digest
+
+
+# ═══════════════════════════════════════════════════════════════
+# REFERENCIAS Y GC
+# ═══════════════════════════════════════════════════════════════
+
+def references(session: Session) -> dict[str, int]:
+    """
+    Novelas que usan cada portada: {"36289ec092a7890d.webp": 2, "5.webp": 1}
+
+    Las claves son nombres de archivo (blobs y portadas antiguas).
+    """
+    rows = session.exec(
+        select(Novel.cover_path, func.count())
+        .where(Novel.cover_path.is_not(None))  # pyright: ignore[reportOptionalMemberAccess,reportAttributeAccessIssue]
+        .group_by(Novel.cover_path)
+    ).all()
+    return {Path(cover_path).name: count for cover_path, count in rows if cover_path}
+
+
+def _is_old(path: Path, now: float, grace_seconds: int) -> bool:
+    return now - path.stat().st_mtime > grace_seconds
+
+
+def collect_garbage(session: Session, dry_run: bool = False, grace_seconds: int = GC_GRACE_SECONDS) -> dict:
+    """
+    Borra portadas que ninguna novela referencia.
+
+    - Blobs sin referencias
+    - Derivados cuyo original ya no está referenciado
+    - Portadas antiguas en static/novels/ ({id}.webp, {slug}_cover.jpg...)
+    - Subidas abandonadas en incoming/
+
+    Returns:
+        {"blobs": n, "derived": n, "legacy": n, "incoming": n, "bytes_freed": n}
+    """
+    referenced = references(session)
+    referenced_stems = {Path(name).stem for name in referenced}
+    now = time.time()
+
+    stats = {"blobs": 0, "derived": 0, "legacy": 0, "incoming": 0, "bytes_freed": 0}
+
+    def remove(path: Path, kind: str) -> None:
+        stats[kind] += 1
+        stats["bytes_freed"] += path.stat().st_size
+        print(f"{'🔎' if dry_run else '🗑️ '} {kind}: {path}")
+        if not dry_run:
+            path.unlink(missing_ok=True)
+
+    # Blobs
+    for path in BLOB_DIR.glob("*/*.webp") if BLOB_DIR.exists() else []:
+        if path.name not in referenced and _is_old(path, now, grace_seconds):
+            remove(path, "blobs")
+
+    # Derivados: "36289ec092a7890d_160.avif" → original "36289ec092a7890d"
+    for path in DERIVED_DIR.iterdir() if DERIVED_DIR.exists() else []:
+        if path.is_file() and path.stem.rsplit("_", 1)[0] not in referenced_stems:
+            remove(path, "derived")
+
+    # Portadas antiguas (archivos sueltos en static/novels/)
+    for path in settings.UPLOAD_DIR.iterdir():
+        if path.is_file() and path.name not in referenced and _is_old(path, now, grace_seconds):
+            remove(path, "legacy")
+
+    # Subidas que nunca se procesaron
+    for path in settings.INCOMING_DIR.iterdir() if settings.INCOMING_DIR.exists() else []:
+        if path.is_file() and _is_old(path, now, grace_seconds):
+            remove(path, "incoming")
+
+    return stats
+
+
+def migrate_legacy(session: Session, dry_run: bool = False) -> int:
+    """
+    Mueve las portadas antiguas ({id}.webp) al almacén y actualiza cover_path.
+
+    Los archivos antiguos quedan sin referencias: el siguiente GC los borra.
+
+    Returns:
+        Número de novelas actualizadas
+    """
+    novels = session.exec(select(Novel).where(Novel.cover_path.is_not(None))).all()  # pyright: ignore[reportOptionalMemberAccess,reportAttributeAccessIssue]
+    migrated = 0
+
+    for novel in novels:
+        filename = Path(novel.cover_path).name  # pyright: ignore[reportArgumentType]
+        if digest_from_name(filename):
+            continue  # Ya es un blob
+
+        source = settings.UPLOAD_DIR / filename
+        if not source.is_file():
+            print(f"⚠️ Novela {novel.id}: no existe {source}")
+            continue
+
+        digest = hash_file(source)
+        print(f"📦 Novela {novel.id}: {filename} → {cover_path_for(digest)}")
+        if dry_run:
+            migrated += 1
+            continue
+
+        # Copia a un temporal y put(): el original sigue intacto hasta el GC
+        temp_path = source.with_name(f".{source.name}.{os.getpid()}.tmp")
+        shutil.copyfile(source, temp_path)
+        novel.cover_path = cover_path_for(put(temp_path))
+        session.add(novel)
+        migrated += 1
+
+    if not dry_run:
+        session.commit()
+
+    return migrated
+
+
+# ═══════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════
+
+def main() -> None:
+    from core.data_base import engine
+
+    parser = argparse.ArgumentParser(description="Almacén de portadas (blobs por hash)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gc_parser = subparsers.add_parser("gc", help="Borrar portadas sin referencias")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Solo mostrar qué se borraría")
+    gc_parser.add_argument("--grace", type=int, default=GC_GRACE_SECONDS,
+                           help=f"No borrar archivos más nuevos que N segundos (default: {GC_GRACE_SECONDS})")
+
+    migrate_parser = subparsers.add_parser("migrate", help="Mover portadas {id}.webp al almacén")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="Solo mostrar qué se movería")
+
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        if args.command == "gc":
+            stats = collect_garbage(session, dry_run=args.dry_run, grace_seconds=args.grace)
+            print(f"\n{'🔎 Se borrarían' if args.dry_run else '✅ Borrados'}: "
+                  f"{stats['blobs']} blobs, {stats['derived']} derivados, "
+                  f"{stats['legacy']} antiguos, {stats['incoming']} subidas "
+                  f"({stats['bytes_freed'] / 1024:.1f} KB)")
+        else:
+            migrated = migrate_legacy(session, dry_run=args.dry_run)
+            print(f"\n✅ {migrated} portadas {'por migrar' if args.dry_run else 'migradas'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# services/cache_bus.py
+
+"""
+Bus de invalidación entre workers (modo multi-worker, ver gunicorn.conf.py).
+
+Cada worker tiene su copia del índice en memoria (services/novel_index.py).
+Cuando uno escribe, los demás tienen que enterarse. Se usa un archivo
+SQLite local como registro de cambios:
+
+    changes
+    ┌─────┬─────────┬──────┐
+    │ seq │ kind    │ key  │
+    ├─────┼─────────┼──────┤
+    │ 41  │ novel   │ 17   │   ← la novela 17 cambió (estado, rating, géneros o borrada)
+    │ 42  │ genre   │ 3    │   ← el género 3 se borró
+    └─────┴─────────┴──────┘
+
+- publish(): el worker que escribe añade una fila
+- has_changes(): un os.stat() del archivo (microsegundos); solo si cambió
+  el mtime se consulta max(seq)
+- changes_after(): filas nuevas para aplicar
+
+Sin CACHE_BUS_PATH (un solo worker) no se crea nada: cero coste.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+MAX_PENDING = 500
+# Más cambios pendientes que esto → reconstruir el índice completo
+
+KEEP_CHANGES = 10_000
+# Filas que se conservan al limpiar el registro
+
+RECHECK_SECONDS = 1.0
+# Aunque el mtime no cambie, consultar max(seq) cada cierto tiempo
+# (sistemas de archivos con mtime de baja resolución)
+
+
+class CacheBus:
+    """Registro de cambios compartido por los workers de un mismo host."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid = 0
+        self._last_mtime = 0
+        self._last_check = 0.0
+        self._latest_seen = 0
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """
+        Ejecuta una sentencia con la conexión de este proceso.
+
+        La conexión no se hereda por fork: cada worker abre la suya.
+        isolation_level=None → cada sentencia es su propia transacción.
+        """
+        with self._lock:
+            if self._connection is None or self._pid != os.getpid():
+                self._connection = sqlite3.connect(
+                    self.path, timeout=5, isolation_level=None, check_same_thread=False
+                )
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS changes ("
+                    " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                    " kind TEXT NOT NULL,"
+                    " key INTEGER NOT NULL)"
+                )
+                self._pid = os.getpid()
+            return self._connection.execute(sql, params)
+
+    def reset(self) -> None:
+        """Borra el registro (lo llama el proceso maestro antes del fork)."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self.path.unlink(missing_ok=True)
+
+    # ───────────────────────────────────────────────────────────
+    # ESCRITURA
+    # ───────────────────────────────────────────────────────────
+
+    def publish(self, kind: str, key: int) -> int:
+        """Anuncia un cambio a los demás workers. Devuelve su número de secuencia."""
+        seq = self._execute("INSERT INTO changes (kind, key) VALUES (?, ?)", (kind, key)).lastrowid or 0
+        if seq % 1000 == 0:
+            self._execute("DELETE FROM changes WHERE seq <= ?", (seq - KEEP_CHANGES,))
+        return seq
+
+    # ───────────────────────────────────────────────────────────
+    # LECTURA
+    # ───────────────────────────────────────────────────────────
+
+    def latest(self) -> int:
+        return self._execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def has_changes(self, after: int) -> bool:
+        """
+        ¿Hay cambios con seq > after?
+
+        Camino rápido: si el archivo no se modificó desde la última
+        consulta, no se abre SQLite.
+        """
+        now = time.monotonic()
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+
+        if mtime == self._last_mtime and now - self._last_check < RECHECK_SECONDS:
+            return self._latest_seen > after
+
+        self._last_mtime = mtime
+        self._last_check = now
+        self._latest_seen = self.latest()
+        return self._latest_seen > after
+
+    def changes_after(self, after: int) -> list[tuple[int, str, int]]:
+        """[(seq, kind, key), ...] en orden. Lista vacía si no hay nada nuevo."""
+        return self._execute(
+            "SELECT seq, kind, key FROM changes WHERE seq > ? ORDER BY seq", (after,)
+        ).fetchall()
+
+    def oldest(self) -> int:
+        """Primer seq que sigue en el registro (los anteriores se limpiaron)."""
+        return self._execute("SELECT COALESCE(MIN(seq), 0) FROM changes").fetchone()[0]
@@ -0,0 +1,207 @@
+# services/covers.py
+
+"""
+Derivados de portadas: varios tamaños y formatos a partir del original.
+
+El importer guarda una sola portada grande (un blob, ver
+services/blob_store.py). Los listados necesitan imágenes mucho más
+pequeñas, así que aquí se generan bajo demanda y se cachean en disco:
+
+    static/novels/blobs/36/36289ec092a7890d.webp       ← original
+    static/novels/derived/36289ec092a7890d_160.avif    ← thumb (AVIF)
+    static/novels/derived/36289ec092a7890d_320.webp    ← card (WebP)
+
+Como el nombre del derivado sale del hash del original, dos novelas con
+la misma portada comparten también los derivados.
+
+Reglas:
+- Los anchos se ajustan a las variantes definidas (VARIANTS), así un
+  ?w= arbitrario no llena el disco de tamaños distintos
+- Un derivado se regenera si el original es más nuevo (portada reemplazada)
+- Se escribe en un archivo temporal y se renombra: nunca se sirve a medias
+"""
+
+import functools
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from services import blob_store
+# Pillow se importa solo al generar un derivado (ver get_derivative):
+# arrancar la API o servir una portada ya cacheada no lo carga
+
+
+# ═══════════════════════════════════════════════════════════════
+# CONFIGURACIÓN
+# ═══════════════════════════════════════════════════════════════
+
+VARIANTS: dict[str, int] = {
+    "thumb": 160,   # NovelListItem (80px de ancho, 2x para pantallas retina)
+    "card": 320,    # NovelCoverCard (grid de la home)
+    "full": 720,    # HeroSection / detalle
+}
+
+FORMATS: dict[str, tuple[str, str]] = {
+    # formato → (nombre en Pillow, media type)
+    "webp": ("WEBP", "image/webp"),
+    "avif": ("AVIF", "image/avif"),
+}
+
+ENCODE_OPTIONS: dict[str, dict] = {
+    # Calidad más baja que el original: son miniaturas
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 55, "speed": 6},
+}
+
+DERIVED_DIR = blob_store.DERIVED_DIR
+
+@functools.cache
+def avif_supported() -> bool:
+    """Pillow >= 11.3 trae AVIF; si falta, todo se sirve como WebP."""
+    from PIL import features
+    return bool(features.check("avif"))
+
+
+# ═══════════════════════════════════════════════════════════════
+# VERSIÓN POR CONTENIDO (URLs cacheables para siempre)
+# ═══════════════════════════════════════════════════════════════
+
+_hashes: dict[Path, tuple[int, int, str]] = {}
+# ruta → (mtime_ns, tamaño, hash): solo se relee si el archivo cambió
+
+
+def content_hash(path: Path) -> str | None:
+    """
+    Hash corto del contenido de una portada ("3f9a1c0b7e2d4a51").
+
+    Va en la URL (?v=...): si la portada cambia, cambia la URL, así que
+    la respuesta se puede cachear como immutable. Los blobs ya se llaman
+    como su hash: no hace falta leerlos.
+
+    Returns:
+        None si el archivo no existe
+    """
+    digest = blob_store.digest_from_name(path.name)
+    if digest and path == blob_store.blob_path(digest):
+        return digest if path.exists() else None
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    cached = _hashes.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = hashlib.blake2b(path.read_bytes(), digest_size=8).hexdigest()
+    _hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+# ═══════════════════════════════════════════════════════════════
+# RESOLUCIÓN DE PARÁMETROS
+# ═══════════════════════════════════════════════════════════════
+
+def resolve_width(width: int | None = None, variant: str | None = None) -> int:
+    """
+    Ancho final del derivado.
+
+    - variant="card" → 320
+    - width=200 → 320 (la variante más pequeña que cubre el ancho pedido)
+    - width=5000 → 720 (nunca más grande que "full")
+    """
+    if variant:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant '{variant}'. Use one of: {', '.join(VARIANTS)}")
+        return VARIANTS[variant]
+
+    sizes = sorted(VARIANTS.values())
+    if width is None:
+        return sizes[-1]
+    return next((size for size in sizes if size >= width), sizes[-1])
+
+
+def pick_format(requested: str | None = None, accept: str | None = None) -> str:
+    """
+    Formato a servir.
+
+    - ?format= explícito (si está soportado)
+    - Si no, AVIF cuando el navegador lo anuncia en Accept
+    - WebP en cualquier otro caso (lo soportan todos los navegadores actuales)
+    """
+    if requested:
+        if requested not in FORMATS:
+            raise ValueError(f"Unknown format '{requested}'. Use one of: {', '.join(FORMATS)}")
+        if requested == "avif" and not avif_supported():
+            return "webp"
+        return requested
+
+    if accept and "image/avif" in accept and avif_supported():
+        return "avif"
+    return "webp"
+
+
+def media_type(fmt: str) -> str:
+    return FORMATS[fmt][1]
+
+
+# ═══════════════════════════════════════════════════════════════
+# GENERACIÓN (lazy + caché en disco)
+# ═══════════════════════════════════════════════════════════════
+
+_locks: dict[Path, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.Lock:
+    """Un lock por derivado: dos peticiones simultáneas no lo codifican dos veces."""
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def _is_fresh(target: Path, source: Path) -> bool:
+    return target.exists() and target.stat().st_mtime >= source.stat().st_mtime
+
+
+def get_derivative(source: Path, width: int, fmt: str) -> Path:
+    """
+    Devuelve la ruta del derivado, generándolo si no existe o está viejo.
+
+    Args:
+        source: Portada original (ej: static/novels/5.webp)
+        width: Ancho ya resuelto con resolve_width()
+        fmt: "webp" o "avif" (ya resuelto con pick_format())
+    """
+    target = DERIVED_DIR / f"{source.stem}_{width}.{fmt}"
+
+    if _is_fresh(target, source):
+        return target
+
+    with _lock_for(target):
+        # Otra petición pudo generarlo mientras esperábamos
+        if _is_fresh(target, source):
+            return target
+
+        DERIVED_DIR.mkdir(parents=True, exist_ok=True)
+
+        from PIL import Image
+
+        with Image.open(source) as img:
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+
+            # thumbnail() mantiene la proporción y nunca agranda
+            img.thumbnail((width, width * 4), Image.Resampling.LANCZOS)
+
+            temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            img.save(temp_path, format=FORMATS[fmt][0], **ENCODE_OPTIONS[fmt])
+
+        # Misma fecha que el original: es el Last-Modified que anuncia la
+        # API, y el que pone nginx al enviar el archivo (X-Accel-Redirect)
+        source_stat = source.stat()
+        os.utime(temp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+        os.replace(temp_path, target)
+
+    return target
@@ -0,0 +1,130 @@
+# services/idempotency.py
+
+"""
+Claves de idempotencia para /admin/import-novel.
+
+Un cliente que no recibe respuesta (timeout, conexión cortada) no sabe
+si la importación se hizo. Si reintenta con la misma cabecera
+Idempotency-Key:
+
+    1er intento  ──▶ claim() inserta la fila (PK = clave) ──▶ importa ──▶ complete()
+    reintento    ──▶ claim() choca con la PK:
+                       ├── terminada  → la respuesta guardada (sin importar otra vez)
+                       └── en curso   → ImportInProgress (409, reintentar más tarde)
+
+- La PK de la tabla hace de candado entre workers y procesos: dos
+  peticiones con la misma clave nunca importan las dos
+- Si la importación falla, release() borra la fila: el reintento vuelve
+  a intentarlo (no se guardan errores)
+- Una fila en curso más vieja que IN_PROGRESS_TIMEOUT se da por
+  abandonada (el worker murió a mitad) y otra petición puede tomarla
+- Las filas duran RETENTION (24 h): la clave solo cubre los reintentos
+  de una subida, no la bloquea para siempre. claim() borra las caducadas,
+  así la tabla no crece sin límite y la misma clave vuelve a importar
+- Si la novela de una respuesta guardada se borró después, la clave
+  tampoco se repite: vuelve a importar
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from models.import_request import ImportRequest
+
+
+IN_PROGRESS_TIMEOUT = timedelta(minutes=15)
+RETENTION = timedelta(hours=24)
+
+
+class ImportInProgress(Exception):
+    """Otra petición con la misma clave está importando ahora mismo."""
+
+
+def claim(session: Session, key: str) -> ImportRequest | None:
+    """
+    Reserva la clave para esta petición.
+
+    Returns:
+        None si la reserva es nuestra (hay que importar), o la fila de una
+        importación ya terminada (hay que devolver su respuesta).
+
+    Raises:
+        ImportInProgress: la clave está reservada por otra petición en curso
+    """
+    now = datetime.now()
+    purge_expired(session, now)
+    session.add(ImportRequest(key=key, created_at=now))
+    try:
+        session.commit()
+        return None
+    except IntegrityError:
+        session.rollback()
+
+    record = session.get(ImportRequest, key, populate_existing=True)
+    if record is None:
+        # Se liberó entre el INSERT y la lectura: volver a intentarlo
+        return claim(session, key)
+    if record.status_code is not None:
+        if record.novel_id is not None:
+            return record
+        # La novela se borró después (FK SET NULL): la respuesta guardada
+        # apunta a algo que ya no existe → se importa de nuevo
+        session.exec(
+            delete(ImportRequest)
+            .where(ImportRequest.key == key)  # pyright: ignore[reportArgumentType]
+            .where(ImportRequest.novel_id.is_(None))  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue]
+            .where(ImportRequest.status_code.is_not(None))  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue]
+        )
+        session.commit()
+        return claim(session, key)
+
+    if now - record.created_at > IN_PROGRESS_TIMEOUT:
+        # UPDATE condicional: si dos peticiones la ven abandonada, solo una la toma
+        taken = session.exec(
+            update(ImportRequest)
+            .where(ImportRequest.key == key)  # pyright: ignore[reportArgumentType]
+            .where(ImportRequest.created_at == record.created_at)  # pyright: ignore[reportArgumentType]
+            .where(ImportRequest.status_code.is_(None))  # pyright: ignore[reportOptionalMemberAccess, reportAttributeAccessIssue]
+            .values(created_at=now)
+        )
+        session.commit()
+        if taken.rowcount == 1:  # pyright: ignore[reportAttributeAccessIssue]
+            return None
+
+    raise ImportInProgress(key)
+
+
+def purge_expired(session: Session, now: datetime | None = None) -> None:
+    """Borra las claves de más de RETENTION (terminadas o abandonadas)."""
+    cutoff = (now or datetime.now()) - RETENTION
+    session.exec(delete(ImportRequest).where(ImportRequest.created_at < cutoff))  # pyright: ignore[reportArgumentType]
+    session.commit()
+
+
+def complete(session: Session, key: str, status_code: int, body: dict, novel_id: int | None = None) -> None:
+    """Guarda la respuesta de la importación para los reintentos."""
+    record = session.get(ImportRequest, key)
+    if record is None:
+        return
+    record.status_code = status_code
+    record.response = json.dumps(body, ensure_ascii=False)
+    record.novel_id = novel_id
+    record.completed_at = datetime.now()
+    session.add(record)
+    session.commit()
+
+
+def release(session: Session, key: str) -> None:
+    """Libera la clave tras un fallo (el siguiente intento importa de nuevo)."""
+    session.rollback()
+    record = session.get(ImportRequest, key)
+    if record is not None and record.status_code is None:
+        session.delete(record)
+        session.commit()
+
+
+def stored_response(record: ImportRequest) -> dict:
+    return json.loads(record.response or "{}")
@@ -0,0 +1,174 @@
+# services/image_worker.py
+
+"""
+Pool de procesos para codificar portadas fuera del hilo de la petición.
+
+Pillow con method=6 tarda cientos de ms por portada y retiene el worker.
+Ahora los endpoints solo encolan el trabajo y responden al momento:
+
+    endpoint ──submit_cover()──▶ ProcessPoolExecutor ──encode_cover()
+                                                           │
+    BD (novel.cover_path) ◀──── _on_done() (callback) ◀────┘
+
+- encode_cover() corre en otro proceso: no compite por el GIL con la API
+- El resultado se guarda en el almacén por hash (services/blob_store.py):
+  la misma portada subida dos veces ocupa un solo archivo
+- El callback actualiza la fila de la novela cuando el archivo ya existe,
+  así nunca se apunta a una portada a medio escribir. La portada anterior
+  queda sin referencias y la borra el GC
+- El pool se crea al primer uso y se cierra en el shutdown (main.py)
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from sqlmodel import Session
+
+from core.config import settings
+from core.data_base import engine
+from models.novel import Novel
+from services import blob_store
+
+
+# ═══════════════════════════════════════════════════════════════
+# TRABAJO (se ejecuta en el proceso hijo)
+# ═══════════════════════════════════════════════════════════════
+
+def encode_cover(source_path: str) -> dict:
+    """
+    Convierte una imagen a WebP (fondo blanco si tiene transparencia)
+    y la guarda en el almacén de blobs.
+
+    Debe ser una función de módulo: el pool la envía al hijo por pickle.
+
+    Returns:
+        {"digest": hash del WebP, "original_size": bytes, "new_size": bytes}
+    """
+    from PIL import Image
+
+    source = Path(source_path)
+
+    with Image.open(source) as img:
+        # Convertir a RGB si es necesario (WebP no soporta RGBA bien)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            img = background
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Archivo temporal: put() lo renombra a su hash (o lo descarta si ya existe)
+        blob_store.BLOB_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = blob_store.BLOB_DIR / f".{source.stem}.{os.getpid()}.tmp"
+        img.save(
+            temp_path,
+            format='WEBP',
+            quality=85,  # Buena calidad, buen tamaño
+            method=6     # Mejor compresión (0-6, más lento pero mejor)
+        )
+
+    new_size = temp_path.stat().st_size
+    digest = blob_store.put(temp_path)
+
+    return {
+        "digest": digest,
+        "original_size": source.stat().st_size,
+        "new_size": new_size,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# POOL (proceso principal)
+# ═══════════════════════════════════════════════════════════════
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Crea el pool al primer uso.
+
+    Usa 'forkserver' (o 'spawn' fuera de Linux) en lugar de 'fork':
+    hacer fork de un proceso con hilos (uvicorn, pool de conexiones)
+    puede dejar locks tomados en el hijo.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Espera a las portadas en curso y cierra el pool (shutdown de la app)."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def submit_cover(novel_id: int, source_path: Path, delete_source: bool = False) -> Future:
+    """
+    Encola la portada de una novela y devuelve inmediatamente.
+
+    Args:
+        novel_id: Novela a la que pertenece la portada
+        source_path: Imagen original (jpg, png, webp...)
+        delete_source: Borrar el original al terminar (subidas temporales)
+
+    Returns:
+        Future con el resultado de encode_cover() (útil en scripts/tests)
+    """
+    future = get_pool().submit(encode_cover, str(source_path))
+    future.add_done_callback(
+        lambda done: _on_done(done, novel_id, source_path, delete_source)
+    )
+    return future
+
+
+def _on_done(future: Future, novel_id: int, source_path: Path, delete_source: bool) -> None:
+    """
+    Se ejecuta cuando termina la codificación (en un hilo del pool).
+
+    Solo aquí se actualiza novel.cover_path: la fila nunca apunta a un
+    archivo que todavía no existe.
+    """
+    try:
+        if future.exception() is not None:
+            print(f"⚠️ Error al procesar portada de novela {novel_id}: {future.exception()}")
+            return
+
+        stats = future.result()
+
+        with Session(engine) as session:
+            novel = session.get(Novel, novel_id)
+            if novel is None:
+                # La novela se borró mientras se codificaba (el blob lo borra el GC)
+                return
+
+            novel.cover_path = blob_store.cover_path_for(stats["digest"])
+            novel.updated_at = datetime.now()
+            session.add(novel)
+            session.commit()
+
+        reduction = ((stats["original_size"] - stats["new_size"]) / stats["original_size"]) * 100
+        print(f"✅ Portada de novela {novel_id} convertida a WebP")
+        print(f"   📊 {stats['original_size'] / 1024:.1f} KB → {stats['new_size'] / 1024:.1f} KB ({reduction:.1f}% menos)")
+
+    finally:
+        if delete_source:
+            source_path.unlink(missing_ok=True)
@@ -0,0 +1,399 @@
+# services/novel_index.py
+
+"""
+Índice en memoria de novelas: bitmaps por género y por estado.
+
+Cada bitmap es un int de Python. Los bits NO están indexados por id sino
+por POSICIÓN en el orden de los listados (rating DESC, id DESC):
+
+    posición:   0     1     2     3
+    novela:    #7    #3    #9    #4        (ratings 9.1, 8.0, 8.0, 5.5)
+    fantasía = 0b1010  → novelas #3 y #4
+
+Así todo filtro se resuelve con operaciones sobre enteros:
+- Géneros AND/OR y estado → & / |
+- Rating mínimo → máscara de prefijo (las mejores N posiciones)
+- Página → los bits encendidos más bajos (ya vienen ordenados)
+- Facetas → int.bit_count()
+
+La BD solo recibe un SELECT ... WHERE id IN (...) con los IDs de la página.
+
+Ciclo de vida:
+- Se reconstruye desde la BD al arrancar (lifespan en main.py)
+- Los endpoints que escriben lo parchean DESPUÉS del commit
+- Cada escritura publica un snapshot nuevo: los lectores toman uno
+  con snapshot() y nunca ven un índice a medio actualizar
+- Con varios workers (gunicorn.conf.py) cada uno tiene su copia: las
+  escrituras se anuncian en el bus (services/cache_bus.py) y los demás
+  releen de la BD solo las novelas que cambiaron
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Literal
+
+from sqlmodel import Session, select
+
+from models.novel import Novel
+from models.novel_genre import NovelGenre
+from services.cache_bus import MAX_PENDING, CacheBus
+
+
+GenreMode = Literal["and", "or"]
+
+
+# ═══════════════════════════════════════════════════════════════
+# HELPERS DE BITMAPS
+# ═══════════════════════════════════════════════════════════════
+
+def _bitmap(positions: Iterable[int], size: int) -> int:
+    """
+    [0, 2, 3] → 0b1101
+
+    Usa un bytearray en lugar de `bitmap |= 1 << pos`, que copiaría el
+    entero completo en cada bit (cuadrático con miles de novelas).
+    """
+    buffer = bytearray((size + 7) // 8)
+    for pos in positions:
+        buffer[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _rank_key(novel_id: int, rating: float | None) -> tuple:
+    """
+    Orden de los listados: rating DESC, id DESC, sin rating al final
+    (igual que ORDER BY rating DESC, id DESC en MySQL).
+    """
+    return (rating is None, -(rating or 0.0), -novel_id)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SNAPSHOT (inmutable, lo que usan las consultas)
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class NovelIndexSnapshot:
+    """Estado del índice en un momento dado."""
+
+    order: list[int] = field(default_factory=list)
+    # posición → novel_id (orden de los listados)
+
+    position: dict[int, int] = field(default_factory=dict)
+    # novel_id → posición
+
+    descending_ratings: list[float] = field(default_factory=list)
+    # -rating de las novelas con rating, en orden de posición
+    # (creciente → se puede usar bisect)
+
+    all: int = 0
+    by_genre: dict[int, int] = field(default_factory=dict)   # genre_id → bitmap
+    by_status: dict[str, int] = field(default_factory=dict)  # "ongoing" → bitmap
+
+    # ───────────────────────────────────────────────────────────
+    # FILTROS
+    # ───────────────────────────────────────────────────────────
+
+    def match_genres(self, genre_ids: Iterable[int], mode: GenreMode = "and") -> int:
+        """
+        Bitmap de novelas que tienen los géneros pedidos.
+
+        - "and": todas las novelas con TODOS los géneros
+        - "or": novelas con AL MENOS uno
+        """
+        bitmaps = [self.by_genre.get(genre_id, 0) for genre_id in genre_ids]
+
+        if not bitmaps:
+            return self.all
+
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap if mode == "and" else result | bitmap
+        return result
+
+    def match_status(self, status: str) -> int:
+        return self.by_status.get(status, 0)
+
+    def match_min_rating(self, min_rating: float) -> int:
+        """
+        Bitmap de novelas con rating >= min_rating.
+
+        Como las posiciones están ordenadas por rating, es un prefijo:
+        bisect encuentra cuántas novelas lo cumplen.
+        """
+        count = bisect.bisect_right(self.descending_ratings, -min_rating)
+        return (1 << count) - 1
+
+    def match_rated(self) -> int:
+        """Bitmap de novelas que tienen rating."""
+        return (1 << len(self.descending_ratings)) - 1
+
+    def match_ids(self, novel_ids: Iterable[int]) -> int:
+        """Bitmap a partir de IDs (ej: los que devolvió un LIKE en la BD)."""
+        position = self.position
+        return _bitmap(
+            (position[novel_id] for novel_id in novel_ids if novel_id in position),
+            len(self.order),
+        )
+
+    def match(
+        self,
+        genre_ids: Iterable[int] = (),
+        genre_mode: GenreMode = "and",
+        status: str | None = None,
+        min_rating: float | None = None,
+    ) -> int:
+        """Combina todos los filtros del índice en un solo bitmap."""
+        result = self.match_genres(genre_ids, genre_mode)
+        if status:
+            result &= self.match_status(status)
+        if min_rating is not None:
+            result &= self.match_min_rating(min_rating)
+        return result
+
+    # ───────────────────────────────────────────────────────────
+    # RESULTADOS
+    # ───────────────────────────────────────────────────────────
+
+    def page(self, bitmap: int, skip: int = 0, limit: int = 20) -> list[int]:
+        """IDs de una página, ya en orden (rating DESC, id DESC)."""
+        ids: list[int] = []
+        order = self.order
+
+        while bitmap and len(ids) < limit:
+            lowest = bitmap & -bitmap   # Bit encendido más bajo = mejor posición
+            if skip:
+                skip -= 1
+            else:
+                ids.append(order[lowest.bit_length() - 1])
+            bitmap ^= lowest
+
+        return ids
+
+    def genre_counts(self, within: int | None = None) -> dict[int, int]:
+        """Novelas por género (opcionalmente solo dentro de un bitmap)."""
+        if within is None:
+            return {key: bitmap.bit_count() for key, bitmap in self.by_genre.items()}
+        return {key: (bitmap & within).bit_count() for key, bitmap in self.by_genre.items()}
+
+    def status_counts(self, within: int | None = None) -> dict[str, int]:
+        """Novelas por estado (opcionalmente solo dentro de un bitmap)."""
+        if within is None:
+            return {key: bitmap.bit_count() for key, bitmap in self.by_status.items()}
+        return {key: (bitmap & within).bit_count() for key, bitmap in self.by_status.items()}
+
+
+# ═══════════════════════════════════════════════════════════════
+# ÍNDICE (datos base + escrituras)
+# ═══════════════════════════════════════════════════════════════
+
+class NovelIndex:
+    """
+    Guarda lo mínimo de cada novela (estado, rating, géneros) y publica
+    snapshots con los bitmaps calculados.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Solo las escrituras toman el lock; las lecturas usan el snapshot
+
+        self._status: dict[int, str] = {}
+        self._rating: dict[int, float | None] = {}
+        self._genres: dict[int, frozenset[int]] = {}
+
+        self._snapshot = NovelIndexSnapshot()
+
+        self.warm = False
+        # True tras el primer rebuild (el maestro de gunicorn lo hace antes del fork)
+
+        self.bus: CacheBus | None = None
+        self._seen = 0  # Último cambio del bus ya aplicado
+        self._sync_lock = threading.Lock()
+
+    def snapshot(self) -> NovelIndexSnapshot:
+        """Snapshot actual (usar el mismo para filtrar, paginar y contar)."""
+        if self.bus is not None and self.bus.has_changes(self._seen):
+            self.sync()
+        return self._snapshot
+
+    # ───────────────────────────────────────────────────────────
+    # CONSTRUCCIÓN
+    # ───────────────────────────────────────────────────────────
+
+    def rebuild(self, session: Session) -> None:
+        """Reconstruye el índice con dos SELECT de columnas pequeñas."""
+        status: dict[int, str] = {}
+        rating: dict[int, float | None] = {}
+        for novel_id, novel_status, novel_rating in session.exec(
+            select(Novel.id, Novel.status, Novel.rating)
+        ):
+            status[novel_id] = novel_status  # pyright: ignore[reportArgumentType]
+            rating[novel_id] = novel_rating  # pyright: ignore[reportArgumentType]
+
+        genres: dict[int, set[int]] = {}
+        for novel_id, genre_id in session.exec(select(NovelGenre.novel_id, NovelGenre.genre_id)):
+            genres.setdefault(novel_id, set()).add(genre_id)
+
+        with self._lock:
+            self._status = status
+            self._rating = rating
+            self._genres = {novel_id: frozenset(ids) for novel_id, ids in genres.items()}
+            self._publish()
+            self.warm = True
+
+    def _publish(self) -> None:
+        """Recalcula posiciones y bitmaps (llamar con el lock tomado)."""
+        order = sorted(self._rating, key=lambda novel_id: _rank_key(novel_id, self._rating[novel_id]))
+        position = {novel_id: pos for pos, novel_id in enumerate(order)}
+        size = len(order)
+
+        status_positions: dict[str, list[int]] = {}
+        for novel_id, status in self._status.items():
+            status_positions.setdefault(status, []).append(position[novel_id])
+
+        genre_positions: dict[int, list[int]] = {}
+        for novel_id, genre_ids in self._genres.items():
+            if novel_id not in position:
+                continue
+            for genre_id in genre_ids:
+                genre_positions.setdefault(genre_id, []).append(position[novel_id])
+
+        self._snapshot = NovelIndexSnapshot(
+            order=order,
+            position=position,
+            descending_ratings=[
+                -rating for novel_id in order
+                if (rating := self._rating[novel_id]) is not None
+            ],
+            all=(1 << size) - 1,
+            by_genre={key: _bitmap(positions, size) for key, positions in genre_positions.items()},
+            by_status={key: _bitmap(positions, size) for key, positions in status_positions.items()},
+        )
+
+    # ───────────────────────────────────────────────────────────
+    # PARCHES (llamar después del commit)
+    # ───────────────────────────────────────────────────────────
+
+    def upsert_novel(self, novel_id: int, status: str, rating: float | None) -> None:
+        """Registra una novela nueva o su cambio de estado/rating."""
+        with self._lock:
+            self._status[novel_id] = status
+            self._rating[novel_id] = rating
+            self._publish()
+        self._announce("novel", novel_id)
+
+    def set_genres(self, novel_id: int, genre_ids: Iterable[int]) -> None:
+        """Reemplaza los géneros de una novela."""
+        with self._lock:
+            self._genres[novel_id] = frozenset(genre_ids)
+            self._publish()
+        self._announce("novel", novel_id)
+
+    def remove_novel(self, novel_id: int) -> None:
+        with self._lock:
+            self._status.pop(novel_id, None)
+            self._rating.pop(novel_id, None)
+            self._genres.pop(novel_id, None)
+            self._publish()
+        self._announce("novel", novel_id)
+
+    def remove_genre(self, genre_id: int) -> None:
+        with self._lock:
+            self._remove_genre(genre_id)
+            self._publish()
+        self._announce("genre", genre_id)
+
+    def _remove_genre(self, genre_id: int) -> None:
+        self._genres = {
+            novel_id: genre_ids - {genre_id}
+            for novel_id, genre_ids in self._genres.items()
+        }
+
+    # ───────────────────────────────────────────────────────────
+    # VARIOS WORKERS (bus de invalidación)
+    # ───────────────────────────────────────────────────────────
+
+    def attach_bus(self, bus: CacheBus) -> None:
+        """
+        Conecta el índice al bus. Llamar ANTES de rebuild(): lo que se
+        publique mientras tanto se vuelve a aplicar en el siguiente sync().
+        """
+        self._seen = bus.latest()
+        self.bus = bus
+
+    def _announce(self, kind: str, key: int) -> None:
+        """Avisa a los demás workers (este ya aplicó el cambio)."""
+        if self.bus is None:
+            return
+        seq = self.bus.publish(kind, key)
+        if seq == self._seen + 1:
+            self._seen = seq  # No hay cambios ajenos en medio: no hace falta releer
+
+    def sync(self) -> None:
+        """
+        Aplica los cambios que publicaron otros workers.
+
+        Relee de la BD solo las novelas afectadas (dos SELECT ... IN).
+        Si hay demasiados pendientes, o el registro ya se limpió, se
+        reconstruye el índice completo.
+        """
+        from core.data_base import engine  # Evita import circular con los routers
+
+        with self._sync_lock:
+            bus = self.bus
+            if bus is None:
+                return
+
+            changes = bus.changes_after(self._seen)
+            if not changes:
+                return
+
+            if len(changes) > MAX_PENDING or bus.oldest() > self._seen + 1:
+                with Session(engine) as session:
+                    self.rebuild(session)
+                self._seen = changes[-1][0]
+                return
+
+            novel_ids = {key for _, kind, key in changes if kind == "novel"}
+            removed_genres = {key for _, kind, key in changes if kind == "genre"}
+
+            rows: list = []
+            genre_rows: list = []
+            if novel_ids:
+                with Session(engine) as session:
+                    rows = session.exec(
+                        select(Novel.id, Novel.status, Novel.rating)
+                        .where(Novel.id.in_(novel_ids))  # pyright: ignore[reportOptionalMemberAccess,reportAttributeAccessIssue]
+                    ).all()
+                    genre_rows = session.exec(
+                        select(NovelGenre.novel_id, NovelGenre.genre_id)
+                        .where(NovelGenre.novel_id.in_(novel_ids))  # pyright: ignore[reportAttributeAccessIssue]
+                    ).all()
+
+            genres: dict[int, set[int]] = {novel_id: set() for novel_id in novel_ids}
+            for novel_id, genre_id in genre_rows:
+                genres[novel_id].add(genre_id)
+
+            with self._lock:
+                for genre_id in removed_genres:
+                    self._remove_genre(genre_id)
+
+                # Se quitan todas y se vuelven a poner las que siguen en la BD
+                # (las que faltan se borraron en otro worker)
+                for novel_id in novel_ids:
+                    self._status.pop(novel_id, None)
+                    self._rating.pop(novel_id, None)
+                    self._genres.pop(novel_id, None)
+
+                for novel_id, novel_status, novel_rating in rows:
+                    self._status[novel_id] = novel_status
+                    self._rating[novel_id] = novel_rating
+                    self._genres[novel_id] = frozenset(genres[novel_id])
+
+                self._publish()
+
+            self._seen = changes[-1][0]
+
+
+novel_index = NovelIndex()
+# Instancia única por proceso (igual que core.config.settings)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+start.py
+Arranque del contenedor en UN solo proceso de Python:
+
+    1. alembic upgrade head   (programático)
+    2. uvicorn main:app
+
+Antes eran dos intérpretes (`alembic upgrade head && uvicorn main:app`)
+y cada uno importaba SQLAlchemy, SQLModel y los modelos desde cero.
+Ahora uvicorn reutiliza los módulos que ya cargó la migración.
+
+Con --workers N (o WEB_CONCURRENCY=N) el paso 2 es gunicorn con N workers
+de uvicorn; la configuración está en gunicorn.conf.py.
+
+Uso (desde backend/):
+    python start.py
+    python start.py --port 8001 --skip-migrations
+    python start.py --workers 4
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+DEFAULT_CACHE_BUS_PATH = "/tmp/novels-cache-bus.sqlite"
+
+
+def migrate() -> None:
+    """Equivalente a `alembic upgrade head` (no hace nada si ya está al día)."""
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(str(BACKEND_DIR / "alembic.ini")), "head")
+
+
+def run_gunicorn(host: str, port: int, workers: int) -> None:
+    """gunicorn en este mismo proceso (pasa a ser el maestro)."""
+    from gunicorn.app.wsgiapp import WSGIApplication
+
+    sys.argv = [
+        "gunicorn",
+        "--config", str(BACKEND_DIR / "gunicorn.conf.py"),
+        "--bind", f"{host}:{port}",
+        "--workers", str(workers),
+        "main:app",
+    ]
+    WSGIApplication("%(prog)s [OPTIONS] [APP_MODULE]").run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones + API en un solo proceso")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="Procesos de la API (default: WEB_CONCURRENCY o 1)")
+    parser.add_argument("--skip-migrations", action="store_true", help="No ejecutar alembic")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Antes de importar core.config: los workers lo heredan del maestro
+        os.environ.setdefault("CACHE_BUS_PATH", DEFAULT_CACHE_BUS_PATH)
+
+    if not args.skip_migrations:
+        migrate()
+
+    if args.workers > 1:
+        run_gunicorn(args.host, args.port, args.workers)
+        return
+
+    import uvicorn
+    uvicorn.run("main:app", host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
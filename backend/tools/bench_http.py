@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+bench_http.py
+Benchmark HTTP de la API: latencias p50/p95/p99 y peticiones por segundo.
+
+    seed     Llena la BD con novelas y capítulos sintéticos
+    run      Lanza carga concurrente contra una API en marcha → JSON
+    compare  Compara dos JSON (ej: antes / después de un commit)
+
+Los datos sintéticos se marcan con source_url "bench://..." para poder
+borrarlos (seed --reset) sin tocar las novelas reales.
+
+Escala: --scale 1 = 10.000 novelas y 2.000.000 de capítulos.
+
+Uso (desde backend/):
+    python tools/bench_http.py seed --scale 0.1
+    python start.py                      # (re)arrancar: el índice se construye al arrancar
+    python tools/bench_http.py run --concurrency 32 --duration 30
+    python tools/bench_http.py compare profiles/antes.json profiles/bench_http.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+NOVELS_PER_SCALE = 10_000
+CHAPTERS_PER_SCALE = 2_000_000
+BATCH_SIZE = 5_000
+BENCH_PREFIX = "bench://"
+
+# Vocabulario de los nombres sintéticos (también son los términos de búsqueda)
+ADJECTIVES = ["Eternal", "Silent", "Crimson", "Divine", "Lost", "Infinite", "Shadow", "Golden"]
+NOUNS = ["Dragon", "Sword", "Emperor", "Realm", "Mage", "Tower", "Path", "Sky"]
+GENRES = ["Acción", "Aventura", "Fantasía", "Romance", "Misterio", "Xianxia", "Comedia", "Drama"]
+STATUSES = ["ongoing", "completed", "hiatus", "dropped"]
+
+# Endpoints medidos y su peso en la mezcla de tráfico
+SCENARIOS = {
+    "novels_list": 3,      # GET /novels/
+    "novels_search": 2,    # GET /novels/search/
+    "novel_detail": 2,     # GET /novels/{id}
+    "novel_chapters": 2,   # GET /novels/{id}/chapters
+    "chapter": 3,          # GET /chapters/{id}
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+# SEED (datos sintéticos)
+# ═══════════════════════════════════════════════════════════════
+
+def _bench_engine(db_url: str | None):
+    """Engine propio: permite medir otra BD con --db-url sin tocar .env."""
+    from sqlmodel import create_engine
+
+    if db_url is None:
+        from core.config import settings
+        db_url = settings.url_conection
+    return create_engine(db_url)
+
+
+def reset(engine) -> int:
+    """
+    Borra las novelas sintéticas con sus capítulos y géneros.
+
+    Hijos primero, sin depender de ON DELETE CASCADE (SQLite no lo
+    aplica sin PRAGMA foreign_keys).
+    """
+    from sqlalchemy import delete, select
+
+    from models.chapter import Chapter
+    from models.chapter_content import ChapterContent
+    from models.novel import Novel
+    from models.novel_genre import NovelGenre
+
+    bench_novels = select(Novel.id).where(Novel.source_url.like(f"{BENCH_PREFIX}%"))  # pyright: ignore[reportOptionalMemberAccess,reportAttributeAccessIssue]
+    bench_chapters = select(Chapter.id).where(Chapter.novel_id.in_(bench_novels))  # pyright: ignore[reportAttributeAccessIssue]
+
+    with engine.begin() as connection:
+        connection.execute(delete(ChapterContent).where(ChapterContent.chapter_id.in_(bench_chapters)))  # pyright: ignore[reportAttributeAccessIssue]
+        connection.execute(delete(Chapter).where(Chapter.novel_id.in_(bench_novels)))  # pyright: ignore[reportAttributeAccessIssue]
+        connection.execute(delete(NovelGenre).where(NovelGenre.novel_id.in_(bench_novels)))  # pyright: ignore[reportAttributeAccessIssue]
+        result = connection.execute(delete(Novel).where(Novel.id.in_(bench_novels)))  # pyright: ignore[reportOptionalMemberAccess,reportAttributeAccessIssue]
+    return result.rowcount
+
+
+def seed(engine, novels: int, chapters: int, content_bytes: int, rng: random.Random) -> dict:
+    """
+    Inserta novelas, capítulos y cuerpos en lotes (INSERT multi-fila).
+
+    Los IDs se asignan aquí (a partir del máximo actual) para no tener
+    que leerlos de vuelta tras cada lote.
+    """
+    from sqlalchemy import func, insert, select
+
+    from models.chapter import Chapter
+    from models.chapter_content import ChapterContent, content_hash
+    from models.genre import Genre
+    from models.novel import Novel
+    from models.novel_genre import NovelGenre
+
+    novel_table = Novel.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    chapter_table = Chapter.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    content_table = ChapterContent.__table__  # pyright: ignore[reportAttributeAccessIssue]
+    link_table = NovelGenre.__table__  # pyright: ignore[reportAttributeAccessIssue]
+
+    # ───────────────────────────────────────────────────────────
+    # PASO 1: Géneros (se reutilizan si ya existen)
+    # ───────────────────────────────────────────────────────────
+    with engine.begin() as connection:
+        existing = dict(connection.execute(select(Genre.name, Genre.id)).all())
+        missing = [name for name in GENRES if name not in existing]
+        if missing:
+            connection.execute(insert(Genre.__table__), [{"name": name} for name in missing])  # pyright: ignore[reportAttributeAccessIssue]
+            existing = dict(connection.execute(select(Genre.name, Genre.id)).all())
+        genre_ids = [existing[name] for name in GENRES]
+
+        next_novel = (connection.execute(select(func.max(Novel.id))).scalar() or 0) + 1
+        next_chapter = (connection.execute(select(func.max(Chapter.id))).scalar() or 0) + 1
+
+    # ───────────────────────────────────────────────────────────
+    # PASO 2: Novelas + géneros
+    # ───────────────────────────────────────────────────────────
+    start = time.perf_counter()
+    now = datetime.now()
+    novel_ids = list(range(next_novel, next_novel + novels))
+
+    for batch_start in range(0, novels, BATCH_SIZE):
+        batch = novel_ids[batch_start:batch_start + BATCH_SIZE]
+        novel_rows = []
+        link_rows = []
+        for novel_id in batch:
+            novel_rows.append({
+                "id": novel_id,
+                "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {novel_id}",
+                "author": f"Autor {rng.randint(1, max(novels // 10, 1))}",
+                "description": "Novela sintética para benchmarks. " * 8,
+                "rating": round(rng.uniform(1, 10), 1) if rng.random() < 0.9 else None,
+                "status": rng.choice(STATUSES),
+                "source_url": f"{BENCH_PREFIX}novel/{novel_id}",
+                "created_at": now,
+                "updated_at": now,
+            })
+            for genre_id in rng.sample(genre_ids, rng.randint(1, 3)):
+                link_rows.append({"novel_id": novel_id, "genre_id": genre_id})
+
+        with engine.begin() as connection:
+            connection.execute(insert(novel_table), novel_rows)
+            connection.execute(insert(link_table), link_rows)
+
+    # ───────────────────────────────────────────────────────────
+    # PASO 3: Capítulos (repartidos por igual) + cuerpos
+    # ───────────────────────────────────────────────────────────
+    per_novel, extra = divmod(chapters, max(novels, 1))
+    body = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (content_bytes // 56 + 1))[:content_bytes]
+    body_hash = content_hash(body)
+
+    chapter_rows: list[dict] = []
+    content_rows: list[dict] = []
+    chapter_id = next_chapter
+    inserted = 0
+
+    def flush() -> None:
+        with engine.begin() as connection:
+            connection.execute(insert(chapter_table), chapter_rows)
+            connection.execute(insert(content_table), content_rows)
+        chapter_rows.clear()
+        content_rows.clear()
+
+    for index, novel_id in enumerate(novel_ids):
+        for number in range(1, per_novel + (1 if index < extra else 0) + 1):
+            chapter_rows.append({
+                "id": chapter_id,
+                "novel_id": novel_id,
+                "title": f"Capítulo {number}",
+                "order_number": number,
+                "source_url": f"{BENCH_PREFIX}chapter/{chapter_id}",
+                "content_hash": body_hash,
+                "content_bytes": len(body.encode("utf-8")),
+                "created_at": now,
+            })
+            content_rows.append({"chapter_id": chapter_id, "content": body})
+            chapter_id += 1
+            inserted += 1
+            if len(chapter_rows) >= BATCH_SIZE:
+                flush()
+                print(f"\r   📖 {inserted:,}/{chapters:,} capítulos", end="", flush=True)
+
+    if chapter_rows:
+        flush()
+    print()
+
+    return {
+        "novels": novels,
+        "chapters": inserted,
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# RUN (carga concurrente)
+# ═══════════════════════════════════════════════════════════════
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Percentil por rango más cercano (sorted_values ya ordenada)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _latency_summary(latencies: list[float], errors: int, seconds: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / seconds, 1) if seconds else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(values, 50), 2),
+            "p95": round(_percentile(values, 95), 2),
+            "p99": round(_percentile(values, 99), 2),
+            "mean": round(statistics.fmean(values), 2) if values else 0.0,
+            "max": round(values[-1], 2) if values else 0.0,
+        },
+    }
+
+
+async def discover(client, sample: int, rng: random.Random) -> dict:
+    """
+    IDs reales para las peticiones: novelas de varias páginas del
+    listado y capítulos de algunas de ellas.
+    """
+    facets = (await client.get("/novels/facets/")).json()
+    total = facets.get("total", 0)
+    if not total:
+        sys.exit("❌ La API no tiene novelas (ejecuta `seed` y reinicia la API)")
+
+    novel_ids: list[int] = []
+    for _ in range(max(sample // 100, 1)):
+        skip = rng.randrange(0, max(total - 100, 1))
+        response = await client.get("/novels/", params={"skip": skip, "limit": 100})
+        novel_ids.extend(novel["id"] for novel in response.json())
+
+    chapter_ids: list[int] = []
+    for novel_id in rng.sample(novel_ids, min(20, len(novel_ids))):
+        response = await client.get(f"/novels/{novel_id}/chapters", params={"limit": 100})
+        chapter_ids.extend(chapter["id"] for chapter in response.json())
+
+    return {"total_novels": total, "novel_ids": novel_ids, "chapter_ids": chapter_ids}
+
+
+def _build_request(scenario: str, data: dict, rng: random.Random) -> tuple[str, dict]:
+    """(ruta, query params) de una petición del escenario."""
+    if scenario == "novels_list":
+        return "/novels/", {"skip": rng.randrange(0, min(data["total_novels"], 1000)), "limit": 20}
+    if scenario == "novels_search":
+        params = {"q": rng.choice(ADJECTIVES + NOUNS), "limit": 20}
+        if rng.random() < 0.5:
+            params["status"] = rng.choice(STATUSES)
+        return "/novels/search/", params
+    if scenario == "novel_detail":
+        return f"/novels/{rng.choice(data['novel_ids'])}", {}
+    if scenario == "novel_chapters":
+        return f"/novels/{rng.choice(data['novel_ids'])}/chapters", {"limit": 100}
+    return f"/chapters/{rng.choice(data['chapter_ids'])}", {}
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, warmup: float,
+                   scenarios: list[str], sample: int, rng: random.Random) -> dict:
+    """N clientes en bucle durante `duration` segundos (tras `warmup`)."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        data = await discover(client, sample, rng)
+        if not data["chapter_ids"]:
+            scenarios = [name for name in scenarios if name != "chapter"]
+
+        weighted = [name for name in scenarios for _ in range(SCENARIOS[name])]
+        latencies: dict[str, list[float]] = {name: [] for name in scenarios}
+        errors: dict[str, int] = {name: 0 for name in scenarios}
+
+        measure_from = time.perf_counter() + warmup
+        stop_at = measure_from + duration
+
+        async def worker(worker_rng: random.Random) -> None:
+            while (now := time.perf_counter()) < stop_at:
+                scenario = worker_rng.choice(weighted)
+                path, params = _build_request(scenario, data, worker_rng)
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                if now < measure_from:
+                    continue  # Calentamiento: no cuenta
+                if failed:
+                    errors[scenario] += 1
+                else:
+                    latencies[scenario].append(elapsed_ms)
+
+        await asyncio.gather(*(
+            worker(random.Random(rng.random())) for _ in range(concurrency)
+        ))
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "dataset": {
+            "novels": data["total_novels"],
+            "sampled_novels": len(data["novel_ids"]),
+            "sampled_chapters": len(data["chapter_ids"]),
+        },
+        "endpoints": {
+            name: _latency_summary(latencies[name], errors[name], duration)
+            for name in scenarios
+        },
+        "total": _latency_summary(all_latencies, sum(errors.values()), duration),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════
+# COMPARE
+# ═══════════════════════════════════════════════════════════════
+
+def compare(before: dict, after: dict) -> None:
+    """Tabla de diferencias por endpoint (negativo = más rápido)."""
+    print(f"\n{'endpoint':<16} {'p50 ms':>18} {'p99 ms':>18} {'rps':>18}")
+    for name, new in after["endpoints"].items():
+        old = before["endpoints"].get(name)
+        if old is None:
+            continue
+
+        def cell(old_value: float, new_value: float) -> str:
+            change = (new_value - old_value) / old_value * 100 if old_value else 0.0
+            return f"{new_value:>8.1f} ({change:+5.1f}%)"
+
+        print(f"{name:<16} "
+              f"{cell(old['latency_ms']['p50'], new['latency_ms']['p50']):>18} "
+              f"{cell(old['latency_ms']['p99'], new['latency_ms']['p99']):>18} "
+              f"{cell(old['rps'], new['rps']):>18}")
+    print(f"\n   antes: {before.get('git_commit')}  después: {after.get('git_commit')}")
+
+
+# ═══════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTTP de la API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = subparsers.add_parser("seed", help="Insertar datos sintéticos")
+    seed_parser.add_argument("--db-url", help="URL de SQLAlchemy (default: la de .env)")
+    seed_parser.add_argument("--scale", type=float, default=0.1,
+                             help=f"1 = {NOVELS_PER_SCALE:,} novelas / {CHAPTERS_PER_SCALE:,} capítulos")
+    seed_parser.add_argument("--novels", type=int, help="Sobrescribe el número de novelas")
+    seed_parser.add_argument("--chapters", type=int, help="Sobrescribe el número de capítulos")
+    seed_parser.add_argument("--content-bytes", type=int, default=2000, help="Tamaño de cada capítulo")
+    seed_parser.add_argument("--reset", action="store_true", help="Borrar antes los datos sintéticos")
+    seed_parser.add_argument("--seed", type=int, default=42, help="Semilla aleatoria")
+
+    run_parser = subparsers.add_parser("run", help="Medir la API en marcha")
+    run_parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="Clientes simultáneos")
+    run_parser.add_argument("--duration", type=float, default=20, help="Segundos medidos")
+    run_parser.add_argument("--warmup", type=float, default=3, help="Segundos sin medir al inicio")
+    run_parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    run_parser.add_argument("--sample", type=int, default=500, help="Novelas de las que sacar IDs")
+    run_parser.add_argument("--seed", type=int, default=42, help="Semilla aleatoria")
+    run_parser.add_argument("--output", default="profiles/bench_http.json", help="Artefacto JSON")
+
+    compare_parser = subparsers.add_parser("compare", help="Comparar dos resultados")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    args = parser.parse_args()
+
+    if args.command == "seed":
+        engine = _bench_engine(args.db_url)
+        if args.reset:
+            print(f"🗑️  {reset(engine):,} novelas sintéticas borradas")
+        novels = args.novels if args.novels is not None else int(NOVELS_PER_SCALE * args.scale)
+        chapters = args.chapters if args.chapters is not None else int(CHAPTERS_PER_SCALE * args.scale)
+        print(f"🌱 Insertando {novels:,} novelas y {chapters:,} capítulos...")
+        stats = seed(engine, novels, chapters, args.content_bytes, random.Random(args.seed))
+        print(f"✅ {stats['novels']:,} novelas, {stats['chapters']:,} capítulos en {stats['seconds']} s")
+        print("⚠️  Reinicia la API: el índice de novelas se construye al arrancar")
+
+    elif args.command == "run":
+        print(f"🏁 {args.concurrency} clientes, {args.duration} s contra {args.base_url}")
+        results = asyncio.run(run_load(
+            args.base_url, args.concurrency, args.duration, args.warmup,
+            args.scenarios, args.sample, random.Random(args.seed),
+        ))
+        report = {
+            "tool": "bench_http",
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "config": {
+                "base_url": args.base_url,
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+                "seed": args.seed,
+            },
+            **results,
+        }
+
+        output = Path(args.output)
+        if not output.is_absolute():
+            output = BACKEND_DIR / output
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        print(f"\n{'endpoint':<16} {'req':>8} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, row in [*report["endpoints"].items(), ("TOTAL", report["total"])]:
+            latency = row["latency_ms"]
+            print(f"{name:<16} {row['requests']:>8} {row['errors']:>5} {row['rps']:>8} "
+                  f"{latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8}")
+        print(f"\n💾 Guardado en {output}")
+
+    else:
+        before = json.loads(Path(args.before).read_text(encoding="utf-8"))
+        after = json.loads(Path(args.after).read_text(encoding="utf-8"))
+        compare(before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+bench_scraper.py
+Benchmark de NovelasLigeraScraper contra el sitio local (tools/fixture_site.py).
+
+Dos fases:
+
+    1. end_to_end  scrape_novel() completo contra el servidor local
+                   (HTTP + parseo + escritura del JSON) → páginas/s,
+                   CPU por página, memoria máxima
+    2. parse       Las mismas páginas leídas del corpus en memoria, sin red
+                   → CPU de parseo por página (p50/p95 por tipo de página)
+
+El servidor corre en otro proceso: su CPU y su memoria no cuentan.
+
+Uso (desde backend/):
+    python tools/bench_scraper.py
+    python tools/bench_scraper.py --latency-ms 50 --error-rate 0.02 --repeat 3
+    python tools/bench_scraper.py --novels el-villano-que-quiere-vivir --max-chapters 20
+    python tools/bench_scraper.py --repeat 2 --http-cache   # 2ª pasada: todo 304
+    python tools/bench_scraper.py --latency-ms 50 --concurrency 8   # pipeline fetch/parse
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR / "scrapers"))
+sys.path.insert(0, str(BACKEND_DIR / "tools"))
+
+import fixture_site  # noqa: E402
+
+try:
+    import resource  # Solo Unix
+except ImportError:
+    resource = None
+
+
+def _max_rss_mb() -> float | None:
+    """Memoria residente máxima del proceso hasta ahora (MB)."""
+    if resource is None:
+        return None
+    kilobytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(kilobytes / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def _cpu_summary(values_ms: list[float]) -> dict:
+    values = sorted(values_ms)
+    if not values:
+        return {"pages": 0}
+    return {
+        "pages": len(values),
+        "mean_ms": round(statistics.fmean(values), 3),
+        "p50_ms": round(values[len(values) // 2], 3),
+        "p95_ms": round(values[min(int(len(values) * 0.95), len(values) - 1)], 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════
+# SERVIDOR (proceso aparte)
+# ═══════════════════════════════════════════════════════════════
+
+@contextlib.contextmanager
+def fixture_server(corpus: Path, latency_ms: float, jitter_ms: float, error_rate: float):
+    """Lanza `fixture_site.py serve` en un puerto libre y devuelve su URL."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, str(BACKEND_DIR / "tools" / "fixture_site.py"),
+         "--corpus", str(corpus), "serve", "--port", str(port),
+         "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms),
+         "--error-rate", str(error_rate)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                break
+            time.sleep(0.05)
+        else:
+            raise RuntimeError("El servidor de fixtures no arrancó")
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+# ═══════════════════════════════════════════════════════════════
+# FASE 1: END TO END
+# ═══════════════════════════════════════════════════════════════
+
+def run_end_to_end(base_url: str, slugs: list[str], max_chapters: int | None,
+                   repeat: int, verbose: bool, trace_memory: bool, http_cache: bool = False,
+                   concurrency: int = 1) -> dict:
+    """
+    scrape_novel() de cada novela, `repeat` veces, con un scraper por pasada.
+
+    Con http_cache, todas las pasadas comparten la caché HTTP: a partir de
+    la segunda las páginas llegan como 304 (sin cuerpo).
+
+    Con concurrency > 1 se usa el pipeline (pipeline.py): el parseo corre
+    en otros procesos y su CPU no aparece en cpu_s.
+    """
+    from definitivo import NovelasLigeraScraper
+
+    pages = {"ok": 0, "errors": 0, "bytes": 0, "revalidated": 0}
+
+    def count_response(response, *args, **kwargs):
+        if response.status_code >= 400:
+            pages["errors"] += 1
+        elif response.headers.get("X-Cache") == "revalidated":
+            pages["ok"] += 1
+            pages["revalidated"] += 1
+        else:
+            pages["ok"] += 1
+            pages["bytes"] += len(response.content)
+
+    novels_ok = 0
+    novels_failed = 0
+    chapters_saved = 0
+
+    if trace_memory:
+        tracemalloc.start()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeat):
+            cache_dir = str(Path(output_dir) / ".http_cache") if http_cache else None
+            scraper = NovelasLigeraScraper(base_url=base_url, request_delay=0, cache_dir=cache_dir)
+            scraper.session.hooks["response"].append(count_response)
+
+            for slug in slugs:
+                output = io.StringIO()
+                try:
+                    with contextlib.redirect_stdout(sys.stdout if verbose else output):
+                        result = scraper.scrape_novel(slug, end_chapter=max_chapters, output_dir=output_dir,
+                                                      concurrency=concurrency)
+                    novels_ok += 1
+                    chapters_saved += result["chapters_saved"]
+                except Exception as e:
+                    novels_failed += 1
+                    print(f"⚠️  {slug}: {e}", file=sys.stderr)
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    total_pages = pages["ok"] + pages["errors"]
+
+    result = {
+        "novels_ok": novels_ok,
+        "novels_failed": novels_failed,
+        "chapters_saved": chapters_saved,
+        "pages": total_pages,
+        "page_errors": pages["errors"],
+        "pages_not_modified": pages["revalidated"],
+        "megabytes": round(pages["bytes"] / 1024 / 1024, 2),
+        "wall_s": round(wall, 3),
+        "pages_per_s": round(total_pages / wall, 1) if wall else 0.0,
+        "cpu_s": round(cpu, 3),
+        "cpu_ms_per_page": round(cpu / total_pages * 1000, 3) if total_pages else 0.0,
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+    if trace_memory:
+        result["python_heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════
+# FASE 2: SOLO PARSEO
+# ═══════════════════════════════════════════════════════════════
+
+class ReplaySession:
+    """
+    Sustituto de requests.Session que lee las páginas del corpus en memoria.
+
+    Sin red ni servidor: lo que se mide es solo el trabajo del scraper.
+    """
+
+    def __init__(self, corpus: Path):
+        import requests
+
+        self._response_class = requests.Response
+        self._pages: dict[str, bytes] = {}
+        for path in corpus.rglob("index.html"):
+            self._pages[path.parent.relative_to(corpus).as_posix()] = path.read_bytes()
+
+    def get(self, url: str, timeout: float | None = None):
+        response = self._response_class()
+        body = self._pages.get(urlsplit(url).path.strip("/"))
+        response.status_code = 200 if body is not None else 404
+        response._content = body or b""
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+
+def run_parse(corpus: Path, slugs: list[str], max_chapters: int | None, repeat: int) -> dict:
+    """CPU de get_novel_info() y scrape_chapter() por página, sin red."""
+    from definitivo import NovelasLigeraScraper
+
+    scraper = NovelasLigeraScraper(base_url="http://fixture", request_delay=0)
+    scraper.session = ReplaySession(corpus)  # pyright: ignore[reportAttributeAccessIssue]
+
+    novel_ms: list[float] = []
+    chapter_ms: list[float] = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for slug in slugs:
+                start = time.process_time()
+                info = scraper.get_novel_info(slug)
+                novel_ms.append((time.process_time() - start) * 1000)
+
+                for chapter in info["chapters_urls"][:max_chapters]:
+                    start = time.process_time()
+                    scraper.scrape_chapter(chapter["url"])
+                    chapter_ms.append((time.process_time() - start) * 1000)
+
+    return {
+        "novel_page": _cpu_summary(novel_ms),
+        "chapter_page": _cpu_summary(chapter_ms),
+        "all_pages": _cpu_summary(novel_ms + chapter_ms),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del scraper contra el sitio local")
+    parser.add_argument("--corpus", type=Path, default=fixture_site.DEFAULT_CORPUS)
+    parser.add_argument("--rebuild", action="store_true", help="Regenerar el corpus antes de medir")
+    parser.add_argument("--novels", nargs="+", help="Slugs a medir (default: todo el corpus)")
+    parser.add_argument("--max-chapters", type=int, default=None, help="Capítulos por novela")
+    parser.add_argument("--repeat", type=int, default=1, help="Pasadas sobre el corpus")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latencia del servidor")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0, help="Fracción de respuestas 503")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Medir también el pico del heap de Python (más lento)")
+    parser.add_argument("--http-cache", action="store_true",
+                        help="Caché HTTP compartida entre pasadas (ETag / Last-Modified)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Descargas a la vez (>1: pipeline con parseo en otros procesos)")
+    parser.add_argument("--skip-parse", action="store_true", help="Solo la fase end_to_end")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar la salida del scraper")
+    parser.add_argument("--output", default="profiles/bench_scraper.json", help="Artefacto JSON")
+    args = parser.parse_args()
+
+    if args.rebuild or not fixture_site.novel_slugs(args.corpus):
+        stats = fixture_site.build(args.corpus)
+        print(f"🏗️  Corpus generado: {stats['novels']} novelas, {stats['chapters']} capítulos")
+
+    slugs = args.novels or fixture_site.novel_slugs(args.corpus)
+    baseline_rss = _max_rss_mb()
+
+    print(f"🕷️  end_to_end: {len(slugs)} novelas × {args.repeat} "
+          f"(latencia {args.latency_ms}±{args.jitter_ms} ms, errores {args.error_rate:.0%})")
+    with fixture_server(args.corpus, args.latency_ms, args.jitter_ms, args.error_rate) as base_url:
+        end_to_end = run_end_to_end(base_url, slugs, args.max_chapters, args.repeat,
+                                    args.verbose, args.tracemalloc, args.http_cache, args.concurrency)
+
+    report = {
+        "tool": "bench_scraper",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "config": {
+            "novels": len(slugs),
+            "max_chapters": args.max_chapters,
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "http_cache": args.http_cache,
+            "concurrency": args.concurrency,
+        },
+        "baseline_rss_mb": baseline_rss,
+        "end_to_end": end_to_end,
+    }
+
+    if not args.skip_parse:
+        print("🧪 parse: mismas páginas desde memoria")
+        report["parse"] = run_parse(args.corpus, slugs, args.max_chapters, args.repeat)
+
+    output = Path(args.output)
+    if not output.is_absolute():
+        output = BACKEND_DIR / output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"\n📄 {end_to_end['pages']} páginas ({end_to_end['page_errors']} errores) "
+          f"en {end_to_end['wall_s']} s → {end_to_end['pages_per_s']} páginas/s")
+    if args.http_cache:
+        print(f"♻️  {end_to_end['pages_not_modified']} páginas sin cambios (304)")
+    print(f"⚙️  CPU: {end_to_end['cpu_ms_per_page']} ms/página (end_to_end)")
+    if "parse" in report:
+        parse = report["parse"]
+        print(f"   parseo: novela p50 {parse['novel_page'].get('p50_ms')} ms, "
+              f"capítulo p50 {parse['chapter_page'].get('p50_ms')} ms")
+    print(f"🧠 Memoria máxima: {end_to_end['max_rss_mb']} MB (al arrancar: {baseline_rss} MB)")
+    print(f"\n💾 Guardado en {output}")
+
+
+if __name__ == "__main__":
+    main()
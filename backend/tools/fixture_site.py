@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+fixture_site.py
+Copia local de NovelasLigera.com para medir el scraper sin salir a internet.
+
+    build    Genera el corpus HTML a partir de los JSON de scrapers/mis_novelas
+             (misma estructura que el sitio real: metadatos, lista de
+             capítulos, anuncios y bloques de "patrocinio" que el scraper limpia)
+    capture  Guarda páginas REALES del sitio en el corpus (requiere red)
+    serve    Sirve el corpus con latencia y tasa de errores configurables
+
+Corpus (una página por carpeta, igual que las URLs del sitio):
+
+    profiles/fixture_site/
+    ├── novela/el-villano-que-quiere-vivir/index.html
+    ├── novela/el-villano-que-quiere-vivir/capitulo-1/index.html
+    └── wp-content/uploads/cover.jpg
+
+Uso (desde backend/):
+    python tools/fixture_site.py build
+    python tools/fixture_site.py serve --port 8090 --latency-ms 80 --error-rate 0.02
+    python scrapers/definitivo.py el-villano-que-quiere-vivir --base-url http://127.0.0.1:8090
+"""
+
+import argparse
+import html
+import json
+import random
+import re
+import shutil
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SOURCE_DIR = BACKEND_DIR / "scrapers" / "mis_novelas"
+DEFAULT_CORPUS = BACKEND_DIR / "profiles" / "fixture_site"
+REAL_SITE = "https://novelasligera.com"
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".jpg": "image/jpeg",
+    ".webp": "image/webp",
+    ".png": "image/png",
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+# BUILD (corpus a partir de los JSON descargados)
+# ═══════════════════════════════════════════════════════════════
+
+_HEADER = """<header class="site-header">
+  <a class="skip-link" href="#content">Saltar al contenido</a>
+  <nav class="menu"><ul>
+    <li><a href="/novelas-chinas/">Novelas Chinas</a></li>
+    <li><a href="/novelas-coreanas/">Novelas Coreanas</a></li>
+    <li><a href="/novelas-japonesas/">Novelas Japonesas</a></li>
+    <li><a href="/reclutamiento/">Reclutamiento y Otros</a></li>
+    <li><a href="/contacto/">CONTACTO</a></li>
+  </ul></nav>
+</header>
+<noscript>Sorry, you have Javascript Disabled! To see this page as it is meant to appear, please enable your Javascript!</noscript>
+"""
+
+_FOOTER = """<footer class="site-footer"><p>© NovelasLigera</p></footer>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){dataLayer.push(arguments);}</script>
+"""
+
+_ADS = """<div class="code-block adsbygoogle"><script>(adsbygoogle = window.adsbygoogle || []).push({});</script></div>
+<div class="sharedaddy"><div class="social-share">Compartir: Facebook Twitter WhatsApp</div></div>
+"""
+
+
+def _page(title: str, head: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html>\n<html lang=\"es\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{html.escape(title)} – NovelasLigera</title>\n{head}</head>\n"
+        f"<body>\n{_HEADER}<main id=\"content\">\n{body}</main>\n{_FOOTER}</body>\n</html>\n"
+    )
+
+
+def render_novel(slug: str, novel: dict, cover_url: str | None, votes: int) -> str:
+    """Página /novela/<slug>/ con metadatos y lista de capítulos."""
+    name = html.escape(novel["name"])
+    alternative = novel["alternative_names"][0] if novel.get("alternative_names") else None
+    rating = novel.get("rating") or 0
+    head = f'<meta property="og:image" content="{cover_url}">\n' if cover_url else ""
+
+    chapter_links = "\n".join(
+        f'  <li><a href="/novela/{slug}/capitulo-{chapter["order_number"]}/">'
+        f'{html.escape(alternative or "Capítulo")} – {html.escape(chapter["title"])}</a></li>'
+        for chapter in sorted(novel["chapters"], key=lambda c: -c["order_number"])
+    )
+
+    body = f"""<article class="post">
+<h1 class="entry-title">{name}</h1>
+<div class="entry-content">
+<div class="rating">Click to rate this post! [Total: {votes} Average: {rating}]</div>
+<p>{html.escape(novel.get("description") or "")}</p>
+<p>Estado: {"Completado" if novel.get("status") == "completed" else "En traducción"}
+Tipo: Novela Web
+Autor: {html.escape(novel.get("author") or "Desconocido")}
+Traductor: Equipo NL
+Plan de publicación: 3 capítulos por semana
+Género: {html.escape(", ".join(novel.get("genres") or []))}
+</p>
+{_ADS}<h3>Lista de capítulos</h3>
+<ul class="lcp_catlist">
+{chapter_links}
+</ul>
+</div>
+</article>
+"""
+    return _page(novel["name"], head, body)
+
+
+def render_chapter(novel: dict, chapter: dict) -> str:
+    """Página de un capítulo con el texto repartido en <p> y ruido alrededor."""
+    paragraphs = "\n".join(
+        f"<p>{html.escape(paragraph)}</p>"
+        for paragraph in chapter["content"].split("\n\n")
+        if paragraph.strip()
+    )
+    body = f"""<article class="post">
+<h1 class="entry-title">{html.escape(chapter["title"])}</h1>
+<div class="entry-content">
+<div class="font-controls"><p>Aumentar fuente Reducir fuente Restablecer fuente</p></div>
+{_ADS}{paragraphs}
+<p>Si estas leyendo las novelas en otro sitio que no sea este, apoyanos aqui y no con los gringos.</p>
+<p>Patrocinio: 5$ = 1 capitulo extra. Invitame un cafe</p>
+{_ADS}<div class="nav-links"><p>Pagina Anterior | Pagina Siguiente</p></div>
+</div>
+</article>
+"""
+    return _page(f'{novel["name"]} – {chapter["title"]}', "", body)
+
+
+def build(corpus: Path, source_dir: Path = SOURCE_DIR, seed: int = 42) -> dict:
+    """
+    Genera el corpus desde los JSON. Determinista (misma semilla → mismos bytes).
+
+    Returns:
+        {"novels": n, "chapters": n, "bytes": n}
+    """
+    rng = random.Random(seed)
+    if corpus.exists():
+        shutil.rmtree(corpus)
+
+    stats = {"novels": 0, "chapters": 0, "bytes": 0}
+
+    def write(relative: str, data: bytes) -> None:
+        path = corpus / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        stats["bytes"] += len(data)
+
+    for json_path in sorted(source_dir.glob("*.json")):
+        novel = json.loads(json_path.read_text(encoding="utf-8"))
+        if not novel.get("chapters"):
+            continue
+        slug = json_path.stem
+
+        cover_url = None
+        cover = Path(novel["image_path"]).name if novel.get("image_path") else None
+        if cover and (source_dir / cover).is_file():
+            cover_url = f"/wp-content/uploads/{cover}"
+            write(cover_url.lstrip("/"), (source_dir / cover).read_bytes())
+
+        write(f"novela/{slug}/index.html", render_novel(slug, novel, cover_url, rng.randint(20, 400)).encode())
+        for chapter in novel["chapters"]:
+            write(
+                f"novela/{slug}/capitulo-{chapter['order_number']}/index.html",
+                render_chapter(novel, chapter).encode(),
+            )
+            stats["chapters"] += 1
+        stats["novels"] += 1
+
+    return stats
+
+
+def novel_slugs(corpus: Path) -> list[str]:
+    """Slugs disponibles en el corpus."""
+    return sorted(path.parent.name for path in corpus.glob("novela/*/index.html"))
+
+
+# ═══════════════════════════════════════════════════════════════
+# CAPTURE (páginas reales)
+# ═══════════════════════════════════════════════════════════════
+
+def capture(corpus: Path, slug: str, start: int, end: int | None, delay: float) -> int:
+    """
+    Guarda la página de la novela y sus capítulos tal cual los sirve el sitio.
+
+    Los enlaces absolutos a novelasligera.com se reescriben a rutas
+    relativas para que el scraper los siga contra el servidor local.
+
+    Returns:
+        Páginas guardadas
+    """
+    sys.path.insert(0, str(BACKEND_DIR / "scrapers"))
+    from http_client import ScraperSession
+
+    session = ScraperSession()
+
+    def save(url: str) -> str:
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        text = response.text.replace(REAL_SITE, "")
+        path = corpus / urlsplit(url).path.strip("/") / "index.html"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        print(f"💾 {path.relative_to(corpus)}")
+        return text
+
+    novel_html = save(f"{REAL_SITE}/novela/{slug}/")
+    saved = 1
+
+    numbers = sorted({int(n) for n in re.findall(rf'/novela/{re.escape(slug)}/capitulo-(\d+)/', novel_html)})
+    for number in numbers:
+        if number < start or (end is not None and number > end):
+            continue
+        time.sleep(delay)
+        save(f"{REAL_SITE}/novela/{slug}/capitulo-{number}/")
+        saved += 1
+
+    return saved
+
+
+# ═══════════════════════════════════════════════════════════════
+# SERVE
+# ═══════════════════════════════════════════════════════════════
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Sirve archivos del corpus. La configuración vive en el servidor."""
+
+    server: "FixtureServer"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool) -> None:
+        server = self.server
+        server.count_request()
+
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if server.error_rate and random.random() < server.error_rate:
+            self.send_error(503, "Fallo simulado")
+            return
+
+        relative = urlsplit(self.path).path.strip("/")
+        path = (server.corpus / relative).resolve()
+        if path.is_dir():
+            path = path / "index.html"
+        if not path.is_relative_to(server.corpus) or not path.is_file():
+            self.send_error(404)
+            return
+
+        # Validadores como nginx: ETag de mtime + tamaño, Last-Modified del mtime
+        stat = path.stat()
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        if self._not_modified(etag, int(stat.st_mtime)):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return
+
+        data = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPES.get(path.suffix, "application/octet-stream"))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
+
+    def _not_modified(self, etag: str, mtime: int) -> bool:
+        """¿Petición condicional que coincide? (If-None-Match manda sobre If-Modified-Since)"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return mtime <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Servidor del corpus (un hilo por conexión).
+
+    Args:
+        latency_ms / jitter_ms: retraso por petición (latencia ± jitter)
+        error_rate: fracción de peticiones que responden 503
+    """
+
+    daemon_threads = True
+
+    def __init__(self, corpus: Path, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 verbose: bool = False):
+        super().__init__((host, port), FixtureHandler)
+        self.corpus = corpus.resolve()
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._count_lock:
+            self.requests += 1
+
+
+# ═══════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    parser = argparse.ArgumentParser(description="Sitio local para medir el scraper")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Carpeta del corpus")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Generar el corpus desde scrapers/mis_novelas")
+    build_parser.add_argument("--source", type=Path, default=SOURCE_DIR, help="Carpeta con los JSON")
+    build_parser.add_argument("--seed", type=int, default=42)
+
+    capture_parser = subparsers.add_parser("capture", help="Guardar páginas reales del sitio")
+    capture_parser.add_argument("slug")
+    capture_parser.add_argument("--start", type=int, default=1)
+    capture_parser.add_argument("--end", type=int, default=None)
+    capture_parser.add_argument("--delay", type=float, default=1.0, help="Pausa entre páginas")
+
+    serve_parser = subparsers.add_parser("serve", help="Servir el corpus")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8090)
+    serve_parser.add_argument("--latency-ms", type=float, default=0)
+    serve_parser.add_argument("--jitter-ms", type=float, default=0)
+    serve_parser.add_argument("--error-rate", type=float, default=0, help="0.05 = 5%% de respuestas 503")
+    serve_parser.add_argument("--verbose", action="store_true", help="Registrar cada petición")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build(args.corpus, args.source, args.seed)
+        print(f"✅ Corpus en {args.corpus}: {stats['novels']} novelas, "
+              f"{stats['chapters']} capítulos ({stats['bytes'] / 1024 / 1024:.1f} MB)")
+
+    elif args.command == "capture":
+        saved = capture(args.corpus, args.slug, args.start, args.end, args.delay)
+        print(f"✅ {saved} páginas guardadas en {args.corpus}")
+
+    else:
+        if not novel_slugs(args.corpus):
+            parser.exit(1, f"❌ Corpus vacío: ejecuta `python tools/fixture_site.py build`\n")
+        server = FixtureServer(args.corpus, args.host, args.port,
+                               args.latency_ms, args.jitter_ms, args.error_rate, args.verbose)
+        print(f"🌐 {server.base_url}  ({len(novel_slugs(args.corpus))} novelas, "
+              f"latencia {args.latency_ms}±{args.jitter_ms} ms, errores {args.error_rate:.0%})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
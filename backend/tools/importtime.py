@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+importtime.py
+Perfil de arranque de la API: cuánto tarda `import main` y qué lo hace lento.
+
+Ejecuta `python -X importtime -c "import main"` en un proceso nuevo
+(import en frío, como al arrancar el contenedor), resume la salida y la
+guarda como artefacto JSON para comparar entre versiones.
+
+Uso (desde backend/):
+    python tools/importtime.py
+    python tools/importtime.py --runs 5 --top 15 --output profiles/importtime.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Módulos que NO deberían cargarse solo por arrancar la API
+LAZY_MODULES = ["PIL"]
+
+
+def run_once(target: str) -> tuple[float, list[dict]]:
+    """
+    Un import en frío.
+
+    Returns:
+        (segundos de pared, filas de -X importtime)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+        sys.exit(f"❌ 'import {target}' falló")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # "import time:       123 |       4567 |   sqlalchemy.orm"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.rstrip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return elapsed, rows
+
+
+def summarize(target: str, runs: int, top: int) -> dict:
+    """Varias ejecuciones: mediana del tiempo total y detalle de la última."""
+    timings = []
+    rows: list[dict] = []
+    for _ in range(runs):
+        elapsed, rows = run_once(target)
+        timings.append(elapsed)
+
+    loaded = {row["module"].strip() for row in rows}
+
+    # Paquetes de primer nivel importados directamente (profundidad mínima)
+    top_level: dict[str, int] = {}
+    for row in rows:
+        package = row["module"].strip().split(".")[0]
+        top_level[package] = max(top_level.get(package, 0), row["cumulative_us"])
+
+    return {
+        "target": target,
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "wall_ms_median": round(statistics.median(timings) * 1000, 1),
+        "wall_ms_all": [round(t * 1000, 1) for t in timings],
+        "import_ms_total": round(sum(row["self_us"] for row in rows) / 1000, 1),
+        "modules_loaded": len(rows),
+        "lazy_modules_loaded": [name for name in LAZY_MODULES if name in loaded],
+        "top_packages_ms": [
+            {"package": package, "cumulative_ms": round(us / 1000, 1)}
+            for package, us in sorted(top_level.items(), key=lambda item: -item[1])[:top]
+        ],
+        "top_self_ms": [
+            {"module": row["module"].strip(), "self_ms": round(row["self_us"] / 1000, 1)}
+            for row in sorted(rows, key=lambda row: -row["self_us"])[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de importación en frío de la API")
+    parser.add_argument("--target", default="main", help="Módulo a importar (default: main)")
+    parser.add_argument("--runs", type=int, default=3, help="Ejecuciones (se usa la mediana)")
+    parser.add_argument("--top", type=int, default=10, help="Filas en los rankings")
+    parser.add_argument("--output", default="profiles/importtime.json", help="Artefacto JSON")
+    args = parser.parse_args()
+
+    summary = summarize(args.target, args.runs, args.top)
+
+    output = Path(args.output)
+    if not output.is_absolute():
+        output = BACKEND_DIR / output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"\n⏱️  import {summary['target']}: {summary['wall_ms_median']} ms (mediana de {summary['runs']})")
+    print(f"   {summary['modules_loaded']} módulos, {summary['import_ms_total']} ms importando\n")
+    print("📦 Paquetes más lentos (acumulado):")
+    for row in summary["top_packages_ms"]:
+        print(f"   {row['cumulative_ms']:>8.1f} ms  {row['package']}")
+    if summary["lazy_modules_loaded"]:
+        print(f"\n⚠️  Cargados al arrancar (deberían ser lazy): {', '.join(summary['lazy_modules_loaded'])}")
+    print(f"\n💾 Guardado en {output}")
+
+
+if __name__ == "__main__":
+    main()
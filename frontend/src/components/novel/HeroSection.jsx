@@ -1,4 +1,5 @@
 import { appTheme } from '../../config/theme';
+import { coverVariant } from '../../services/api';
 import { FlagIcon} from "@heroicons/react/24/solid";
 import { ChevronLeft, ChevronRight, Star, Tags } from "lucide-react";
 import { useState } from 'react';
@@ -25,7 +26,7 @@ export const HeroSection = ({ novels }) => {
      {/*--------------FONDO*/}
       <div 
         className="absolute inset-0 bg-cover bg-center blur-xl opacity-40 scale-110"
-        style={{ backgroundImage: `url(${novel.cover_path})` }}
+        style={{ backgroundImage: `url(${coverVariant(novel.cover_path, 'thumb')})` }}
       />
       
       {/*--------------OVERLAY*/}
@@ -35,7 +36,7 @@ export const HeroSection = ({ novels }) => {
         
         {/*-------------- PORTADA IMG*/}
         <div className="hidden md:block w-48 lg:w-64 shrink-0 shadow-2xl rounded-lg overflow-hidden border-2 border-white/10 transform group-hover:scale-105 transition-transform duration-300 relative">
-          <img src={novel.cover_path} alt={novel.name} className="w-full h-auto object-cover aspect-2/3" />
+          <img src={coverVariant(novel.cover_path, 'full')} alt={novel.name} className="w-full h-auto object-cover aspect-2/3" />
           
           {/*-------------- DESTELLO ANIMADO*/}
           <div className="absolute inset-0 opacity-0 group-hover:opacity-100 transition-opacity duration-300">
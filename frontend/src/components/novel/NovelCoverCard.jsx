@@ -1,5 +1,6 @@
 import { useNavigate } from 'react-router-dom';
 import { appTheme } from '../../config/theme';
+import { coverVariant } from '../../services/api';
 
 export const NovelCoverCard = ({ novel }) => {
   const navigate = useNavigate();
@@ -13,8 +14,10 @@ export const NovelCoverCard = ({ novel }) => {
       {/*--------------CONTENEDOR DE IMAGEN*/}
       <div className="relative rounded-lg overflow-hidden aspect-2/3 mb-2">
         <img
-          src={novel.cover_path}
+          src={coverVariant(novel.cover_path, 'card')}
           alt={novel.name}
+          loading="lazy"
+          decoding="async"
           className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500"
         />
         <div className="absolute inset-0 bg-linear-to-t from-black/80 via-black/20 to-transparent opacity-0 group-hover:opacity-100 transition-opacity duration-300 flex items-end justify-center pb-4">
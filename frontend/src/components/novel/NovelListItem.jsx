@@ -3,6 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { appTheme } from '../../config/theme';
 import { FlagIcon } from '../ui/FlagIcon';
 import { TimeAgo } from '../ui/TimeAgo';
+import { coverVariant } from '../../services/api';
 
 export const NovelListItem = ({ novel }) => {
   const navigate = useNavigate();
@@ -17,7 +18,7 @@ export const NovelListItem = ({ novel }) => {
       className={`group w-full text-left flex gap-4 p-3 rounded-lg transition-all duration-300 ${appTheme.colors.surface} ${appTheme.colors.surfaceHover} border border-transparent hover:border-slate-700`}
     >
     <div className="relative w-20 shrink-0 rounded overflow-hidden shadow-lg">
-      <img src={novel.cover_path} alt={novel.name} className="w-full h-28 object-cover transition-transform duration-500 group-hover:scale-110" />
+      <img src={coverVariant(novel.cover_path, 'thumb')} alt={novel.name} loading="lazy" decoding="async" className="w-full h-28 object-cover transition-transform duration-500 group-hover:scale-110" />
       {novel.country && (
         <div className="absolute bottom-0 left-0 right-0 p-1 bg-black/60 backdrop-blur-sm flex justify-center">
           <FlagIcon country={novel.country} />
@@ -92,6 +92,22 @@ export const healthApi = {
   },
 };
 
+// Portadas servidas por el backend (las variantes solo existen aquí)
+const COVER_PATH = `${API_BASE_URL}/images/`;
+
+// La API devuelve cover_url absoluta con el Host de la petición
+// (detrás de nginx: http://<host>/api/v1/images/...): se queda solo la
+// ruta, que el proxy del mismo origen sirve. Las URLs externas no cambian
+const coverPath = (url) => {
+  if (!url) return url;
+  try {
+    const { pathname, search } = new URL(url, window.location.origin);
+    return pathname.startsWith(COVER_PATH) ? `${pathname}${search}` : url;
+  } catch {
+    return url;
+  }
+};
+
 // Función para transformar los datos de la API al formato esperado por los componentes
 export const transformNovelData = (novel) => {
   // Mapear estados de la API a los usados por los componentes
@@ -105,7 +121,7 @@ export const transformNovelData = (novel) => {
   return {
     ...novel,
     // Mapear cover_url a cover_path para compatibilidad (usar URL relativa para el proxy)
-    cover_path: novel.cover_url ? novel.cover_url.replace('http://localhost:8000', '') : novel.cover_path,
+    cover_path: novel.cover_url ? coverPath(novel.cover_url) : novel.cover_path,
     // Mapear genres a tags si existe
     tags: novel.genres ? novel.genres.map(g => g.name.toUpperCase()) : novel.tags || [],
     // Asegurar que chapters_count se mapee a chapters
@@ -121,3 +137,12 @@ export const transformNovelData = (novel) => {
 export const transformNovelsList = (novels) => {
   return novels.map(transformNovelData);
 };
+
+// Portada en un tamaño concreto: 'thumb' (160px), 'card' (320px) o 'full' (720px)
+// Solo aplica a portadas del backend (/api/v1/images/...?v=hash, relativa o absoluta);
+// las URLs externas se dejan igual
+export const coverVariant = (url, variant) => {
+  const path = coverPath(url);
+  if (!path || !path.startsWith(COVER_PATH)) return url;
+  return `${path}${path.includes('?') ? '&' : '?'}variant=${variant}`;
+};
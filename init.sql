@@ -33,7 +33,7 @@ CREATE TABLE `chapters` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `novel_id` (`novel_id`,`order_number`),
   KEY `ix_chapters_novel_id` (`novel_id`),
-  CONSTRAINT `chapters_ibfk_1` FOREIGN KEY (`novel_id`) REFERENCES `novels` (`id`)
+  CONSTRAINT `chapters_ibfk_1` FOREIGN KEY (`novel_id`) REFERENCES `novels` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=234 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -86,8 +86,8 @@ CREATE TABLE `novel_genres` (
   `genre_id` int NOT NULL,
   PRIMARY KEY (`novel_id`,`genre_id`),
   KEY `genre_id` (`genre_id`),
-  CONSTRAINT `novel_genres_ibfk_1` FOREIGN KEY (`novel_id`) REFERENCES `novels` (`id`),
-  CONSTRAINT `novel_genres_ibfk_2` FOREIGN KEY (`genre_id`) REFERENCES `genres` (`id`)
+  CONSTRAINT `novel_genres_ibfk_1` FOREIGN KEY (`novel_id`) REFERENCES `novels` (`id`) ON DELETE CASCADE,
+  CONSTRAINT `novel_genres_ibfk_2` FOREIGN KEY (`genre_id`) REFERENCES `genres` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -114,7 +114,7 @@ CREATE TABLE `novel_names` (
   `name` varchar(200) NOT NULL,
   PRIMARY KEY (`id`),
   KEY `novel_id` (`novel_id`),
-  CONSTRAINT `novel_names_ibfk_1` FOREIGN KEY (`novel_id`) REFERENCES `novels` (`id`)
+  CONSTRAINT `novel_names_ibfk_1` FOREIGN KEY (`novel_id`) REFERENCES `novels` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=10 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 